@@ -5,6 +5,7 @@ import logging
 from pyramid_oereb.lib.adapter import DatabaseAdapter
 from pyramid_oereb.lib.config import Config
 from pyramid.config import Configurator
+from pyramid.path import DottedNameResolver
 
 __version__ = '1.0.1'
 
@@ -50,18 +51,29 @@ def includeme(config):
     cfg_c2ctemplate_file = settings.get('pyramid_oereb.cfg.c2ctemplate.file', None)
     cfg_section = settings.get('pyramid_oereb.cfg.section', None)
     Config.init(cfg_file or cfg_c2ctemplate_file, cfg_section, cfg_file is None)
+    Config.init_logos()
     Config.update_settings(settings)
 
     settings.update({
         'pyramid_oereb': Config.get_config()
     })
 
-    config.add_renderer('pyramid_oereb_extract_json', 'pyramid_oereb.lib.renderer.extract.json_.Renderer')
-    config.add_renderer('pyramid_oereb_extract_xml', 'pyramid_oereb.lib.renderer.extract.xml_.Renderer')
-    config.add_renderer('pyramid_oereb_extract_print', Config.get('print').get('renderer'))
-    config.add_renderer('pyramid_oereb_versions_xml', 'pyramid_oereb.lib.renderer.versions.xml_.Renderer')
-    config.add_renderer('pyramid_oereb_capabilities_xml',
-                        'pyramid_oereb.lib.renderer.capabilities.xml_.Renderer')
-    config.add_renderer('pyramid_oereb_getegrid_xml', 'pyramid_oereb.lib.renderer.getegrid.xml_.Renderer')
+    renderers = {
+        'pyramid_oereb_extract_json': 'pyramid_oereb.lib.renderer.extract.json_.Renderer',
+        'pyramid_oereb_extract_xml': 'pyramid_oereb.lib.renderer.extract.xml_.Renderer',
+        'pyramid_oereb_extract_print': Config.get('print').get('renderer'),
+        'pyramid_oereb_versions_xml': 'pyramid_oereb.lib.renderer.versions.xml_.Renderer',
+        'pyramid_oereb_capabilities_xml': 'pyramid_oereb.lib.renderer.capabilities.xml_.Renderer',
+        'pyramid_oereb_getegrid_xml': 'pyramid_oereb.lib.renderer.getegrid.xml_.Renderer'
+    }
+    for name, renderer in renderers.items():
+        config.add_renderer(name, renderer)
+        # compile the templates once at startup instead of on the first requests
+        renderer_class = DottedNameResolver().maybe_resolve(renderer)
+        if callable(getattr(renderer_class, 'init_templates', None)):
+            renderer_class.init_templates()
+    # resolve the symbol reference hooks of all themes once at startup
+    from pyramid_oereb.lib.renderer import Base
+    Base.get_symbol_ref_hooks()
 
     config.include('pyramid_oereb.routes')
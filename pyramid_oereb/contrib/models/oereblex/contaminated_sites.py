@@ -9,7 +9,7 @@ models to your own infrastructure you must implement the same attribute names! I
 is not easily made you need to make your own classes and adapt them to your database.
 """
 import sqlalchemy as sa
-from pyramid_oereb.standard.models import NAMING_CONVENTION
+from pyramid_oereb.standard.models import NAMING_CONVENTION, BinaryImage
 from pyramid_oereb.lib.config import Config
 from sqlalchemy.ext.declarative import declarative_base
 from geoalchemy2.types import Geometry as GeoAlchemyGeometry
@@ -19,6 +19,7 @@ from sqlalchemy_utils import JSONType
 metadata = sa.MetaData(naming_convention=NAMING_CONVENTION)
 Base = declarative_base()
 srid = Config.get('srid')
+image_type = BinaryImage if Config.get('binary_images', False) else sa.String
 
 
 class Availability(Base):
@@ -122,8 +123,8 @@ class LegendEntry(Base):
     Attributes:
         id (str): The identifier. This is used in the database only and must not be set manually. If
             you  don't like it - don't care about.
-        symbol (str): An image with represents the legend entry. This can be png or svg. It is string
-            but BaseCode64  encoded.
+        symbol (str or bytes): An image with represents the legend entry. This can be png or svg. It
+            is string but BaseCode64  encoded or raw bytes if binary image columns are used.
         legend_text (dict): Multilingual text to describe this legend entry.
         type_code (str): Type code of the public law restriction which is represented by this legend
             entry.
@@ -143,7 +144,7 @@ class LegendEntry(Base):
     __table_args__ = {'schema': 'contaminated_sites'}
     __tablename__ = 'legend_entry'
     id = sa.Column(sa.String, primary_key=True, autoincrement=False)
-    symbol = sa.Column(sa.String, nullable=False)
+    symbol = sa.Column(image_type, nullable=False)
     legend_text = sa.Column(JSONType, nullable=False)
     type_code = sa.Column(sa.String(40), nullable=False)
     type_code_list = sa.Column(sa.String, nullable=False)
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Archive of the created PDFs (see `pdf_archive_path` in the print configuration). The files are written by
+a background thread, so a slow archive storage does not delay the print responses.
+"""
+import hashlib
+import logging
+import os
+import queue
+import threading
+
+from pyramid_oereb import Config
+from pyramid_oereb.contrib.print_proxy.storage import write_file
+
+
+log = logging.getLogger(__name__)
+
+CONTENT_DIRECTORY = '.content'
+"""str: The sub directory of the archive keeping each content once, if deduplication is enabled."""
+
+
+class PdfArchive(object):
+    """
+    Writes the archived PDFs with a background thread. The PDFs wait in a bounded queue. If the queue is
+    full, further PDFs are dropped and counted, so the prints are never blocked by the archive.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_queued=100, deduplicate=False):
+        """
+        Args:
+            max_queued (int): The number of PDFs which may wait to be written.
+            deduplicate (bool): Keep each content only once in the archive. The archived files are hard
+                links to the content, which is stored by its hash.
+        """
+        self._deduplicate = deduplicate
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._statistics = {'archived': 0, 'deduplicated': 0, 'failed': 0, 'dropped': 0}
+        self._statistics_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='pdf-archive')
+        self._thread.daemon = True
+        self._thread.start()
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Returns the archive created from the `pdf_archive` section of the print configuration. It is
+        created once per process.
+
+        Returns:
+            pyramid_oereb.contrib.print_proxy.archive.PdfArchive: The archive.
+        """
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    archive_config = Config.get('print', {}).get('pdf_archive') or {}
+                    cls._instance = cls(
+                        max_queued=archive_config.get('max_queued', 100),
+                        deduplicate=archive_config.get('deduplicate', False)
+                    )
+        return cls._instance
+
+    def submit(self, path, content):
+        """
+        Queues a PDF to be written to the archive.
+
+        Args:
+            path (str): The path of the archived file.
+            content (bytes): The PDF.
+
+        Returns:
+            bool: True if the PDF has been queued, False if it has been dropped because the queue is full.
+        """
+        try:
+            self._queue.put_nowait((path, content))
+            return True
+        except queue.Full:
+            self._count('dropped')
+            log.error('Pdf file {0} not archived, the queue is full ({1})'.format(
+                path, self._format_statistics()
+            ))
+            return False
+
+    def write(self, path, content):
+        """
+        Writes a PDF to the archive. The file is written to a temporary file first and renamed afterwards.
+
+        Args:
+            path (str): The path of the archived file.
+            content (bytes): The PDF.
+        """
+        if not self._deduplicate:
+            write_file(path, content)
+            self._count('archived')
+            return
+        content_directory = os.path.join(os.path.dirname(path), CONTENT_DIRECTORY)
+        if not os.path.isdir(content_directory):
+            os.makedirs(content_directory, exist_ok=True)
+        content_path = os.path.join(content_directory, hashlib.sha256(content).hexdigest() + '.pdf')
+        if os.path.isfile(content_path):
+            self._count('deduplicated')
+        else:
+            write_file(content_path, content)
+        tmp_path = '{0}.{1}.tmp'.format(path, threading.get_ident())
+        try:
+            os.link(content_path, tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # The file system does not support hard links
+            log.debug('Pdf file {0} is copied, it can not be linked: {1}'.format(path, e))
+            write_file(path, content)
+        self._count('archived')
+
+    def flush(self):
+        """
+        Waits until all queued PDFs are written.
+        """
+        self._queue.join()
+
+    def get_statistics(self):
+        """
+        Returns the number of archived, deduplicated, failed and dropped PDFs since the start of the
+        process.
+
+        Returns:
+            dict: The statistics.
+        """
+        with self._statistics_lock:
+            statistics = dict(self._statistics)
+        statistics['queued'] = self._queue.qsize()
+        return statistics
+
+    def _format_statistics(self):
+        return ', '.join('{0}: {1}'.format(name, count)
+                         for name, count in sorted(self.get_statistics().items()))
+
+    def _count(self, name):
+        with self._statistics_lock:
+            self._statistics[name] += 1
+
+    def _run(self):
+        while True:
+            path, content = self._queue.get()
+            try:
+                self.write(path, content)
+                log.debug('Pdf file archived at: ' + path)
+            except Exception:
+                self._count('failed')
+                log.exception('Pdf file {0} could not be archived ({1})'.format(
+                    path, self._format_statistics()
+                ))
+            finally:
+                self._queue.task_done()
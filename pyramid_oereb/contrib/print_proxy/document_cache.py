@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+Download of the documents which are appended to the full static extract. The documents are mostly the
+same federal and cantonal laws for each extract, so they are downloaded in parallel and kept in a
+directory. Cached documents are revalidated with the `ETag` and `Last-Modified` headers of the previous
+response, and the least recently used ones are deleted if the cache exceeds the configured size.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from pyramid_oereb import Config
+from pyramid_oereb.contrib.print_proxy.storage import delete_least_recently_used, read_file, write_file
+
+
+log = logging.getLogger(__name__)
+
+
+class DocumentCache(object):
+    """
+    Downloads documents with a bounded number of threads and keeps the PDF documents in a directory.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, path=None, max_size=512 * 1024 * 1024, max_workers=4, timeout=30):
+        """
+        Args:
+            path (str or None): The directory to keep the downloaded documents in. Without a directory,
+                the documents are downloaded in parallel but not cached.
+            max_size (int): The maximum size of all cached documents in bytes.
+            max_workers (int): The number of documents which are downloaded at the same time.
+            timeout (int): The timeout of a single download in seconds.
+        """
+        self._path = path
+        self._max_size = max_size
+        self._timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._lock = threading.Lock()
+        if path is not None and not os.path.isdir(path):
+            os.makedirs(path)
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Returns the document cache created from the `document_cache` section of the print configuration.
+        It is created once per process.
+
+        Returns:
+            pyramid_oereb.contrib.print_proxy.document_cache.DocumentCache: The document cache.
+        """
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cache_config = Config.get('print', {}).get('document_cache') or {}
+                    cls._instance = cls(
+                        path=cache_config.get('path'),
+                        max_size=cache_config.get('max_size', 512 * 1024 * 1024),
+                        max_workers=cache_config.get('max_workers', 4),
+                        timeout=cache_config.get('timeout', 30)
+                    )
+        return cls._instance
+
+    def get_documents(self, urls):
+        """
+        Returns the documents available at the specified URLs.
+
+        Args:
+            urls (iterable of str): The URLs of the documents.
+
+        Returns:
+            list of tuple: The URL, the content type and the content of each document, in the order of the
+            passed URLs.
+        """
+        urls = list(urls)
+        return [(url,) + document for url, document in zip(urls, self._executor.map(self.get_document, urls))]
+
+    def get_versioned_documents(self, urls):
+        """
+        Returns the documents available at the specified URLs with their current versions. The cached
+        documents are revalidated, but their content is only read if it has changed.
+
+        Args:
+            urls (iterable of str): The URLs of the documents.
+
+        Returns:
+            list of tuple: The URL, the content type, the content and the version (hash of the content) of
+            each document, in the order of the passed URLs. The content is None for cached documents which
+            have not changed, it can be read with :meth:`read_cached`.
+        """
+        urls = list(urls)
+        return [(url,) + document for url, document in zip(urls, self._executor.map(self._get, urls))]
+
+    def get_document(self, url):
+        """
+        Returns the document available at the specified URL, either downloaded or, if it has not changed,
+        from the cache.
+
+        Args:
+            url (str): The URL of the document.
+
+        Returns:
+            tuple: The content type and the content of the document.
+        """
+        content_type, content, version = self._get(url, read_content=True)
+        return content_type, content
+
+    def read_cached(self, url, version):
+        """
+        Reads a cached document without revalidating it.
+
+        Args:
+            url (str): The URL of the document.
+            version (str): The expected version, as returned by :meth:`get_versioned_documents`.
+
+        Returns:
+            bytes or None: The content of the document or None if it is not cached in this version.
+        """
+        if self._path is None:
+            return None
+        content = read_file(self._get_file_path(url, 'pdf'))
+        if content is None or hashlib.sha1(content).hexdigest() != version:
+            return None
+        return content
+
+    def _get(self, url, read_content=False):
+        metadata = self._read_metadata(url)
+        headers = dict()
+        if metadata is not None:
+            if metadata.get('etag'):
+                headers['If-None-Match'] = metadata['etag']
+            if metadata.get('last_modified'):
+                headers['If-Modified-Since'] = metadata['last_modified']
+        try:
+            result = requests.get(url, headers=headers, timeout=self._timeout)
+        except requests.RequestException as e:
+            if metadata is None:
+                raise
+            log.warning('Using cached document {0}, the download failed: {1}'.format(url, e))
+            result = None
+        if metadata is not None and (result is None or result.status_code == 304):
+            if not read_content and os.path.isfile(self._get_file_path(url, 'pdf')):
+                return metadata.get('content_type'), None, metadata['hash']
+            content = read_file(self._get_file_path(url, 'pdf'))
+            if content is not None:
+                log.debug('Document {0} taken from cache'.format(url))
+                return metadata.get('content_type'), content, metadata['hash']
+            result = requests.get(url, timeout=self._timeout)
+        content_type = result.headers.get('content-type')
+        version = hashlib.sha1(result.content).hexdigest()
+        if result.status_code == 200 and content_type == 'application/pdf':
+            self._write(url, result, content_type, version)
+        return content_type, result.content, version
+
+    def _get_file_path(self, url, extension):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self._path, '{0}.{1}'.format(key, extension))
+
+    def _read_metadata(self, url):
+        if self._path is None:
+            return None
+        try:
+            with open(self._get_file_path(url, 'json')) as f:
+                metadata = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+        # Different URLs with the same hash are not expected, but must not return the wrong document.
+        return metadata if metadata.get('url') == url and 'hash' in metadata else None
+
+    def _write(self, url, result, content_type, version):
+        if self._path is None or len(result.content) > self._max_size:
+            return
+        metadata = {
+            'url': url,
+            'content_type': content_type,
+            'etag': result.headers.get('etag'),
+            'last_modified': result.headers.get('last-modified'),
+            'hash': version
+        }
+        try:
+            write_file(self._get_file_path(url, 'pdf'), result.content)
+            write_file(self._get_file_path(url, 'json'), json.dumps(metadata).encode('utf-8'))
+            with self._lock:
+                delete_least_recently_used(self._path, 'pdf', self._max_size, ('json',))
+        except (IOError, OSError) as e:
+            log.warning('Document {0} could not be cached: {1}'.format(url, e))
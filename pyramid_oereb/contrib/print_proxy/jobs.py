@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""
+Asynchronous print jobs for the mapfish print proxy. Instead of holding a worker for the whole PDF
+creation, the print renderer can submit the pipeline to a bounded background executor and return a job
+id. The state and the result of each job are stored on disk, so the status and the PDF can be requested
+from any process sharing the configured directory, as long as the configured time to live is not over.
+"""
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from pyramid.httpexceptions import HTTPNotFound, HTTPServiceUnavailable
+from pyramid.response import FileResponse, Response
+
+from pyramid_oereb import Config, route_prefix
+from pyramid_oereb.contrib.print_proxy.storage import write_file
+
+
+log = logging.getLogger(__name__)
+
+JOB_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+STATUS_PENDING = 'pending'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+
+class PrintJobs(object):
+    """
+    Runs print jobs with a bounded number of worker threads and keeps their state and results in a
+    directory for the configured time to live.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, path, max_workers=2, max_queued=10, ttl=3600, retry_after=10):
+        """
+        Args:
+            path (str): The directory to store the job states and the created PDF files in.
+            max_workers (int): The number of jobs which are processed at the same time.
+            max_queued (int): The number of jobs which may wait for a free worker. Further jobs are
+                rejected until a job is finished.
+            ttl (int): The time in seconds the state and the result of a job are kept.
+            retry_after (int): The delay in seconds proposed to the clients if a job is rejected.
+        """
+        self._path = path
+        self._max_workers = max_workers
+        self._max_jobs = max_workers + max_queued
+        self._ttl = ttl
+        self._retry_after = retry_after
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._active = 0
+        self._lock = threading.Lock()
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Returns the job manager created from the `jobs` section of the print configuration. It is created
+        once per process.
+
+        Returns:
+            pyramid_oereb.contrib.print_proxy.jobs.PrintJobs: The job manager.
+        """
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    jobs_config = Config.get('print', {}).get('jobs') or {}
+                    cls._instance = cls(
+                        jobs_config.get('path', os.path.join(tempfile.gettempdir(), 'pyramid_oereb_jobs')),
+                        max_workers=jobs_config.get('max_workers', 2),
+                        max_queued=jobs_config.get('max_queued', 10),
+                        ttl=jobs_config.get('ttl', 3600),
+                        retry_after=jobs_config.get('retry_after', 10)
+                    )
+        return cls._instance
+
+    @property
+    def ttl(self):
+        """int: The time in seconds the state and the result of a job are kept."""
+        return self._ttl
+
+    def submit(self, function, *args):
+        """
+        Submits a new job. The function has to return the status code, the headers and the content of
+        the print result, like
+        :meth:`pyramid_oereb.contrib.print_proxy.mapfish_print.Renderer.create_pdf`.
+
+        Args:
+            function (callable): The function creating the PDF.
+            *args: The arguments passed to the function.
+
+        Returns:
+            str: The id of the new job.
+
+        Raises:
+            pyramid.httpexceptions.HTTPServiceUnavailable: Too many jobs are waiting to be processed.
+        """
+        with self._lock:
+            if self._active >= self._max_jobs:
+                log.warning('Print job rejected, {0} jobs are already waiting or running'.format(
+                    self._active
+                ))
+                raise HTTPServiceUnavailable(headers={'Retry-After': str(self._retry_after)})
+            self._active += 1
+        try:
+            self.cleanup()
+            job_id = uuid.uuid4().hex
+            self._write_status(job_id, STATUS_PENDING)
+            self._executor.submit(self._run, job_id, function, args)
+        except Exception:
+            with self._lock:
+                self._active -= 1
+            raise
+        log.debug('Print job {0} submitted'.format(job_id))
+        return job_id
+
+    def get_status(self, job_id):
+        """
+        Returns the state of a job.
+
+        Args:
+            job_id (str): The id of the job.
+
+        Returns:
+            dict or None: The state of the job or None if the job is unknown or expired.
+        """
+        if not JOB_ID_PATTERN.match(job_id or ''):
+            return None
+        path = self._get_file_path(job_id, 'json')
+        try:
+            if time.time() - os.path.getmtime(path) > self._ttl:
+                return None
+            with open(path) as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def get_pdf_path(self, job_id):
+        """
+        Returns the path of the PDF created by a job.
+
+        Args:
+            job_id (str): The id of the job.
+
+        Returns:
+            str: The path of the PDF file.
+        """
+        return self._get_file_path(job_id, 'pdf')
+
+    def cleanup(self):
+        """
+        Deletes the states and results of all jobs which are older than the time to live.
+        """
+        expiry = time.time() - self._ttl
+        for file_name in os.listdir(self._path):
+            path = os.path.join(self._path, file_name)
+            try:
+                if os.path.getmtime(path) < expiry:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def _run(self, job_id, function, args):
+        try:
+            self._write_status(job_id, STATUS_RUNNING)
+            status_code, headers, content = function(*args)
+            if status_code == 200:
+                self._write_file(job_id, 'pdf', content)
+                self._write_status(job_id, STATUS_DONE)
+            else:
+                log.error('Print job {0} failed with status {1}: {2}'.format(job_id, status_code, content))
+                self._write_status(
+                    job_id,
+                    STATUS_FAILED,
+                    'The print service returned the status {0}'.format(status_code)
+                )
+        except Exception as e:
+            log.exception('Print job {0} failed'.format(job_id))
+            self._write_status(job_id, STATUS_FAILED, str(e))
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _get_file_path(self, job_id, extension):
+        return os.path.join(self._path, '{0}.{1}'.format(job_id, extension))
+
+    def _write_status(self, job_id, status, error=None):
+        job_status = {
+            'status': status,
+            'updated': int(time.time())
+        }
+        if error is not None:
+            job_status['error'] = error
+        self._write_file(job_id, 'json', json.dumps(job_status).encode('utf-8'))
+
+    def _write_file(self, job_id, extension, content):
+        write_file(self._get_file_path(job_id, extension), content)
+
+
+def get_job_status_dict(request, job_id, jobs):
+    """
+    Returns the state of a job as returned by the print job service.
+
+    Args:
+        request (pyramid.request.Request): The current request.
+        job_id (str): The id of the job.
+        jobs (pyramid_oereb.contrib.print_proxy.jobs.PrintJobs): The job manager.
+
+    Returns:
+        dict or None: The state of the job including the links to the status and the PDF or None if the
+        job is unknown or expired.
+    """
+    job_status = jobs.get_status(job_id)
+    if job_status is None:
+        return None
+    result = {
+        'job_id': job_id,
+        'status': job_status['status'],
+        'status_url': request.route_url('{0}/print/job'.format(route_prefix), job_id=job_id)
+    }
+    if job_status['status'] == STATUS_DONE:
+        result['pdf_url'] = request.route_url('{0}/print/job/pdf'.format(route_prefix), job_id=job_id)
+    if 'error' in job_status:
+        result['error'] = job_status['error']
+    return result
+
+
+class PrintJobWebservice(object):
+    """
+    The print job service provides the state and the result of asynchronous print jobs.
+    """
+
+    def __init__(self, request):
+        """
+        Args:
+            request (pyramid.request.Request or pyramid.testing.DummyRequest): The pyramid request instance.
+        """
+        self._request = request
+        self._jobs = PrintJobs.get_instance()
+
+    def get_status(self):
+        """
+        Returns the state of the requested job.
+
+        Returns:
+            pyramid.response.Response: The JSON encoded state of the job.
+        """
+        job_id = self._request.matchdict.get('job_id')
+        job_status = get_job_status_dict(self._request, job_id, self._jobs)
+        if job_status is None:
+            raise HTTPNotFound('Unknown or expired print job: {0}'.format(job_id))
+        return Response(
+            json.dumps(job_status),
+            content_type='application/json',
+            charset='UTF-8'
+        )
+
+    def get_pdf(self):
+        """
+        Returns the PDF created by the requested job. If the job is not finished yet, its state is returned
+        with the status code 202.
+
+        Returns:
+            pyramid.response.Response: The PDF or the JSON encoded state of the job.
+        """
+        job_id = self._request.matchdict.get('job_id')
+        job_status = get_job_status_dict(self._request, job_id, self._jobs)
+        if job_status is None:
+            raise HTTPNotFound('Unknown or expired print job: {0}'.format(job_id))
+        if job_status['status'] != STATUS_DONE:
+            return Response(
+                json.dumps(job_status),
+                status=202,
+                content_type='application/json',
+                charset='UTF-8'
+            )
+        try:
+            return FileResponse(
+                self._jobs.get_pdf_path(job_id),
+                request=self._request,
+                content_type='application/pdf'
+            )
+        except (IOError, OSError):
+            raise HTTPNotFound('Unknown or expired print job: {0}'.format(job_id))
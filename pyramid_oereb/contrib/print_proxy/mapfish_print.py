@@ -1,18 +1,21 @@
 # -*- coding: utf-8 -*-
+from copy import deepcopy
 from datetime import datetime, timedelta
 import io
 import json
 import logging
-import requests
+import threading
 from shapely.geometry import mapping
-import subprocess
-import sys
-import tempfile
-import time
 from urllib import parse as urlparse
 
 from pyramid.httpexceptions import HTTPBadRequest
-from pyramid_oereb import Config
+from pyramid_oereb import Config, route_prefix
+from pyramid_oereb.contrib.print_proxy.archive import PdfArchive
+from pyramid_oereb.contrib.print_proxy.document_cache import DocumentCache
+from pyramid_oereb.contrib.print_proxy.jobs import PrintJobs, get_job_status_dict
+from pyramid_oereb.contrib.print_proxy.pdf_cache import PdfCache
+from pyramid_oereb.contrib.print_proxy.pdf_merge import merge_documents, merge_pdf
+from pyramid_oereb.contrib.print_proxy.print_backends import PrintBackendPool
 from pyramid_oereb.lib.renderer.extract.json_ import Renderer as JsonRenderer
 from pyramid_oereb.lib.url import parse_url
 from pyramid.httpexceptions import HTTPInternalServerError
@@ -32,6 +35,40 @@ LEGEND_ELEMENT_SORT_ORDER = [
 
 class Renderer(JsonRenderer):
 
+    _formatting_document = False
+    _toc_statistics = {'prints': 0, 'reprints': 0}
+    _toc_statistics_lock = threading.Lock()
+
+    @classmethod
+    def count_toc_print(cls, reprint):
+        """
+        Counts a print with computed TOC pages and whether it had to be printed again, because the number of
+        TOC pages was not estimated correctly.
+
+        Args:
+            reprint (bool): True if the extract had to be printed again.
+
+        Returns:
+            dict: The updated statistics.
+        """
+        with cls._toc_statistics_lock:
+            cls._toc_statistics['prints'] += 1
+            if reprint:
+                cls._toc_statistics['reprints'] += 1
+            return dict(cls._toc_statistics)
+
+    @classmethod
+    def get_toc_statistics(cls):
+        """
+        Returns the number of prints with computed TOC pages and the number of them which had to be printed
+        again since the start of the process.
+
+        Returns:
+            dict: The number of `prints` and `reprints`.
+        """
+        with cls._toc_statistics_lock:
+            return dict(cls._toc_statistics)
+
     def lpra_flatten(self, items):
         for item in items:
             self._flatten_object(item, 'Lawstatus')
@@ -45,6 +82,18 @@ class Renderer(JsonRenderer):
             self._multilingual_text(item, 'OfficialTitle')
             self._multilingual_text(item, 'Abbreviation')
 
+    def format_document(self, document):
+        # The documents are modified in place while converting the extract, so each restriction needs its
+        # own copy of the shared document dictionary. The referenced documents are formatted by nested calls,
+        # they are copied together with the document referring to them.
+        if self._formatting_document:
+            return super(Renderer, self).format_document(document)
+        self._formatting_document = True
+        try:
+            return deepcopy(super(Renderer, self).format_document(document))
+        finally:
+            self._formatting_document = False
+
     def __call__(self, value, system):
         """
         Implements a subclass of pyramid_oereb.lib.renderer.extract.json_.Renderer to create a print result
@@ -108,15 +157,49 @@ class Renderer(JsonRenderer):
         if self._request.GET.get('getspec', 'no') != 'no':
             response.headers['Content-Type'] = 'application/json; charset=UTF-8'
             return json.dumps(spec, sort_keys=True, indent=4)
-        pdf_url = urlparse.urljoin(Config.get('print', {})['base_url'] + '/', 'buildreport.pdf')
-        pdf_headers = Config.get('print', {})['headers']
-        print_result = requests.post(
-            pdf_url,
+
+        if self._lowercase_GET_dict.get('async', 'false') not in ['false', 'no', '0'] and \
+                print_config.get('jobs') is not None:
+            job_id = PrintJobs.get_instance().submit(self.create_pdf, spec, extract_as_dict, pdf_to_join)
+            response.status_code = 202
+            response.headers['Content-Type'] = 'application/json; charset=UTF-8'
+            response.headers['Location'] = self._request.route_url(
+                '{0}/print/job'.format(route_prefix), job_id=job_id
+            )
+            return json.dumps(get_job_status_dict(self._request, job_id, PrintJobs.get_instance()))
+
+        status_code, headers, content = self.create_pdf(spec, extract_as_dict, pdf_to_join)
+        response.status_code = status_code
+        response.headers = headers
+        return content
+
+    def create_pdf(self, spec, extract_as_dict, pdf_to_join):
+        """
+        Creates the PDF with mapfish print, prints it again if the number of TOC pages was not estimated
+        correctly and appends the documents for the full extract. The method does not depend on the
+        current request, so it can be run in the background (see
+        :class:`pyramid_oereb.contrib.print_proxy.jobs.PrintJobs`).
+
+        Args:
+            spec (dict): The print specification sent to mapfish print.
+            extract_as_dict (dict): The printable extract, which is part of the specification.
+            pdf_to_join (set of str): The URLs of the documents to append to the full extract.
+
+        Returns:
+            tuple: The status code, the headers and the content of the print result.
+        """
+        print_config = Config.get('print', {})
+        pdf_archive_path = print_config.get('pdf_archive_path', None)
+
+        print_backends = PrintBackendPool.get_instance()
+        pdf_headers = print_config['headers']
+        print_result = print_backends.post(
+            'buildreport.pdf',
             headers=pdf_headers,
             data=json.dumps(spec)
         )
         try:
-            if Config.get('print', {}).get('compute_toc_pages', False):
+            if print_config.get('compute_toc_pages', False):
                 with io.BytesIO() as pdf:
                     pdf.write(print_result.content)
                     pdf_reader = PdfFileReader(pdf)
@@ -128,11 +211,14 @@ class Renderer(JsonRenderer):
                     except ValueError:
                         true_nb_of_toc = 1
 
-                    if true_nb_of_toc != extract_as_dict['nbTocPages']:
+                    reprint = true_nb_of_toc != extract_as_dict['nbTocPages']
+                    toc_statistics = self.count_toc_print(reprint)
+                    if reprint:
                         log.warning('nbTocPages in result pdf: {} are not equal to the one predicted : {}, request new pdf'.format(true_nb_of_toc,extract_as_dict['nbTocPages'])) # noqa
+                        log.info('TOC reprints: {reprints} of {prints} prints'.format(**toc_statistics))
                         extract_as_dict['nbTocPages'] = true_nb_of_toc
-                        print_result = requests.post(
-                            pdf_url,
+                        print_result = print_backends.post(
+                            'buildreport.pdf',
                             headers=pdf_headers,
                             data=json.dumps(spec)
                         )
@@ -142,48 +228,95 @@ class Renderer(JsonRenderer):
             raise HTTPInternalServerError(err_msg)
 
         if not extract_as_dict['isReduced'] and print_result.status_code == 200:
-            main = tempfile.NamedTemporaryFile(suffix='.pdf')
-            main.write(print_result.content)
-            main.flush()
-            cmd = ['pdftk', main.name]
-            temp_files = [main]
-            for url in pdf_to_join:
-                result = requests.get(url)
-                content_type = result.headers.get('content-type')
-                log.debug("document url: " + url + " => content_type: " + content_type)
-                if content_type != 'application/pdf':
-                    msg = "Skipped document inclusion (url: '{}') because content_type: '{}'"
-                    log.warning(msg.format(url, content_type))
-                    continue
-                tmp_file = tempfile.NamedTemporaryFile(suffix='.pdf')
-                tmp_file.write(result.content)
-                tmp_file.flush()
-                temp_files.append(tmp_file)
-                cmd.append(tmp_file.name)
-            out = tempfile.NamedTemporaryFile(suffix='.pdf')
-            cmd += ['cat', 'output', out.name]
-            sys.stdout.flush()
-            time.sleep(0.1)
-            subprocess.check_call(cmd)
-            content = out.file.read()
+            try:
+                content = self.append_documents(print_result.content, pdf_to_join)
+            except PdfReadError as e:
+                err_msg = 'a problem occurred while generating the pdf file'
+                log.error(err_msg + ': ' + str(e))
+                raise HTTPInternalServerError(err_msg)
         else:
             content = print_result.content
 
         # Save printed file to the specified path.
-        pdf_archive_path = print_config.get('pdf_archive_path', None)
         if pdf_archive_path is not None:
             self.archive_pdf_file(pdf_archive_path, content, extract_as_dict)
 
-        response.status_code = print_result.status_code
-        response.headers = print_result.headers
-        if 'Transfer-Encoding' in response.headers:
-            del response.headers['Transfer-Encoding']
-        if 'Connection' in response.headers:
-            del response.headers['Connection']
-        return content
+        headers = print_result.headers
+        if 'Transfer-Encoding' in headers:
+            del headers['Transfer-Encoding']
+        if 'Connection' in headers:
+            del headers['Connection']
+        return print_result.status_code, headers, content
+
+    @staticmethod
+    def append_documents(main, pdf_to_join):
+        """
+        Appends the PDF documents to the full extract. If the PDF cache is configured, the documents are
+        merged once and taken from the cache as long as none of them has changed.
+
+        Args:
+            main (bytes): The PDF created by the print service.
+            pdf_to_join (set of str): The URLs of the documents to append.
+
+        Returns:
+            bytes: The PDF with the appended documents.
+        """
+        document_cache = DocumentCache.get_instance()
+        pdf_cache = PdfCache.get_instance()
+        urls = sorted(pdf_to_join)
+        if pdf_cache is None:
+            documents = [
+                (url, content_type, content, None)
+                for url, content_type, content in document_cache.get_documents(urls)
+            ]
+        else:
+            documents = document_cache.get_versioned_documents(urls)
+        pdf_documents = list()
+        for url, content_type, content, version in documents:
+            log.debug("document url: " + url + " => content_type: " + str(content_type))
+            if content_type != 'application/pdf':
+                msg = "Skipped document inclusion (url: '{}') because content_type: '{}'"
+                log.warning(msg.format(url, content_type))
+                continue
+            pdf_documents.append((url, content, version))
+        if pdf_cache is None:
+            return merge_pdf(main, [(url, content) for url, content, version in pdf_documents])
+
+        cache_key = pdf_cache.get_key([(url, version) for url, content, version in pdf_documents])
+        appendix = pdf_cache.get(cache_key)
+        if appendix is None:
+            contents = list()
+            cacheable = True
+            for url, content, version in pdf_documents:
+                # Cached documents which have not changed are only read if they have to be merged.
+                if content is None:
+                    content = document_cache.read_cached(url, version)
+                if content is None:
+                    # The document changed since its version was checked, so the merged documents do not
+                    # match the key.
+                    cacheable = False
+                    content = document_cache.get_document(url)[1]
+                contents.append((url, content))
+            appendix = merge_documents(contents)
+            if cacheable:
+                pdf_cache.set(cache_key, appendix)
+        else:
+            log.debug('Appended documents {0} taken from cache'.format(cache_key))
+        return merge_pdf(main, [], appendix=appendix)
 
     @staticmethod
     def archive_pdf_file(pdf_archive_path, binary_content, extract_as_dict):
+        """
+        Queues a created PDF to be written to the archive by a background thread.
+
+        Args:
+            pdf_archive_path (str): The directory of the archive.
+            binary_content (bytes): The PDF.
+            extract_as_dict (dict): The printable extract.
+
+        Returns:
+            str: The path of the archived file.
+        """
         pdf_archive_path = pdf_archive_path if pdf_archive_path[-1:] == '/' else pdf_archive_path + '/'
         log.debug('Start to archive pdf file at path: ' + pdf_archive_path)
 
@@ -191,9 +324,7 @@ class Renderer(JsonRenderer):
         egrid = extract_as_dict.get('RealEstate_EGRID', 'no_egrid')
         path_and_filename = pdf_archive_path + time_info + '_' + egrid + '.pdf'
 
-        archive = open(path_and_filename, 'ab')
-        archive.write(binary_content)
-        log.debug('Pdf file archived at: ' + path_and_filename)
+        PdfArchive.get_instance().submit(path_and_filename, binary_content)
         return path_and_filename
 
     @staticmethod
@@ -230,8 +361,10 @@ class Renderer(JsonRenderer):
                          Used in the full extract only
         """
 
-        log.debug("Starting transformation, extract_dict is {}".format(extract_dict))
-        log.debug("Parameter feature_geometry is {}".format(feature_geometry))
+        # Formatting the whole extract is expensive, so it is only done if it is logged.
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Starting transformation, extract_dict is {}".format(extract_dict))
+            log.debug("Parameter feature_geometry is {}".format(feature_geometry))
 
         creation_date = datetime.strptime(extract_dict['CreationDate'], '%Y-%m-%dT%H:%M:%S')
         extract_dict['Footer'] = '   '.join([
@@ -290,6 +423,19 @@ class Renderer(JsonRenderer):
             self._multilingual_text(item, 'Content')
         self._multilingual_text(extract_dict, 'PLRCadastreAuthority_Name')
 
+        # One restriction entry per theme, built in a single pass over the restrictions
+        theme_restriction = {}
+        # The legend symbols and responsible offices already added to each theme entry
+        theme_symbol_refs = {}
+        theme_office_names = {}
+        text_element = [
+            'Information', 'Lawstatus_Code', 'Lawstatus_Text', 'SymbolRef', 'TypeCode'
+        ]
+        legend_element = [
+            'TypeCode', 'TypeCodelist', 'AreaShare', 'PartInPercent', 'LengthShare', 'NrOfPoints',
+            'SymbolRef', 'Information'
+        ]
+        split_sub_themes = Config.get('print', {}).get('split_sub_themes', False)
         for restriction_on_landownership in extract_dict.get('RealEstate_RestrictionOnLandownership', []):
             self._flatten_object(restriction_on_landownership, 'Lawstatus')
             self._flatten_object(restriction_on_landownership, 'Theme')
@@ -340,23 +486,26 @@ class Renderer(JsonRenderer):
             hints = {}
 
             if 'LegalProvisions' in restriction_on_landownership:
-                finish = False
-                while not finish:
-                    finish = True
+                referenced = False
+                for legal_provision in restriction_on_landownership['LegalProvisions']:
+                    if 'Base64TextAtWeb' in legal_provision:
+                        del legal_provision['Base64TextAtWeb']
+                    if 'Reference' in legal_provision:
+                        for reference in legal_provision['Reference']:
+                            self._categorize_documents(reference, legal_provisions, laws, hints)
+                        del legal_provision['Reference']
+                        referenced = True
+                    if 'Article' in legal_provision:
+                        for article in legal_provision['Article']:
+                            self._categorize_documents(article, legal_provisions, laws, hints)
+                        del legal_provision['Article']
+                        referenced = True
+
+                    self._categorize_documents(legal_provision, legal_provisions, laws, hints)
+
+                if referenced:
+                    # The legal provisions themselves take precedence over references to the same document.
                     for legal_provision in restriction_on_landownership['LegalProvisions']:
-                        if 'Base64TextAtWeb' in legal_provision:
-                            del legal_provision['Base64TextAtWeb']
-                        if 'Reference' in legal_provision:
-                            for reference in legal_provision['Reference']:
-                                self._categorize_documents(reference, legal_provisions, laws, hints)
-                            del legal_provision['Reference']
-                            finish = False
-                        if 'Article' in legal_provision:
-                            for article in legal_provision['Article']:
-                                self._categorize_documents(article, legal_provisions, laws, hints)
-                            del legal_provision['Article']
-                            finish = False
-
                         self._categorize_documents(legal_provision, legal_provisions, laws, hints)
 
                 del restriction_on_landownership['LegalProvisions']
@@ -365,17 +514,6 @@ class Renderer(JsonRenderer):
             restriction_on_landownership['Laws'] = laws
             restriction_on_landownership['Hints'] = hints
 
-        # One restriction entry per theme
-        theme_restriction = {}
-        text_element = [
-            'Information', 'Lawstatus_Code', 'Lawstatus_Text', 'SymbolRef', 'TypeCode'
-        ]
-        legend_element = [
-            'TypeCode', 'TypeCodelist', 'AreaShare', 'PartInPercent', 'LengthShare', 'NrOfPoints',
-            'SymbolRef', 'Information'
-        ]
-        split_sub_themes = Config.get('print', {}).get('split_sub_themes', False)
-        for restriction_on_landownership in extract_dict.get('RealEstate_RestrictionOnLandownership', []):
             theme = restriction_on_landownership['Theme_Code']
 
             if split_sub_themes:
@@ -400,6 +538,8 @@ class Renderer(JsonRenderer):
                         del current[element]
                     legend['Geom_Type'] = geom_type
                 current['Legend'] = [legend]
+                theme_symbol_refs[theme] = set()
+                theme_office_names[theme] = set([current['ResponsibleOffice'][0]['Name']])
 
                 # Text
                 for element in text_element:
@@ -422,10 +562,8 @@ class Renderer(JsonRenderer):
                     legend['Geom_Type'] = geom_type
             current['Legend'].append(legend)
 
-            # Remove in OtherLegend elements that are already in the legend
-            current['OtherLegend'] = [other_legend_element
-                                      for other_legend_element in current['OtherLegend']
-                                      if other_legend_element['SymbolRef'] != legend['SymbolRef']]
+            # Elements in OtherLegend that are already in the legend are removed after the pass
+            theme_symbol_refs[theme].add(legend['SymbolRef'])
 
             # Number or array
             for element in ['Laws', 'LegalProvisions', 'Hints']:
@@ -436,8 +574,8 @@ class Renderer(JsonRenderer):
 
             # add additional ResponsibleOffice to theme if it not already exists there
             new_responsible_office = restriction_on_landownership['ResponsibleOffice'][0]
-            existing_office_names = list(map(lambda o: o['Name'], current['ResponsibleOffice']))
-            if new_responsible_office['Name'] not in existing_office_names:
+            if new_responsible_office['Name'] not in theme_office_names[theme]:
+                theme_office_names[theme].add(new_responsible_office['Name'])
                 current['ResponsibleOffice'].append(new_responsible_office)
 
             # Text
@@ -445,7 +583,15 @@ class Renderer(JsonRenderer):
                 if element in restriction_on_landownership:
                     current[element].add(restriction_on_landownership[element])
 
-        for restriction_on_landownership in theme_restriction.values():
+        for theme, restriction_on_landownership in theme_restriction.items():
+            # Remove in OtherLegend elements that are already in the legend
+            if theme_symbol_refs[theme]:
+                restriction_on_landownership['OtherLegend'] = [
+                    other_legend_element
+                    for other_legend_element in restriction_on_landownership['OtherLegend']
+                    if other_legend_element['SymbolRef'] not in theme_symbol_refs[theme]
+                ]
+
             for element in text_element:
                 restriction_on_landownership[element] = '\n'.join(restriction_on_landownership[element])
             for element in ['Laws', 'LegalProvisions', 'Hints']:
@@ -479,10 +625,8 @@ class Renderer(JsonRenderer):
                 self.sort_hints
             )
 
-        restrictions = list(theme_restriction.values())
-        for restriction in restrictions:
             legends = {}
-            for legend in restriction['Legend']:
+            for legend in restriction_on_landownership['Legend']:
                 type_ = legend['TypeCode']
                 if type_ in legends:
                     for item in ['AreaShare', 'LengthShare', 'PartInPercent', 'NrOfPoints']:
@@ -496,18 +640,21 @@ class Renderer(JsonRenderer):
             # After transformation, get the new legend entries, sorted by TypeCode
             transformed_legend = \
                 list([transformed_entry for (key, transformed_entry) in legends.items()])
-            restriction['Legend'] = self.sort_dict_list(transformed_legend, self.sort_legend_elem)
+            restriction_on_landownership['Legend'] = self.sort_dict_list(
+                transformed_legend,
+                self.sort_legend_elem
+            )
 
+        restrictions = list(theme_restriction.values())
         sorted_restrictions = []
         if split_sub_themes:
             # sort sub themes if sub theme splitting is enabled
             sorted_restrictions = self._sort_sub_themes(restrictions)
         else:
             # default sorting
+            split_by_theme_code = self._split_restrictions_by_theme_code(restrictions)
             for theme in Config.get_themes():
-                for restriction in restrictions:
-                    if theme.code == restriction.get('Theme_Code'):
-                        sorted_restrictions.append(restriction)
+                sorted_restrictions.extend(split_by_theme_code.get(theme.code, []))
 
         extract_dict['RealEstate_RestrictionOnLandownership'] = sorted_restrictions
         # End one restriction entry per theme
@@ -544,17 +691,19 @@ class Renderer(JsonRenderer):
                 if 'NrOfPoints' in legend:
                     legend['NrOfPoints'] = '{0}'.format(legend['NrOfPoints'])
 
-        log.debug("After transformation, extract_dict is {}".format(extract_dict))
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("After transformation, extract_dict is {}".format(extract_dict))
         return extract_dict
 
     @staticmethod
     def group_legal_provisions(legal_provisions):
         merged_provision = []
+        elements_by_title = {}
         for element in legal_provisions:
             # get element with same title if existing
-            existing_element = \
-                next((item for item in merged_provision if item['Title'] == element['Title']), None)
+            existing_element = elements_by_title.get(element['Title'])
             if not existing_element:
+                elements_by_title[element['Title']] = element
                 merged_provision.append(element)
                 continue
 
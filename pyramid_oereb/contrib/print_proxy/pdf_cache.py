@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Cache of the documents appended to the full static extract, merged into one PDF. The appended documents
+are mostly the same laws for each extract, so they are read and checked once and the merged PDF is
+appended to the following extracts. The merged PDF is identified by the URLs and the versions of the
+documents. The pages of the extract itself depend on the request (creation date, extract identifier) and
+are always created by the print service.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from pyramid_oereb import Config
+from pyramid_oereb.contrib.print_proxy.storage import delete_least_recently_used, read_file, write_file
+
+
+log = logging.getLogger(__name__)
+
+
+class PdfCache(object):
+    """
+    Keeps the merged appended documents in a directory for a time to live. The least recently used PDFs
+    are deleted if all PDFs exceed the configured size.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, path, max_size=1024 * 1024 * 1024, ttl=86400):
+        """
+        Args:
+            path (str): The directory to keep the PDFs in.
+            max_size (int): The maximum size of all cached PDFs in bytes.
+            ttl (int): The time in seconds a PDF is used after it has been merged.
+        """
+        self._path = path
+        self._max_size = max_size
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Returns the PDF cache created from the `pdf_cache` section of the print configuration. It is
+        created once per process.
+
+        Returns:
+            pyramid_oereb.contrib.print_proxy.pdf_cache.PdfCache or None: The PDF cache or None if it is not
+            configured.
+        """
+        if cls._instance is None:
+            cache_config = Config.get('print', {}).get('pdf_cache')
+            if cache_config is None:
+                return None
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls(
+                        cache_config['path'],
+                        max_size=cache_config.get('max_size', 1024 * 1024 * 1024),
+                        ttl=cache_config.get('ttl', 86400)
+                    )
+        return cls._instance
+
+    @staticmethod
+    def get_key(document_versions):
+        """
+        Returns the key of the merged documents.
+
+        Args:
+            document_versions (list of tuple): The URL and the version of each document, in the order they
+                are appended.
+
+        Returns:
+            str: The key, which is the same for equal documents in the same order.
+        """
+        content = json.dumps([list(document) for document in document_versions])
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        Returns the cached merged documents.
+
+        Args:
+            key (str): The key of the merged documents.
+
+        Returns:
+            bytes or None: The merged documents or None if they are not cached or expired.
+        """
+        try:
+            with open(self._get_file_path(key, 'json')) as f:
+                metadata = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+        if metadata.get('created', 0) + self._ttl < time.time():
+            return None
+        return read_file(self._get_file_path(key, 'pdf'))
+
+    def set(self, key, content):
+        """
+        Stores the merged documents.
+
+        Args:
+            key (str): The key of the merged documents.
+            content (bytes): The merged documents.
+        """
+        if len(content) > self._max_size:
+            return
+        metadata = {'created': time.time()}
+        try:
+            write_file(self._get_file_path(key, 'pdf'), content)
+            write_file(self._get_file_path(key, 'json'), json.dumps(metadata).encode('utf-8'))
+            with self._lock:
+                delete_least_recently_used(self._path, 'pdf', self._max_size, ('json',))
+        except (IOError, OSError) as e:
+            log.warning('PDF {0} could not be cached: {1}'.format(key, e))
+
+    def _get_file_path(self, key, extension):
+        return os.path.join(self._path, '{0}.{1}'.format(key, extension))
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import io
+import logging
+
+from PyPDF2 import PdfFileReader, PdfFileWriter
+from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject
+from PyPDF2.utils import PdfReadError
+
+from pyramid_oereb.lib.cache import Cache
+
+
+log = logging.getLogger(__name__)
+
+_invalid_documents = Cache(max_size=256)
+"""pyramid_oereb.lib.cache.Cache: The hashes of the documents which could not be read, with the error."""
+
+
+def get_pages(content):
+    """
+    Reads the pages of a PDF document. PyPDF2 resolves the objects of a page only when it is written, so
+    the references of the pages are resolved here. A broken reference then fails here instead of when the
+    whole extract is written, and the resolved objects are kept by the reader for writing. Documents which
+    can not be read are remembered by the hash of their content, so the same law is not parsed again for
+    each extract only to fail again.
+
+    Args:
+        content (bytes): The PDF document.
+
+    Returns:
+        list of PyPDF2.pdf.PageObject: The pages of the document.
+
+    Raises:
+        PyPDF2.utils.PdfReadError: The document can not be read.
+    """
+    key = hashlib.sha1(content).hexdigest()
+    error = _invalid_documents.get(key)
+    if error is not None:
+        raise PdfReadError(error)
+    try:
+        reader = PdfFileReader(io.BytesIO(content), strict=False)
+        if reader.isEncrypted and not reader.decrypt(''):
+            raise PdfReadError('the document is encrypted')
+        pages = [reader.getPage(i) for i in range(reader.getNumPages())]
+        _resolve_references(pages)
+        return pages
+    except (PdfReadError, NotImplementedError, ValueError, KeyError, TypeError) as e:
+        _invalid_documents.set(key, str(e) or e.__class__.__name__)
+        raise PdfReadError(str(e))
+
+
+def merge_documents(documents):
+    """
+    Merges documents into one PDF in memory, which can be appended to several extracts with
+    :func:`merge_pdf`. Documents which can not be read are skipped with a warning.
+
+    Args:
+        documents (list of tuple): The URL and the content of each document.
+
+    Returns:
+        bytes: The merged documents.
+    """
+    writer = PdfFileWriter()
+    _add_documents(writer, documents)
+    return _write(writer)
+
+
+def merge_pdf(main, documents, appendix=None):
+    """
+    Appends the pages of the documents to the main PDF in memory. Documents which can not be read are
+    skipped with a warning.
+
+    Args:
+        main (bytes): The main PDF, as created by the print service.
+        documents (list of tuple): The URL and the content of each document to append.
+        appendix (bytes or None): Documents merged by :func:`merge_documents`, which are appended before the
+            documents without being checked again.
+
+    Returns:
+        bytes: The merged PDF.
+    """
+    writer = PdfFileWriter()
+    reader = PdfFileReader(io.BytesIO(main), strict=False)
+    for i in range(reader.getNumPages()):
+        writer.addPage(reader.getPage(i))
+    if appendix is not None:
+        reader = PdfFileReader(io.BytesIO(appendix), strict=False)
+        for i in range(reader.getNumPages()):
+            writer.addPage(reader.getPage(i))
+    _add_documents(writer, documents)
+    return _write(writer)
+
+
+def _resolve_references(pages):
+    resolved = set()
+    stack = list(pages)
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, IndirectObject):
+            if (obj.idnum, obj.generation) in resolved:
+                continue
+            resolved.add((obj.idnum, obj.generation))
+            target = obj.getObject()
+            if target is None:
+                raise PdfReadError('Could not find object {0} {1}'.format(obj.idnum, obj.generation))
+            stack.append(target)
+        elif isinstance(obj, DictionaryObject):
+            # The parent of a page is replaced when the page is added to another document.
+            stack.extend(value for key, value in obj.items() if key != '/Parent')
+        elif isinstance(obj, ArrayObject):
+            stack.extend(obj)
+
+
+def _add_documents(writer, documents):
+    for url, content in documents:
+        try:
+            pages = get_pages(content)
+        except PdfReadError as e:
+            msg = "Skipped document inclusion (url: '{}') because it can not be read: {}"
+            log.warning(msg.format(url, e))
+            continue
+        for page in pages:
+            writer.addPage(page)
+
+
+def _write(writer):
+    with io.BytesIO() as output:
+        writer.write(output)
+        return output.getvalue()
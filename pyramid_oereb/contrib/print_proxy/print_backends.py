@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+Pool of the mapfish print instances the print proxy sends its requests to. The pool selects the least busy
+or the next instance, limits the number of simultaneous requests per instance and lets a bounded number
+of requests wait for a free instance. Instances which can not be reached are skipped until a health check
+succeeds again.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from urllib import parse as urlparse
+
+import requests
+from pyramid.httpexceptions import HTTPServiceUnavailable
+
+from pyramid_oereb import Config
+
+
+log = logging.getLogger(__name__)
+
+STRATEGY_LEAST_BUSY = 'least_busy'
+STRATEGY_ROUND_ROBIN = 'round_robin'
+
+
+class PrintBackend(object):
+    """
+    A mapfish print instance of the pool.
+    """
+
+    def __init__(self, base_url, max_concurrent=None):
+        """
+        Args:
+            base_url (str): The base URL with the print application.
+            max_concurrent (int or None): The number of simultaneous requests. None means unlimited.
+        """
+        self.base_url = base_url
+        self.max_concurrent = max_concurrent
+        self.active = 0
+        self.healthy = True
+        self.next_check = 0
+
+    @property
+    def available(self):
+        """bool: True if the instance is healthy and can take another request."""
+        return self.healthy and (self.max_concurrent is None or self.active < self.max_concurrent)
+
+    def get_url(self, name):
+        """
+        Returns the URL of a service of the print application.
+
+        Args:
+            name (str): The name of the service, e.g. `buildreport.pdf`.
+
+        Returns:
+            str: The URL of the service.
+        """
+        return urlparse.urljoin(self.base_url + '/', name)
+
+
+class PrintBackendPool(object):
+    """
+    Distributes the print requests to the configured print instances.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, base_urls, strategy=STRATEGY_LEAST_BUSY, max_concurrent=None, max_queued=None,
+                 queue_timeout=30, health_check_interval=30, retry_after=10):
+        """
+        Args:
+            base_urls (list of str): The base URLs of the print instances.
+            strategy (str): `least_busy` to select the instance with the fewest running requests or
+                `round_robin` to select the instances in turn.
+            max_concurrent (int or None): The number of simultaneous requests per instance. None means
+                unlimited.
+            max_queued (int or None): The number of requests which may wait for a free instance. Further
+                requests are rejected. None means unlimited.
+            queue_timeout (int): The time in seconds a request waits for a free instance.
+            health_check_interval (int): The time in seconds after which an instance which could not be
+                reached is checked again.
+            retry_after (int): The delay in seconds proposed to the clients if a request is rejected.
+        """
+        if strategy not in [STRATEGY_LEAST_BUSY, STRATEGY_ROUND_ROBIN]:
+            raise ValueError('Unknown print backend strategy: {0}'.format(strategy))
+        self.backends = [PrintBackend(base_url, max_concurrent) for base_url in base_urls]
+        self._strategy = strategy
+        self._max_queued = max_queued
+        self._queue_timeout = queue_timeout
+        self._health_check_interval = health_check_interval
+        self._retry_after = retry_after
+        self._waiting = 0
+        self._next = 0
+        self._condition = threading.Condition()
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Returns the pool created from the print configuration. The instances are taken from the optional
+        `backends` section and default to the `base_url`. It is created once per process.
+
+        Returns:
+            pyramid_oereb.contrib.print_proxy.print_backends.PrintBackendPool: The pool.
+        """
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    print_config = Config.get('print', {})
+                    backends_config = print_config.get('backends') or {}
+                    cls._instance = cls(
+                        backends_config.get('base_urls') or [print_config['base_url']],
+                        strategy=backends_config.get('strategy', STRATEGY_LEAST_BUSY),
+                        max_concurrent=backends_config.get('max_concurrent'),
+                        max_queued=backends_config.get('max_queued'),
+                        queue_timeout=backends_config.get('queue_timeout', 30),
+                        health_check_interval=backends_config.get('health_check_interval', 30),
+                        retry_after=backends_config.get('retry_after', 10)
+                    )
+        return cls._instance
+
+    @contextmanager
+    def acquire(self):
+        """
+        Selects a print instance for a request and releases it afterwards. If all instances are busy, the
+        request waits for a free one.
+
+        Yields:
+            pyramid_oereb.contrib.print_proxy.print_backends.PrintBackend: The selected instance.
+
+        Raises:
+            pyramid.httpexceptions.HTTPServiceUnavailable: No instance is available within the queue
+                timeout, the queue is full or no instance can be reached.
+        """
+        self.check_health()
+        backend = self._acquire()
+        try:
+            yield backend
+        finally:
+            with self._condition:
+                backend.active -= 1
+                self._condition.notify()
+
+    def post(self, name, **kwargs):
+        """
+        Sends a POST request to a service of a print instance. If the instance can not be reached, it is
+        marked as unhealthy and the request is sent to another instance.
+
+        Args:
+            name (str): The name of the service, e.g. `buildreport.pdf`.
+            **kwargs: The arguments passed to :func:`requests.post`.
+
+        Returns:
+            requests.Response: The response of the print instance.
+        """
+        for attempt in range(len(self.backends)):
+            with self.acquire() as backend:
+                try:
+                    return requests.post(backend.get_url(name), **kwargs)
+                except requests.ConnectionError as e:
+                    log.error('Print service {0} can not be reached: {1}'.format(backend.base_url, e))
+                    self.set_healthy(backend, False)
+                    if attempt == len(self.backends) - 1:
+                        raise
+
+    def set_healthy(self, backend, healthy):
+        """
+        Sets the health of a print instance.
+
+        Args:
+            backend (pyramid_oereb.contrib.print_proxy.print_backends.PrintBackend): The instance.
+            healthy (bool): True if the instance can be reached.
+        """
+        with self._condition:
+            backend.healthy = healthy
+            backend.next_check = time.monotonic() + self._health_check_interval
+            if healthy:
+                self._condition.notify_all()
+
+    def check_health(self):
+        """
+        Checks the print instances which could not be reached, once the health check interval is over.
+        An instance is healthy again if its capabilities can be requested.
+        """
+        now = time.monotonic()
+        with self._condition:
+            due = [b for b in self.backends if not b.healthy and b.next_check <= now]
+            for backend in due:
+                # Prevent concurrent requests from checking the same instance.
+                backend.next_check = now + self._health_check_interval
+        for backend in due:
+            try:
+                healthy = requests.get(backend.get_url('capabilities.json'), timeout=5).status_code == 200
+            except requests.RequestException:
+                healthy = False
+            log.info('Health check of print service {0}: {1}'.format(
+                backend.base_url, 'healthy' if healthy else 'unhealthy'
+            ))
+            self.set_healthy(backend, healthy)
+
+    def _acquire(self):
+        deadline = time.monotonic() + self._queue_timeout
+        with self._condition:
+            backend = self._select()
+            if backend is None:
+                if self._max_queued is not None and self._waiting >= self._max_queued:
+                    raise self._unavailable('too many waiting print requests')
+                self._waiting += 1
+                try:
+                    while backend is None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0 or not any(b.healthy for b in self.backends):
+                            raise self._unavailable('no print service available')
+                        self._condition.wait(remaining)
+                        backend = self._select()
+                finally:
+                    self._waiting -= 1
+            backend.active += 1
+            return backend
+
+    def _select(self):
+        count = len(self.backends)
+        candidates = list()
+        for i in range(count):
+            backend = self.backends[(self._next + i) % count]
+            if backend.available:
+                candidates.append(backend)
+        if not candidates:
+            return None
+        if self._strategy == STRATEGY_LEAST_BUSY:
+            # The candidates start at the next instance, so instances with equal load are used in turn.
+            backend = min(candidates, key=lambda b: b.active)
+        else:
+            backend = candidates[0]
+        self._next = (self.backends.index(backend) + 1) % count
+        return backend
+
+    def _unavailable(self, reason):
+        log.warning('Print request rejected: {0}'.format(reason))
+        return HTTPServiceUnavailable(reason, headers={'Retry-After': str(self._retry_after)})
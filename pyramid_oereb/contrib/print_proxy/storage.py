@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers for the files the print proxy keeps on disk (print jobs, downloaded documents and created PDFs),
+which may be shared by several processes.
+"""
+import os
+import tempfile
+
+
+def write_file(path, content):
+    """
+    Writes a file to a temporary file in the same directory first and renames it afterwards, so a
+    concurrent reader never gets an incomplete file.
+
+    Args:
+        path (str): The path of the file.
+        content (bytes): The content of the file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+
+def read_file(path):
+    """
+    Reads a file and updates its modification time, which is used to delete the least recently used files.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        bytes or None: The content of the file or None if the file does not exist.
+    """
+    try:
+        with open(path, 'rb') as f:
+            content = f.read()
+        os.utime(path, None)
+        return content
+    except (IOError, OSError):
+        return None
+
+
+def delete_least_recently_used(directory, extension, max_size, related_extensions=()):
+    """
+    Deletes the least recently used files of a directory until their total size does not exceed the
+    maximum size.
+
+    Args:
+        directory (str): The directory.
+        extension (str): The extension of the files to count.
+        max_size (int): The maximum size of the files in bytes.
+        related_extensions (tuple of str): The extensions of the files belonging to a counted file, which
+            are deleted together with it.
+    """
+    suffix = '.' + extension
+    files = list()
+    for file_name in os.listdir(directory):
+        if file_name.endswith(suffix):
+            try:
+                stat = os.stat(os.path.join(directory, file_name))
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, file_name))
+    size = sum(f[1] for f in files)
+    for mtime, file_size, file_name in sorted(files):
+        if size <= max_size:
+            break
+        name = file_name[:-len(suffix)]
+        for path in [file_name] + ['{0}.{1}'.format(name, e) for e in related_extensions]:
+            try:
+                os.remove(os.path.join(directory, path))
+            except OSError:
+                pass
+        size -= file_size
@@ -1,5 +1,6 @@
 import logging
-import unicodedata
+
+from pyramid_oereb.lib.renderer import get_collation_key
 
 log = logging.getLogger(__name__)
 
@@ -14,10 +15,7 @@ def unaccent_lower(text):
     Returns:
         new_text (str): The text value converted to lower case and striped of special characters.
     """
-    if text is None:
-        return ''
-    new_text = text.lower()
-    return unicodedata.normalize('NFD', new_text)
+    return get_collation_key(text)
 
 
 class BaseSort(object):
@@ -49,7 +47,7 @@ class AlphabeticSort(BaseSort):
             Returns:
                 list: Sorted array of sub themes
         """
-        return sorted(sub_themes, key=lambda sub_theme: unaccent_lower(sub_theme['SubTheme']))
+        return sorted(sub_themes, key=lambda sub_theme: get_collation_key(sub_theme['SubTheme']))
 
 
 class ListSort(BaseSort):
@@ -1,9 +1,82 @@
 # -*- coding: utf-8 -*-
 import logging
 import textwrap
+import unicodedata
 
 log = logging.getLogger(__name__)
 
+# Advance widths (1/1000 em) of the Helvetica font, taken from the Adobe font metrics (AFM) of the standard
+# PDF fonts. Accented characters are measured by their base character, which has the same width in
+# Helvetica.
+HELVETICA_WIDTHS = {
+    ' ': 278, '!': 278, '"': 355, '#': 556, '$': 556, '%': 889, '&': 667, "'": 191, '(': 333, ')': 333,
+    '*': 389, '+': 584, ',': 278, '-': 333, '.': 278, '/': 278, ':': 278, ';': 278, '<': 584, '=': 584,
+    '>': 584, '?': 556, '@': 1015, '[': 278, '\\': 278, ']': 278, '^': 469, '_': 556, '`': 333, '{': 334,
+    '|': 260, '}': 334, '~': 584, '\u00ab': 556, '\u00bb': 556, '\u00a7': 556, '\u00b0': 400,
+    '\u00df': 611, '\u2013': 556, '\u2014': 1000, '\u2018': 222, '\u2019': 222, '\u201c': 333,
+    '\u201d': 333, '\u201e': 333, '\u2026': 1000,
+    'A': 667, 'B': 667, 'C': 722, 'D': 722, 'E': 667, 'F': 611, 'G': 778, 'H': 722, 'I': 278, 'J': 500,
+    'K': 667, 'L': 556, 'M': 833, 'N': 722, 'O': 778, 'P': 667, 'Q': 778, 'R': 722, 'S': 667, 'T': 611,
+    'U': 722, 'V': 667, 'W': 944, 'X': 667, 'Y': 667, 'Z': 611,
+    'a': 556, 'b': 556, 'c': 500, 'd': 556, 'e': 556, 'f': 278, 'g': 556, 'h': 556, 'i': 222, 'j': 222,
+    'k': 500, 'l': 222, 'm': 833, 'n': 556, 'o': 556, 'p': 556, 'q': 556, 'r': 333, 's': 500, 't': 278,
+    'u': 556, 'v': 500, 'w': 722, 'x': 500, 'y': 500, 'z': 500
+}
+HELVETICA_WIDTHS.update(dict((str(digit), 556) for digit in range(10)))
+DEFAULT_WIDTH = 556
+
+
+def get_text_width(text, font_size):
+    """
+    Returns the width of a single line of text.
+
+    Args:
+        text (str): The text.
+        font_size (float): The font size in points.
+
+    Returns:
+        float: The width of the text in points.
+    """
+    width = 0
+    for char in text:
+        char_width = HELVETICA_WIDTHS.get(char)
+        if char_width is None:
+            char_width = HELVETICA_WIDTHS.get(unicodedata.normalize('NFD', char)[0], DEFAULT_WIDTH)
+        width += char_width
+    return width * font_size / 1000.0
+
+
+def get_number_of_lines(text, width, font_size):
+    """
+    Returns the number of lines a text is wrapped to in a text field, breaking the lines between words
+    like the print service does. Words which are wider than the text field are split.
+
+    Args:
+        text (str): The text.
+        width (float): The width of the text field in points.
+        font_size (float): The font size in points.
+
+    Returns:
+        int: The number of lines.
+    """
+    space_width = get_text_width(' ', font_size)
+    lines = 0
+    for paragraph in (text or '').splitlines() or ['']:
+        lines += 1
+        line_width = 0
+        for word in paragraph.split():
+            word_width = get_text_width(word, font_size)
+            if line_width > 0 and line_width + space_width + word_width <= width:
+                line_width += space_width + word_width
+                continue
+            if line_width > 0:
+                lines += 1
+            while word_width > width:
+                lines += 1
+                word_width -= width
+            line_width = word_width
+    return lines
+
 
 class TocPages():
 
@@ -20,6 +93,12 @@ class TocPages():
         self.d6_right_width = 233
         self.d6_stuff_y_location = 39
         self.d6_left_height = 0  # FIXME: compute this
+        self.d6_left_width = 233
+        # fonts of the text fields in the templates toc.jrxml and exclusion_of_liability.jrxml
+        self.title_font_size = 7
+        self.title_line_height = 14
+        self.content_font_size = 6
+        self.content_line_height = 10
         self.title_size = 62
         self.toc_title_height = 15 + 62 + 12  # height + location + item starting position
         self.toc_item_height = 20
@@ -63,15 +142,17 @@ class TocPages():
         paragraph_space = 11
         for i in self.extract['GeneralInformation']:
             total_size += paragraph_space
-            total_size += self.compute_length_of_wrapped_text(i['Text'],
-                                                              78,
-                                                              10)
+            total_size += self.compute_height_of_wrapped_text(i['Text'],
+                                                              self.d6_left_width,
+                                                              self.content_font_size,
+                                                              self.content_line_height)
         total_size += 5
         for i in self.extract['BaseData']:
             total_size += paragraph_space
-            total_size += self.compute_length_of_wrapped_text(i['Text'],
-                                                              78,
-                                                              10)
+            total_size += self.compute_height_of_wrapped_text(i['Text'],
+                                                              self.d6_left_width,
+                                                              self.content_font_size,
+                                                              self.content_line_height)
         log.debug('d6 left total_size : {}'.format(total_size))
         if total_size > content_min_size:
             return total_size
@@ -80,9 +161,14 @@ class TocPages():
 
     @staticmethod
     def compute_length_of_wrapped_text(text, nb_char, font_size):
+        # Kept for existing callers, the TOC estimation uses compute_height_of_wrapped_text.
         t = textwrap.wrap(text, nb_char)
         return len(t) * font_size
 
+    @staticmethod
+    def compute_height_of_wrapped_text(text, width, font_size, line_height):
+        return get_number_of_lines(text, width, font_size) * line_height
+
     def compute_d6_right(self):
         # variables taken from template exclusion_of_liability.jrxml
         space_above = 4
@@ -91,13 +177,15 @@ class TocPages():
         total_size = 0
         for i in self.extract['ExclusionOfLiability']:
             total_size += space_above
-            total_size += self.compute_length_of_wrapped_text(i['Title'][0]['Text'],
-                                                              65,
-                                                              14)
+            total_size += self.compute_height_of_wrapped_text(i['Title'][0]['Text'],
+                                                              self.d6_right_width,
+                                                              self.title_font_size,
+                                                              self.title_line_height)
             total_size += space_title_content
-            total_size += self.compute_length_of_wrapped_text(i['Content'][0]['Text'],
-                                                              78,
-                                                              10)
+            total_size += self.compute_height_of_wrapped_text(i['Content'][0]['Text'],
+                                                              self.d6_right_width,
+                                                              self.content_font_size,
+                                                              self.content_line_height)
         log.debug('d6 ritght total_size : {}'.format(total_size))
         if total_size > content_min_size:
             return total_size
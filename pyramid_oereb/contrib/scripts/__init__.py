@@ -46,6 +46,14 @@ def create_oereblex_model():
         metavar='PRIMARY_KEY_IS_STRING',
         help='Switch to choose if primary keys in desired new models are STRING or INTEGER'
     )
+    parser.add_option(
+        '-b', '--binary_images',
+        dest='binary_images',
+        action='store_true',
+        default=False,
+        help='Store legend entry symbols as binary (bytea) instead of BaseCode64 encoded strings. If not '
+             'set, the column type follows the "binary_images" setting of the configuration.'
+    )
     primary_key_is_string = False
     options, args = parser.parse_args()
     if not options.code:
@@ -57,4 +65,4 @@ def create_oereblex_model():
     if options.primary_key_is_string:
         primary_key_is_string = True
     _create_oereblex_models_py_(options.code, options.geometry_type, options.target_path, options.schema,
-                                primary_key_is_string)
+                                primary_key_is_string, options.binary_images)
@@ -5,7 +5,8 @@ from mako.template import Template
 from pyramid_oereb.standard import convert_camel_case_to_snake_case, convert_camel_case_to_text_form
 
 
-def _create_oereblex_models_py_(code, geometry_type, absolute_path, schema=None, primary_key_is_string=False):
+def _create_oereblex_models_py_(code, geometry_type, absolute_path, schema=None, primary_key_is_string=False,
+                                binary_images=False):
     """
     The simplest way to get a python file containing a database definition in sqlalchemy orm way. It will
     contain all necessary definitions to produce an extract as the specification defines for the new topic.
@@ -19,6 +20,9 @@ def _create_oereblex_models_py_(code, geometry_type, absolute_path, schema=None,
         schema (str): The schema name. If not specified, "name" will be used.
         primary_key_is_string (bool): The type of the primary key. You can use this to switch between STRING
             type or INTEGER type. Standard is to INTEGER => False
+        binary_images (bool): Switch to store legend entry symbols always as binary (bytea) instead of
+            BaseCode64 encoded strings. If not set, the column type follows the "binary_images" setting of the
+            configuration. Standard is False.
     """
     template = Template(
         filename=AssetResolver('pyramid_oereb').resolve(
@@ -30,7 +34,8 @@ def _create_oereblex_models_py_(code, geometry_type, absolute_path, schema=None,
         'topic': convert_camel_case_to_text_form(code),
         'schema_name': schema or name,
         'geometry_type': geometry_type,
-        'primary_key_is_string': primary_key_is_string
+        'primary_key_is_string': primary_key_is_string,
+        'binary_images': binary_images
     })
     models_path = '{path}/{name}.py'.format(
         path=absolute_path,
@@ -40,3 +40,19 @@ def decode(value):
         return base64.b64decode(value.encode('ascii'))
     else:
         return base64.b64decode(value)
+
+
+def decode_binary(value):
+    """
+    Returns the binary content of a value which is either stored as base64 encoded string or already as
+    binary (e.g. read from a bytea column).
+
+    Args:
+        value (basestring or bytes or bytearray or memoryview): The stored value.
+
+    Returns:
+        bytes: The binary content.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value)
+    return decode(value)
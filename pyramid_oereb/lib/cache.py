@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from collections import OrderedDict
+
+
+class Cache(object):
+    """
+    A thread safe in-memory cache. Entries can expire after a time to live and the number of entries can be
+    limited. If the limit is reached, the least recently used entry is dropped.
+
+    Args:
+        ttl (int or float or None): The default time to live of an entry in seconds. None means that entries
+            do not expire.
+        max_size (int or None): The maximum number of entries. None means unlimited.
+    """
+
+    _missing_ = object()
+
+    def __init__(self, ttl=None, max_size=None):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries_ = OrderedDict()
+        self._lock_ = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries_)
+
+    def get(self, key, default=None):
+        """
+        Returns the cached value for the key.
+
+        Args:
+            key (hashable): The key of the entry.
+            default (object): The value returned if there is no valid entry for the key.
+
+        Returns:
+            object: The cached value or the default.
+        """
+        with self._lock_:
+            entry = self._entries_.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._entries_[key]
+                return default
+            self._entries_.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        """
+        Stores a value in the cache.
+
+        Args:
+            key (hashable): The key of the entry.
+            value (object): The value to be stored.
+            ttl (int or float or None): The time to live of this entry in seconds. If not set, the default
+                of the cache is used.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires = None if ttl is None else time.monotonic() + ttl
+        with self._lock_:
+            self._entries_[key] = (expires, value)
+            self._entries_.move_to_end(key)
+            if self.max_size is not None:
+                while len(self._entries_) > self.max_size:
+                    self._entries_.popitem(last=False)
+
+    def get_or_create(self, key, creator, ttl=None):
+        """
+        Returns the cached value for the key. If there is no valid entry, it is created by calling the
+        creator and stored in the cache.
+
+        Args:
+            key (hashable): The key of the entry.
+            creator (callable): Function without arguments which creates the value.
+            ttl (int or float or None): The time to live of a new entry in seconds. If not set, the default
+                of the cache is used.
+
+        Returns:
+            object: The cached or newly created value.
+        """
+        value = self.get(key, self._missing_)
+        if value is self._missing_:
+            value = creator()
+            self.set(key, value, ttl=ttl)
+        return value
+
+    def delete(self, key):
+        """
+        Removes the entry for the key if it exists.
+
+        Args:
+            key (hashable): The key of the entry.
+        """
+        with self._lock_:
+            self._entries_.pop(key, None)
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        with self._lock_:
+            self._entries_.clear()
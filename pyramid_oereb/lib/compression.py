@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+import gzip
+import logging
+import zlib
+
+from webob.acceptparse import create_accept_encoding_header
+
+from pyramid_oereb.lib.config import Config
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+log = logging.getLogger(__name__)
+
+COMPRESSIBLE_CONTENT_TYPES = ['application/json', 'application/xml', 'text/xml', 'text/html']
+"""list of str: The content types which are compressed."""
+
+
+def get_compression_config():
+    """
+    Returns the compression configuration. The compression is disabled if there is no `compression`
+    section in the configuration.
+
+    Returns:
+        dict or None: The compression configuration with the keys `min_size` (minimal size of the response
+        body in bytes, default 1024), `level` (default 6) and `brotli` (default False), or None if
+        compression is disabled.
+    """
+    compression = Config.get('compression')
+    if compression is None:
+        return None
+    return {
+        'min_size': int(compression.get('min_size', 1024)),
+        'level': int(compression.get('level', 6)),
+        'brotli': bool(compression.get('brotli', False))
+    }
+
+
+def get_encoding(request, compression):
+    """
+    Returns the content encoding to use for the response, based on the Accept-Encoding header of the
+    request.
+
+    Args:
+        request (pyramid.request.Request): The current request.
+        compression (dict): The compression configuration.
+
+    Returns:
+        str or None: The encoding (br or gzip) or None if the client does not accept a compressed response.
+    """
+    header = request.headers.get('Accept-Encoding')
+    if not header:
+        return None
+    offers = ['gzip']
+    if compression.get('brotli'):
+        if brotli is None:
+            log.warning('Brotli compression is configured but the brotli package is not installed.')
+        else:
+            offers.insert(0, 'br')
+    acceptable = create_accept_encoding_header(header).acceptable_offers(offers)
+    if len(acceptable) == 0:
+        return None
+    return acceptable[0][0]
+
+
+def compress(content, encoding, level=6):
+    """
+    Compresses the content with the specified encoding.
+
+    Args:
+        content (bytes): The content to compress.
+        encoding (str): The encoding, br or gzip.
+        level (int): The compression level (0-9 for gzip, 0-11 for brotli).
+
+    Returns:
+        bytes: The compressed content.
+    """
+    if encoding == 'br':
+        return brotli.compress(content, quality=level)
+    return gzip.compress(content, compresslevel=level)
+
+
+def compress_iter(app_iter, encoding, level=6):
+    """
+    Compresses a streamed response body chunk by chunk.
+
+    Args:
+        app_iter (iterable of bytes): The chunks of the content.
+        encoding (str): The encoding, br or gzip.
+        level (int): The compression level (0-9 for gzip, 0-11 for brotli).
+
+    Returns:
+        generator: The compressed chunks.
+    """
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=level)
+        for chunk in app_iter:
+            compressed = compressor.process(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in app_iter:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+    close = getattr(app_iter, 'close', None)
+    if callable(close):
+        close()
+
+
+def compress_response(request, response):
+    """
+    Compresses the body of the response if it is enabled in the configuration, accepted by the client and
+    the body is large enough. Streamed responses are compressed chunk by chunk.
+
+    Args:
+        request (pyramid.request.Request): The current request.
+        response (pyramid.response.Response): The response to compress.
+
+    Returns:
+        pyramid.response.Response: The response.
+    """
+    compression = get_compression_config()
+    if compression is None or response.status_code != 200 or response.content_encoding:
+        return response
+    if response.content_type not in COMPRESSIBLE_CONTENT_TYPES:
+        return response
+    encoding = get_encoding(request, compression)
+    response.vary = tuple(set(response.vary or ()) | {'Accept-Encoding'})
+    if encoding is None:
+        return response
+    if response.content_length is None and not isinstance(response.app_iter, (list, tuple)):
+        response.app_iter = compress_iter(response.app_iter, encoding, compression['level'])
+        response.content_encoding = encoding
+        return response
+    body = response.body
+    if len(body) < compression['min_size']:
+        return response
+    response.body = compress(body, encoding, compression['level'])
+    response.content_encoding = encoding
+    return response
+
+
+def compressed_view(wrapped):
+    """
+    View decorator which compresses the response of the wrapped view (see :func:`compress_response`).
+    """
+    def wrapper(context, request):
+        return compress_response(request, wrapped(context, request))
+    return wrapper
@@ -22,6 +22,7 @@ class Config(object):
     """
 
     _config = None
+    _logos = None
 
     @staticmethod
     def init(configfile, configsection, c2ctemplate_style=False):
@@ -35,6 +36,7 @@ class Config(object):
         assert Config._config is None
 
         Config._config = _parse(configfile, configsection, c2ctemplate_style)
+        Config._logos = None
 
     @staticmethod
     def get_config():
@@ -299,12 +301,10 @@ class Config(object):
         )
 
     @staticmethod
-    def get_logo_config(language=None):
+    def init_logos():
         """
-        Returns a dictionary of the configured file path's to the logos.
-
-        Returns:
-            dict: The configured paths to the logos wrapped in a dictionary.
+        Reads the configured logos once and keeps them in memory per language. The mime type, the base64
+        encoded form and the ETag of each logo are computed in advance, so serving them is only a lookup.
         """
         assert Config._config is not None
 
@@ -326,20 +326,52 @@ class Config(object):
         confederation_logo = ImageRecord(file_adapter.read(logo_dict.get(confederation_key)))
         canton_logo = ImageRecord(file_adapter.read(logo_dict.get(canton_key)))
 
+        default_language = Config.get('default_language')
         if isinstance(logo_dict.get(oereb_key), dict):
-            if language is None or language not in logo_dict.get(oereb_key):
-                logo_language = Config.get('default_language')
-            else:
-                logo_language = language
-            oereb_logo = ImageRecord(file_adapter.read(logo_dict.get(oereb_key).get(logo_language)))
+            oereb_logo_paths = dict(logo_dict.get(oereb_key))
+            oereb_logo_paths.setdefault(default_language, logo_dict.get(oereb_key).get(default_language))
         else:
-            oereb_logo = ImageRecord(file_adapter.read(logo_dict.get(oereb_key)))
+            oereb_logo_paths = {default_language: logo_dict.get(oereb_key)}
+
+        logos = {}
+        for logo_language, oereb_logo_path in oereb_logo_paths.items():
+            logos[logo_language] = {
+                confederation_key: confederation_logo,
+                oereb_key: ImageRecord(file_adapter.read(oereb_logo_path)),
+                canton_key: canton_logo
+            }
 
-        return {
-            confederation_key: confederation_logo,
-            oereb_key: oereb_logo,
-            canton_key: canton_logo
-        }
+        # Validate the logos and precompute the derived values used by the renderers and the logo hook
+        for language_logos in logos.values():
+            for logo in language_logos.values():
+                logo.encode()
+                assert logo.mimetype and logo.etag
+
+        Config._logos = logos
+
+    @staticmethod
+    def get_logo_config(language=None):
+        """
+        Returns a dictionary of the configured logos. The logos are read only once (see
+        :meth:`init_logos`) and served from memory afterwards.
+
+        Args:
+            language (str or None): The language of the OEREB logo. If it is not available, the default
+                language is used.
+
+        Returns:
+            dict: The configured logos as pyramid_oereb.lib.records.image.ImageRecord wrapped in a
+            dictionary.
+        """
+        assert Config._config is not None
+
+        if Config._logos is None:
+            Config.init_logos()
+
+        logos = Config._logos.get(language)
+        if logos is None:
+            logos = Config._logos.get(Config.get('default_language'))
+        return dict(logos)
 
     @staticmethod
     def get_oereblex_config():
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Post processing of the map images which are embedded into the extract (flavour EMBEDDABLE or parameter
+images=true). Depending on the configured policy of the requested flavour the images are downscaled and
+re-encoded before they are base64 encoded by the renderers. The processing requires the Pillow library. If it
+is not installed, the images are embedded as delivered by the WMS.
+"""
+import logging
+from io import BytesIO
+
+from pyramid.config import ConfigurationError
+
+from pyramid_oereb.lib.config import Config
+from pyramid_oereb.lib.records.image import ImageRecord
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover
+    Image = None
+
+log = logging.getLogger(__name__)
+
+IMAGE_FORMATS = ['png', 'png8', 'jpeg', 'webp']
+
+
+def get_image_policy(flavour):
+    """
+    Returns the configured map image policy for the flavour.
+
+    Args:
+        flavour (str): The requested flavour.
+
+    Returns:
+        dict or None: The policy or None if the images of this flavour should not be processed.
+
+    Raises:
+        pyramid.config.ConfigurationError: Raised if the configured format is not supported.
+    """
+    policies = Config.get_extract_config().get('map_images') or {}
+    policy = policies.get(str(flavour).lower())
+    if not policy:
+        return None
+    image_format = str(policy.get('format', 'png')).lower()
+    if image_format not in IMAGE_FORMATS:
+        raise ConfigurationError('Invalid map image format: {invalid}. Valid formats are: {valid}.'.format(
+            invalid=image_format,
+            valid=IMAGE_FORMATS
+        ))
+    return policy
+
+
+def apply_image_policy(image, policy):
+    """
+    Downscales and re-encodes the image according to the passed policy.
+
+    Args:
+        image (pyramid_oereb.lib.records.image.ImageRecord): The image downloaded from the WMS.
+        policy (dict or None): The policy as delivered by :func:`get_image_policy`. Supported keys are
+            "format" (png, png8, jpeg or webp), "quality" (jpeg and webp only), "colors" (png8 only),
+            "max_width" and "max_height" (in pixels, the aspect ratio is kept).
+
+    Returns:
+        pyramid_oereb.lib.records.image.ImageRecord: The processed image or the passed one if there is
+        nothing to do or if it is not a raster image Pillow can read (e.g. SVG).
+    """
+    if not policy or image is None:
+        return image
+    if Image is None:
+        log.warning('A map image policy is configured but Pillow is not installed. The images are embedded '
+                    'unchanged.')
+        return image
+
+    try:
+        source = Image.open(BytesIO(image.content))
+        source.load()
+    except (IOError, OSError, ValueError) as e:
+        log.warning('The map image policy is not applied, the image can not be read: {0}'.format(e))
+        return image
+    max_width = policy.get('max_width') or source.width
+    max_height = policy.get('max_height') or source.height
+    if source.width > max_width or source.height > max_height:
+        source.thumbnail((max_width, max_height), Image.LANCZOS)
+
+    image_format = str(policy.get('format', 'png')).lower()
+    output = BytesIO()
+    if image_format == 'jpeg':
+        # JPEG has no transparency, so transparent areas are filled white
+        rgba = source.convert('RGBA')
+        background = Image.new('RGB', rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.split()[3])
+        background.save(output, 'JPEG', quality=policy.get('quality', 85), optimize=True)
+    elif image_format == 'webp':
+        source.save(output, 'WEBP', quality=policy.get('quality', 85))
+    elif image_format == 'png8':
+        source.convert('RGBA').quantize(colors=policy.get('colors', 256)).save(output, 'PNG', optimize=True)
+    else:
+        source.save(output, 'PNG', optimize=True)
+    return ImageRecord(output.getvalue())
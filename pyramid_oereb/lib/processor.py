@@ -6,6 +6,7 @@ from operator import attrgetter
 from pyramid.path import DottedNameResolver
 
 from pyramid_oereb.lib.config import Config
+from pyramid_oereb.lib.image_policy import apply_image_policy, get_image_policy
 from pyramid_oereb.lib.records.documents import DocumentRecord
 from pyramid_oereb.lib.records.plr import PlrRecord
 from pyramid_oereb.lib.readers.exclusion_of_liability import ExclusionOfLiabilityReader
@@ -136,11 +137,12 @@ class Processor(object):
         return extract
 
     @staticmethod
-    def view_service_handling(real_estate, images, format):
+    def view_service_handling(real_estate, images, format, flavour=None):
         """
         Handles all view service related stuff. In the moment this is:
             * construction of the correct url (reference_wms) depending on the real estate
-            * downloading of the image if parameter was set
+            * downloading of the image if parameter was set. Identical maps are downloaded only once and
+              the configured map image policy of the flavour is applied to them.
 
         Args:
             real_estate (pyramid_oereb.lib.records.real_estate.RealEstateRecord):
@@ -148,20 +150,30 @@ class Processor(object):
             images (bool): Switch whether the images should be downloaded or not.
             format (string): The format currently used. For 'pdf' format,
                 the used map size will be adapted to the pdf format,
+            flavour (string or None): The requested flavour. It selects the map image policy.
 
         Returns:
             pyramid_oereb.lib.records.real_estate.RealEstateRecord: The updated extract.
         """
-        real_estate.plan_for_land_register.get_full_wms_url(real_estate, format)
-        real_estate.plan_for_land_register_main_page.get_full_wms_url(real_estate, format)
-        if images:
-            real_estate.plan_for_land_register.download_wms_content()
-            real_estate.plan_for_land_register_main_page.download_wms_content()
-
-        for public_law_restriction in real_estate.public_law_restrictions:
-            public_law_restriction.view_service.get_full_wms_url(real_estate, format)
+        view_services = [
+            real_estate.plan_for_land_register,
+            real_estate.plan_for_land_register_main_page
+        ]
+        view_services.extend([
+            public_law_restriction.view_service
+            for public_law_restriction in real_estate.public_law_restrictions
+        ])
+        policy = get_image_policy(flavour) if images else None
+        images_by_url = {}
+        for view_service in view_services:
+            view_service.get_full_wms_url(real_estate, format)
             if images:
-                public_law_restriction.view_service.download_wms_content()
+                image = images_by_url.get(view_service.reference_wms)
+                if image is None:
+                    view_service.download_wms_content()
+                    image = apply_image_policy(view_service.image, policy)
+                    images_by_url[view_service.reference_wms] = image
+                view_service.image = image
         return real_estate
 
     @staticmethod
@@ -306,7 +318,7 @@ class Processor(object):
         # care about the circumstance that after tolerance check plrs will be dismissed which were
         # recognized as intersecting before. To avoid this the tolerance check is gathering all plrs
         # intersecting and not intersecting and starts the legend entry sorting after.
-        self.view_service_handling(extract.real_estate, params.images, params.format)
+        self.view_service_handling(extract.real_estate, params.images, params.format, params.flavour)
 
         extract.exclusions_of_liability = exclusions_of_liability
         extract.glossaries = glossaries
@@ -44,3 +44,16 @@ class MunicipalityReader(object):
         """
         self._source_.read(params, fosnr)
         return self._source_.records
+
+    def read_fosnrs(self, params):
+        """
+        The accessor method to get the federal numbers of all municipalities available in the configured
+        source.
+
+        Args:
+            params (pyramid_oereb.views.webservice.Parameter): The parameters of the request.
+
+        Returns:
+            list of int: The federal numbers of all municipalities.
+        """
+        return self._source_.read_fosnrs(params)
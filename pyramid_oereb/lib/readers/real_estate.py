@@ -54,6 +54,32 @@ class RealEstateReader(object):
             list of pyramid_oereb.lib.records.real_estate.RealEstateRecord:
                 The list of all found records filtered by the passed criteria.
         """
+        self._source_.read(params, nb_ident=nb_ident, number=number, egrid=egrid, geometry=geometry)
+        self._set_view_services_(self._source_.records)
+        return self._source_.records
+
+    def read_batch(self, params, geometries=None, idents=None):
+        """
+        Reads the real estates for several geometries or identifiers at once, e.g. for the batch GetEGRID
+        service.
+
+        Args:
+            params (pyramid_oereb.views.webservice.Parameter): The parameters of the request.
+            geometries (list of str or None): Geometries as WKT strings which are used to obtain
+                intersected real estates.
+            idents (list of tuple or None): Pairs of identification number and real estate number.
+
+        Returns:
+            list of list of pyramid_oereb.lib.records.real_estate.RealEstateRecord: The found real estates
+            for each geometry or identifier, in the order of the input.
+        """
+        results = self._source_.read_batch(params, geometries=geometries, idents=idents)
+        for records in results:
+            self._set_view_services_(records)
+        return results
+
+    @staticmethod
+    def _set_view_services_(records):
         plan_for_land_register_config = Config.get_plan_for_land_register_config()
 
         real_estate_view_service = ViewServiceRecord(
@@ -69,9 +95,7 @@ class RealEstateReader(object):
             plan_for_land_register_main_page_config.get('layer_opacity')
         )
 
-        self._source_.read(params, nb_ident=nb_ident, number=number, egrid=egrid, geometry=geometry)
-        for r in self._source_.records:
+        for r in records:
             if isinstance(r, RealEstateRecord):
                 r.set_view_service(real_estate_view_service)
                 r.set_main_page_view_service(real_estate_main_page_view_service)
-        return self._source_.records
@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-import re
+import hashlib
 
 from filetype import filetype
 
@@ -13,10 +13,9 @@ class ImageRecord(object):
         'svg'
     ]  # type: list
 
-    SVG_PATTERN = re.compile(r'<svg(.|\n)+<\/svg>')  # type: re
-
     """
-    The record to hold the binary information of a image.
+    The record to hold the binary information of a image. The detected file type, the base64 encoded
+    form and the ETag are computed on first access and kept until the content is replaced.
 
     Args:
         content (binary): The binary information of this image as binary string.
@@ -25,6 +24,21 @@ class ImageRecord(object):
 
         self.content = content
 
+    @property
+    def content(self):
+        """
+        Returns:
+            binary: The binary information of this image as binary string.
+        """
+        return self._content
+
+    @content.setter
+    def content(self, value):
+        self._content = value
+        self._filetype = None
+        self._encoded = None
+        self._etag = None
+
     def encode(self):
         """
         Returns the image as base64 encoded string.
@@ -32,7 +46,35 @@ class ImageRecord(object):
         Returns:
             str: The encoded image.
         """
-        return b64.encode(self.content)
+        if self._encoded is None:
+            self._encoded = b64.encode(self._content)
+        return self._encoded
+
+    @property
+    def etag(self):
+        """
+        Returns a hash of the content which can be used as ETag for conditional requests.
+
+        Returns:
+            str: The ETag of the image.
+        """
+        if self._etag is None:
+            self._etag = hashlib.md5(self._content).hexdigest()
+        return self._etag
+
+    @staticmethod
+    def _is_svg(content):
+        """
+        Checks for SVG content in linear time by looking for an opening svg tag followed by a closing one.
+
+        Args:
+            content (str): The content to check.
+
+        Returns:
+            bool: True if the content contains an SVG element, false otherwise.
+        """
+        start = content.find('<svg')
+        return start > -1 and content.rfind('</svg>') > start
 
     @staticmethod
     def _validate_filetype(obj):
@@ -76,7 +118,7 @@ class ImageRecord(object):
                 content = content.decode('utf-8')
 
             # Check for SVG content
-            if ImageRecord.SVG_PATTERN.search(content):
+            if ImageRecord._is_svg(content):
                 result = ('svg', 'image/svg+xml')
             else:
                 raise TypeError('Unrecognized file type')
@@ -123,22 +165,33 @@ class ImageRecord(object):
         """
         return ImageRecord._validate_filetype(obj)[1]
 
+    def _get_filetype(self):
+        """
+        Returns the validated file type of the content. It is detected only once per content.
+
+        Returns:
+            tuple: The file's extension and mime type.
+        """
+        if self._filetype is None:
+            self._filetype = ImageRecord._validate_filetype(bytearray(self._content))
+        return self._filetype
+
     @property
     def mimetype(self):
         """
-        Checks for valid file type and returns its extension.
+        Checks for valid file type and returns its mime type.
 
         Returns:
-            str: The file's extension.
+            str: The file's mime type.
         """
-        return ImageRecord.get_mimetype(bytearray(self.content))
+        return self._get_filetype()[1]
 
     @property
     def extension(self):
         """
-        Checks for valid file type and returns its mime type.
+        Checks for valid file type and returns its extension.
 
         Returns:
-            str: The file's mime type.
+            str: The file's extension.
         """
-        return ImageRecord.get_extension(bytearray(self.content))
+        return self._get_filetype()[0]
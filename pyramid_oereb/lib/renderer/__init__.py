@@ -2,20 +2,88 @@
 import datetime
 
 import logging
+import os
+import threading
 import unicodedata
 
+from functools import lru_cache
+
+from mako.lookup import TemplateLookup
 from pyramid.httpexceptions import HTTPServerError
-from pyramid.path import DottedNameResolver
+from pyramid.path import AssetResolver, DottedNameResolver
 from pyramid.request import Request
 from pyramid.testing import DummyRequest
 
 from pyramid_oereb import Config
+from pyramid_oereb.lib.cache import Cache
 
 
 log = logging.getLogger(__name__)
 
+_template_lookups = {}
+_template_lookups_lock = threading.Lock()
+
+
+def get_template_lookup(template_path):
+    """
+    Returns the shared template lookup for the specified template directory. The lookup is created
+    once per process and keeps the compiled templates, so they are parsed only on first use. The
+    optional `templates` section of the configuration can define a `module_directory` to store the
+    compiled templates on disk and disable `filesystem_checks`.
+
+    Args:
+        template_path (str): The template directory, either absolute or as asset path relative to
+            the pyramid_oereb package.
+
+    Returns:
+        mako.lookup.TemplateLookup: The template lookup for the specified directory.
+    """
+    lookup = _template_lookups.get(template_path)
+    if lookup is None:
+        with _template_lookups_lock:
+            lookup = _template_lookups.get(template_path)
+            if lookup is None:
+                template_config = Config.get('templates') or {}
+                lookup = TemplateLookup(
+                    directories=[AssetResolver('pyramid_oereb').resolve(template_path).abspath()],
+                    output_encoding='utf-8',
+                    input_encoding='utf-8',
+                    module_directory=template_config.get('module_directory'),
+                    filesystem_checks=template_config.get('filesystem_checks', True)
+                )
+                _template_lookups[template_path] = lookup
+    return lookup
+
+
+@lru_cache(maxsize=4096)
+def get_collation_key(text):
+    """
+    Returns the key used to sort localized texts alphabetically. The keys are cached, as the same texts
+    (themes, legend entries, glossary) are sorted again for each extract.
+
+    Args:
+        text (str): The text value.
+
+    Returns:
+        str: The text value converted to lower case and normalized.
+    """
+    if text is None:
+        return ''
+    return unicodedata.normalize('NFD', text.lower())
+
 
 class Base(object):
+
+    template_path = None
+    """str: The template directory of the renderer, relative to the pyramid_oereb package."""
+
+    template_name = None
+    """str: The name of the template used to render the response."""
+
+    _symbol_ref_hooks = None
+
+    _static_fragments = Cache()
+
     def __init__(self, info):
         """
         Creates a new base renderer instance.
@@ -26,10 +94,59 @@ class Base(object):
         self._info_ = info
         self._language = str(Config.get('default_language')).lower()
 
+    @classmethod
+    def get_template(cls, name=None):
+        """
+        Returns the compiled template from the shared template lookup of the renderer.
+
+        Args:
+            name (str or None): The template name. Defaults to the main template of the renderer.
+
+        Returns:
+            mako.template.Template: The compiled template.
+        """
+        return get_template_lookup(cls.template_path).get_template(name or cls.template_name)
+
+    @classmethod
+    def init_templates(cls):
+        """
+        Compiles all templates of the renderer, including the ones which are only used as includes, to
+        avoid compiling them during the first requests.
+        """
+        if cls.template_path is None:
+            return
+        lookup = get_template_lookup(cls.template_path)
+        template_dir = lookup.directories[0]
+        for root, dirs, files in os.walk(template_dir):
+            for file_name in files:
+                lookup.get_template(os.path.relpath(os.path.join(root, file_name), template_dir))
+
+    @classmethod
+    def get_symbol_ref_hooks(cls):
+        """
+        Returns the resolved "get_symbol_ref" hook methods of the configured themes. They are resolved once
+        and resolved again only if the configuration has been reloaded.
+
+        Returns:
+            dict: The hook methods by the lower case theme code.
+        """
+        plrs = Config.get('plrs')
+        if cls._symbol_ref_hooks is None or cls._symbol_ref_hooks[0] is not plrs:
+            hooks = dict()
+            for plr in plrs or []:
+                method = (plr.get('hooks') or {}).get('get_symbol_ref')
+                if method:
+                    hooks[str(plr.get('code')).lower()] = DottedNameResolver().resolve(method)
+            cls._symbol_ref_hooks = (plrs, hooks)
+        return cls._symbol_ref_hooks[1]
+
     @classmethod
     def get_symbol_ref(cls, request, record):
         """
-        Returns the link to the symbol of the specified public law restriction.
+        Returns the link to the symbol of the specified public law restriction. A hook method can define a
+        function `symbol_ref_key`, which returns a key of the record for the link (like the standard hook
+        does). The links of such hooks are stored on the request by this key, so the hook method is called
+        only once for each symbol per request. Other hook methods are called for each record.
 
         Args:
             request (pyramid.request.Request): The current request instance.
@@ -40,14 +157,45 @@ class Base(object):
         Returns:
             uri: The link to the symbol for the specified public law restriction.
         """
-        method = None
-        for plr in Config.get('plrs'):
-            if str(plr.get('code')).lower() == str(record.theme.code).lower():
-                method = DottedNameResolver().resolve(plr.get('hooks').get('get_symbol_ref'))
-        if callable(method):
+        method = cls.get_symbol_ref_hooks().get(str(record.theme.code).lower())
+        if not callable(method):
+            log.error('No "get_symbol_ref" method found for theme {}'.format(record.theme.code))
+            raise HTTPServerError()
+        get_key = getattr(method, 'symbol_ref_key', None)
+        if get_key is None:
             return method(request, record)
-        log.error('No "get_symbol_ref" method found for theme {}'.format(record.theme.code))
-        raise HTTPServerError()
+        symbol_refs = getattr(request, '_oereb_symbol_refs', None)
+        if symbol_refs is None:
+            symbol_refs = dict()
+            setattr(request, '_oereb_symbol_refs', symbol_refs)
+        key = (method, get_key(record))
+        if key not in symbol_refs:
+            symbol_refs[key] = method(request, record)
+        return symbol_refs[key]
+
+    def get_static_fragment(self, name, records, creator):
+        """
+        Returns a formatted part of the extract which only depends on the passed records and the current
+        language, like the glossary or the exclusions of liability. The formatted part is kept per renderer
+        class, name and language as long as the same record instances are passed, which is the case for the
+        standard sources if their `cache_ttl` is set. The sources return a copy of their cached list, so the
+        records are compared one by one.
+
+        Args:
+            name (str): The name of the part.
+            records (list): The records the part is formatted from.
+            creator (callable): Function without arguments which formats the part.
+
+        Returns:
+            object: The formatted part. It is shared between requests and must not be modified.
+        """
+        key = (self.__class__, name, self._language)
+        entry = Base._static_fragments.get(key)
+        if entry is None or len(entry[0]) != len(records) or \
+                any(cached is not record for cached, record in zip(entry[0], records)):
+            entry = (tuple(records), creator())
+            Base._static_fragments.set(key, entry)
+        return entry[1]
 
     @classmethod
     def get_response(cls, system):
@@ -153,10 +301,7 @@ class Base(object):
         Returns:
             new_text (str): The text value converted to lower case and striped of special characters.
         """
-        if text is None:
-            return ''
-        new_text = text.lower()
-        return unicodedata.normalize('NFD', new_text)
+        return get_collation_key(text)
 
     def sort_by_localized_text(self, multilingual_elements, value_accessor):
         """
@@ -178,11 +323,11 @@ class Base(object):
             # Sort the list only if translations exist.
             return sorted(
                 multilingual_elements,
-                key=lambda element: self.unaccent_lower(
+                key=lambda element: get_collation_key(
                     self.get_localized_text(value_accessor(element))['Text']
                 )
             )
 
-        except AttributeError as ex:
+        except (AttributeError, TypeError) as ex:
             log.warn('Elements can not be sorted: {0}'.format(ex))
             return multilingual_elements
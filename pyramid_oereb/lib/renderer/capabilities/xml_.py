@@ -1,5 +1,4 @@
 # -*- coding: utf-8 -*-
-from mako.lookup import TemplateLookup
 from pyramid.path import AssetResolver
 
 from pyramid.response import Response
@@ -10,6 +9,9 @@ from mako import exceptions
 
 class Renderer(Base):
 
+    template_path = 'lib/renderer/capabilities/templates/xml'
+    template_name = 'capabilities.xml'
+
     def __init__(self, info):
         """
         Creates a new XML renderer instance for versions rendering.
@@ -17,9 +19,7 @@ class Renderer(Base):
         Args:
             info (pyramid.interfaces.IRendererInfo): Info object.
         """
-        a = AssetResolver('pyramid_oereb')
-        resolver = a.resolve('lib/renderer/capabilities/templates/xml')
-        self.template_dir = resolver.abspath()
+        self.template_dir = AssetResolver('pyramid_oereb').resolve(self.template_path).abspath()
         super(Renderer, self).__init__(info)
 
     def __call__(self, value, system):
@@ -37,12 +37,7 @@ class Renderer(Base):
         if isinstance(response, Response) and response.content_type == response.default_content_type:
             response.content_type = 'application/xml'
 
-        templates = TemplateLookup(
-            directories=[self.template_dir],
-            output_encoding='utf-8',
-            input_encoding='utf-8'
-        )
-        template = templates.get_template('capabilities.xml')
+        template = self.get_template()
         try:
             content = template.render(**{
                 'data': value
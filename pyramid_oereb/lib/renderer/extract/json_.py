@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 import logging
 
+from copy import copy
 from json import dumps
 
+from pyramid.path import DottedNameResolver
 from pyramid.request import Request
 from pyramid.response import Response
 from pyramid.testing import DummyRequest
@@ -12,9 +14,9 @@ from pyramid_oereb.lib.records.documents import DocumentRecord, LegalProvisionRe
     ArticleRecord, LawRecord, HintRecord
 from pyramid_oereb.lib.sources.plr import PlrRecord
 from pyramid_oereb.lib.url import url_to_base64
-from shapely.geometry import mapping
 
 from pyramid_oereb.lib.renderer import Base
+from pyramid_oereb.lib.renderer.geometry import get_coordinate_precision, get_coordinates
 from pyramid_oereb.views.webservice import Parameter
 
 log = logging.getLogger(__name__)
@@ -29,6 +31,29 @@ class Renderer(Base):
             info (pyramid.interfaces.IRendererInfo): Info object.
         """
         super(Renderer, self).__init__(info)
+        self._encoder = self.get_encoder()
+        self._documents = dict()
+
+    @staticmethod
+    def get_encoder():
+        """
+        Returns the function used to encode the extract. It can be configured with the `json_encoder`
+        option in the extract section as dotted name of a function, which returns the JSON document as str
+        or bytes for a passed object, e.g. `orjson.dumps`. If the configured function is not available, the
+        encoder of the standard library is used.
+
+        Returns:
+            callable: The function to encode an object as JSON.
+        """
+        encoder = (Config.get_extract_config() or {}).get('json_encoder')
+        if encoder:
+            try:
+                return DottedNameResolver().resolve(encoder)
+            except (ImportError, ValueError):
+                log.warning('JSON encoder {0} is not available, using the standard library instead.'.format(
+                    encoder
+                ))
+        return dumps
 
     def __call__(self, value, system):
         """
@@ -40,7 +65,9 @@ class Renderer(Base):
             system (dict): The available system properties.
 
         Returns:
-            str: The JSON encoded extract.
+            str or bytes or generator: The JSON encoded extract. If `json_streaming` is enabled in the
+            extract configuration, a generator of JSON chunks is returned which is used as the response's
+            app_iter.
         """
         log.debug("__call__() start")
         self._request = self.get_request(system)
@@ -50,6 +77,10 @@ class Renderer(Base):
         if isinstance(response, Response) and response.content_type == response.default_content_type:
             response.content_type = 'application/json; charset=UTF-8'
 
+        if (Config.get_extract_config() or {}).get('json_streaming', False):
+            # the renderer is shared by all requests, the stream is consumed after returning
+            return copy(self)._stream(value[0], value[1])
+
         extract_dict = self._render(value[0], value[1])
         result = {
             u'GetExtractByIdResponse': {
@@ -59,9 +90,57 @@ class Renderer(Base):
         if self._params.flavour == 'embeddable':
             result[u'GetExtractByIdResponse'][u'embeddable'] = self.format_embeddable(value[0].embeddable)
         log.debug("__call__() done.")
-        return dumps(result)
+        return self._encoder(result)
+
+    def _encode(self, value):
+        """
+        Encodes the passed value with the configured encoder.
+
+        Args:
+            value (*): The value to encode.
+
+        Returns:
+            bytes: The UTF-8 encoded JSON.
+        """
+        result = self._encoder(value)
+        if isinstance(result, str):
+            result = result.encode('utf-8')
+        return result
+
+    def _stream(self, extract, param):
+        """
+        Serializes the extract record as stream. The restrictions on landownership are formatted and
+        encoded one by one, all other parts of the extract are encoded before.
+
+        Args:
+            extract (pyramid_oereb.lib.records.extract.ExtractRecord): The extract record
+            param (pyramid_oereb.views.webservice.Parameter): The parameter instance holding information and
+                methods for handling request parameters.
 
-    def _render(self, extract, param):
+        Returns:
+            generator: The UTF-8 encoded chunks of the JSON document.
+        """
+        extract_dict = self._render(extract, param, with_restrictions=False)
+        real_estate_dict = extract_dict.pop('RealEstate')
+        head = b'{"GetExtractByIdResponse":{'
+        if self._params.flavour == 'embeddable':
+            head += b'"embeddable":' + self._encode(self.format_embeddable(extract.embeddable)) + b','
+        # the objects are left open to append the real estate and its restrictions
+        head += b'"extract":' + self._encode(extract_dict)[:-1] + b',"RealEstate":' + \
+            self._encode(real_estate_dict)[:-1]
+        plrs = extract.real_estate.public_law_restrictions
+        if not isinstance(plrs, list) or len(plrs) == 0:
+            yield head + b'}}}}'
+            return
+        yield head + b',"RestrictionOnLandownership":['
+        separator = b''
+        for plr in plrs:
+            if isinstance(plr, PlrRecord):
+                yield separator + self._encode(self.format_plr_record(plr))
+                separator = b','
+        yield b']}}}}'
+
+    def _render(self, extract, param, with_restrictions=True):
         """
         Serializes the extract record.
 
@@ -69,12 +148,14 @@ class Renderer(Base):
             extract (pyramid_oereb.lib.records.extract.ExtractRecord): The extract record
             param (pyramid_oereb.views.webservice.Parameter): The parameter instance holding information and
                 methods for handling request parameters.
+            with_restrictions (bool): Include the restrictions on landownership of the real estate.
 
         Returns:
-            str: The JSON encoded extract.
+            dict: The formatted extract.
         """
         log.debug("_render() start")
         self._params = param
+        self._documents = dict()
 
         if not isinstance(self._params, Parameter):
             raise TypeError('Missing parameter definition; Expected {0}, got {1} instead'.format(
@@ -93,7 +174,7 @@ class Renderer(Base):
             'ExtractIdentifier': extract.extract_identifier,
             'BaseData': self.get_multilingual_text(extract.base_data),
             'PLRCadastreAuthority': self.format_office(extract.plr_cadastre_authority),
-            'RealEstate': self.format_real_estate(extract.real_estate),
+            'RealEstate': self.format_real_estate(extract.real_estate, with_restrictions),
             'ConcernedTheme': [self.format_theme(theme) for theme in extract.concerned_theme],
             'NotConcernedTheme': [self.format_theme(theme) for theme in extract.not_concerned_theme],
             'ThemeWithoutData': [self.format_theme(theme) for theme in extract.theme_without_data]
@@ -151,42 +232,76 @@ class Renderer(Base):
             extract_dict['GeneralInformation'] = self.get_multilingual_text(extract.general_information)
 
         if isinstance(extract.exclusions_of_liability, list) and len(extract.exclusions_of_liability) > 0:
-            exclusions_of_liability = list()
-            for eol in extract.exclusions_of_liability:
-                exclusions_of_liability.append({
-                    'Title': self.get_multilingual_text(eol.title),
-                    'Content': self.get_multilingual_text(eol.content)
-                })
-            extract_dict['ExclusionOfLiability'] = exclusions_of_liability
+            # the cached items are copied, as subclasses like the print proxy modify them
+            extract_dict['ExclusionOfLiability'] = [dict(item) for item in self.get_static_fragment(
+                'ExclusionOfLiability',
+                extract.exclusions_of_liability,
+                lambda: self.format_exclusions_of_liability(extract.exclusions_of_liability)
+            )]
 
         if isinstance(extract.glossaries, list) and len(extract.glossaries) > 0:
-            glossaries = list()
-            for gls in extract.glossaries:
-                gls_title = self.get_multilingual_text(gls.title)
-                gls_title_text = gls_title[0]['Text']
-                if gls_title_text is not None:
-                    glossaries.append({
-                        'Title': gls_title,
-                        'Content': self.get_multilingual_text(gls.content)
-                    })
-                else:
-                    log.warning("glossary entry in requested language missing for title {}".format(gls.title))
-
-            # Sort glossary by requested language alphabetically
-            extract_dict['Glossary'] = self.sort_by_localized_text(
-                glossaries,
-                lambda element: element['Title'][0]['Text']
-            )
+            extract_dict['Glossary'] = [dict(item) for item in self.get_static_fragment(
+                'Glossary',
+                extract.glossaries,
+                lambda: self.format_glossaries(extract.glossaries)
+            )]
         log.debug("_render() done.")
         return extract_dict
 
-    def format_real_estate(self, real_estate):
+    def format_exclusions_of_liability(self, exclusions_of_liability):
+        """
+        Formats the exclusions of liability.
+
+        Args:
+            exclusions_of_liability (list of
+                pyramid_oereb.lib.records.exclusion_of_liability.ExclusionOfLiabilityRecord): The
+                exclusions of liability.
+
+        Returns:
+            list of dict: The formatted exclusions of liability.
+        """
+        return [{
+            'Title': self.get_multilingual_text(eol.title),
+            'Content': self.get_multilingual_text(eol.content)
+        } for eol in exclusions_of_liability]
+
+    def format_glossaries(self, glossaries):
+        """
+        Formats the glossary entries, sorted alphabetically by their title in the requested language.
+        Entries without title in this language are omitted.
+
+        Args:
+            glossaries (list of pyramid_oereb.lib.records.glossary.GlossaryRecord): The glossary entries.
+
+        Returns:
+            list of dict: The formatted glossary entries.
+        """
+        formatted = list()
+        for gls in glossaries:
+            gls_title = self.get_multilingual_text(gls.title)
+            gls_title_text = gls_title[0]['Text']
+            if gls_title_text is not None:
+                formatted.append({
+                    'Title': gls_title,
+                    'Content': self.get_multilingual_text(gls.content)
+                })
+            else:
+                log.warning("glossary entry in requested language missing for title {}".format(gls.title))
+
+        # Sort glossary by requested language alphabetically
+        return self.sort_by_localized_text(
+            formatted,
+            lambda element: element['Title'][0]['Text']
+        )
+
+    def format_real_estate(self, real_estate, with_restrictions=True):
         """
         Formats a real estate record for rendering according to the federal specification.
 
         Args:
             real_estate (pyramid_oereb.lib.records.real_estate.RealEstateRecord): The real
                 estate record to be formatted.
+            with_restrictions (bool): Include the restrictions on landownership.
 
         Returns:
             dict: The formatted dictionary for rendering.
@@ -219,7 +334,7 @@ class Renderer(Base):
             real_estate_dict['MetadataOfGeographicalBaseData'] = \
                 real_estate.metadata_of_geographical_base_data
 
-        if isinstance(real_estate.public_law_restrictions, list) \
+        if with_restrictions and isinstance(real_estate.public_law_restrictions, list) \
                 and len(real_estate.public_law_restrictions) > 0:
             real_estate_dict['RestrictionOnLandownership'] = \
                 self.format_plr(real_estate.public_law_restrictions)
@@ -253,67 +368,82 @@ class Renderer(Base):
         plr_list = list()
 
         for plr in plrs:
-
             if isinstance(plr, PlrRecord):
-
-                # PLR without legal provision is allowed in reduced extract only!
-                if self._params.flavour != 'reduced' and isinstance(plr.documents, list) and \
-                        len(plr.documents) == 0:
-                    raise ValueError('Restrictions on landownership without legal provision are only allowed '
-                                     'in reduced extracts!')
-                plr_dict = {
-                    'Information': self.get_multilingual_text(plr.information),
-                    'Theme': self.format_theme(plr.theme),
-                    'Lawstatus': self.format_law_status(plr.law_status),
-                    'ResponsibleOffice': self.format_office(plr.responsible_office),
-                    'Map': self.format_map(plr.view_service)
-                }
-
-                if self._params.images:
-                    plr_dict.update({
-                        'Symbol': plr.symbol.encode()
-                    })
-                else:
-                    # Link to symbol is only available if type code is set!
-                    if plr.type_code:
-                        plr_dict.update({
-                            'SymbolRef': self.get_symbol_ref(self._request, plr)
-                        })
-
-                if plr.area_share is not None:
-                    plr_dict['AreaShare'] = plr.area_share
-                if plr.length_share is not None:
-                    plr_dict['LengthShare'] = plr.length_share
-                if plr.nr_of_points is not None:
-                    plr_dict['NrOfPoints'] = plr.nr_of_points
-                if plr.sub_theme is not None:
-                    plr_dict['SubTheme'] = self.get_localized_text(plr.sub_theme).get('Text')
-                if plr.other_theme is not None:
-                    plr_dict['OtherTheme'] = plr.other_theme
-                if plr.type_code is not None:
-                    plr_dict['TypeCode'] = plr.type_code
-                if plr.type_code_list is not None:
-                    plr_dict['TypeCodelist'] = plr.type_code_list
-                if plr.part_in_percent is not None:
-                    plr_dict['PartInPercent'] = plr.part_in_percent
-
-                if self._params.with_geometry and isinstance(plr.geometries, list) and \
-                   len(plr.geometries) > 0:
-                    geometry_list = list()
-                    for geometry in plr.geometries:
-                        geometry_list.append(self.format_geometry(geometry))
-                    plr_dict['Geometry'] = geometry_list
-
-                if isinstance(plr.documents, list) and len(plr.documents) > 0:
-                    documents_list = list()
-                    for document in plr.documents:
-                        documents_list.append(self.format_document(document))
-                    plr_dict['LegalProvisions'] = documents_list
-
-                plr_list.append(plr_dict)
+                plr_list.append(self.format_plr_record(plr))
 
         return plr_list
 
+    def format_plr_record(self, plr):
+        """
+        Formats a single public law restriction record for rendering according to the federal
+        specification.
+
+        Args:
+            plr (pyramid_oereb.lib.records.plr.PlrRecord): The public law restriction record to be
+                formatted.
+
+        Returns:
+            dict: The formatted dictionary for rendering.
+        """
+
+        assert isinstance(self._params, Parameter)
+
+        # PLR without legal provision is allowed in reduced extract only!
+        if self._params.flavour != 'reduced' and isinstance(plr.documents, list) and \
+                len(plr.documents) == 0:
+            raise ValueError('Restrictions on landownership without legal provision are only allowed '
+                             'in reduced extracts!')
+        plr_dict = {
+            'Information': self.get_multilingual_text(plr.information),
+            'Theme': self.format_theme(plr.theme),
+            'Lawstatus': self.format_law_status(plr.law_status),
+            'ResponsibleOffice': self.format_office(plr.responsible_office),
+            'Map': self.format_map(plr.view_service)
+        }
+
+        if self._params.images:
+            plr_dict.update({
+                'Symbol': plr.symbol.encode()
+            })
+        else:
+            # Link to symbol is only available if type code is set!
+            if plr.type_code:
+                plr_dict.update({
+                    'SymbolRef': self.get_symbol_ref(self._request, plr)
+                })
+
+        if plr.area_share is not None:
+            plr_dict['AreaShare'] = plr.area_share
+        if plr.length_share is not None:
+            plr_dict['LengthShare'] = plr.length_share
+        if plr.nr_of_points is not None:
+            plr_dict['NrOfPoints'] = plr.nr_of_points
+        if plr.sub_theme is not None:
+            plr_dict['SubTheme'] = self.get_localized_text(plr.sub_theme).get('Text')
+        if plr.other_theme is not None:
+            plr_dict['OtherTheme'] = plr.other_theme
+        if plr.type_code is not None:
+            plr_dict['TypeCode'] = plr.type_code
+        if plr.type_code_list is not None:
+            plr_dict['TypeCodelist'] = plr.type_code_list
+        if plr.part_in_percent is not None:
+            plr_dict['PartInPercent'] = plr.part_in_percent
+
+        if self._params.with_geometry and isinstance(plr.geometries, list) and \
+           len(plr.geometries) > 0:
+            geometry_list = list()
+            for geometry in plr.geometries:
+                geometry_list.append(self.format_geometry(geometry))
+            plr_dict['Geometry'] = geometry_list
+
+        if isinstance(plr.documents, list) and len(plr.documents) > 0:
+            documents_list = list()
+            for document in plr.documents:
+                documents_list.append(self.format_document(document))
+            plr_dict['LegalProvisions'] = documents_list
+
+        return plr_dict
+
     def format_law_status(self, law_status):
         """
         Args:
@@ -333,6 +463,9 @@ class Renderer(Base):
         If the render is requested with a *full* flavour, it will render the *textAtWeb*
         into a *Base64TextAtWeb* field (for LegalProvisionRecord documents).
 
+        Each document is formatted only once per extract, documents referenced by several restrictions
+        or other documents share the same dictionary.
+
         Args:
             document (pyramid_oereb.lib.records.documents.DocumentBaseRecord): The document
                 record to be formatted.
@@ -340,7 +473,13 @@ class Renderer(Base):
         Returns:
             dict: The formatted dictionary for rendering.
         """
+        key = id(document)
+        if key not in self._documents:
+            # the record is kept with the result, so its id can not be reused during the render
+            self._documents[key] = (document, self._format_document(document))
+        return self._documents[key][1]
 
+    def _format_document(self, document):
         document_dict = dict()
 
         if isinstance(document, DocumentRecord) or isinstance(document, LegalProvisionRecord) \
@@ -574,7 +713,7 @@ class Renderer(Base):
             dict: The formatted geometry.
         """
         geom_dict = {
-            'coordinates': mapping(geom)['coordinates'],
+            'coordinates': get_coordinates(geom, get_coordinate_precision()),
             'crs': 'EPSG:{srid}'.format(srid=Config.get('srid'))
             # isosqlmmwkb only used for curved geometries (not supported by shapely)
             # 'isosqlmmwkb': b64.encode(geom.wkb)
@@ -1,12 +1,15 @@
 # -*- coding: utf-8 -*-
 import logging
 
+from copy import copy
+
 from pyramid.httpexceptions import HTTPInternalServerError
-from mako.lookup import TemplateLookup
 from pyramid.path import AssetResolver
 
 from pyramid.response import Response
 
+from pyramid_oereb.lib.config import Config
+from pyramid_oereb.lib.records.plr import PlrRecord
 from pyramid_oereb.lib.renderer import Base
 from mako import exceptions
 
@@ -17,6 +20,9 @@ log = logging.getLogger(__name__)
 
 class Renderer(Base):
 
+    template_path = 'lib/renderer/extract/templates/xml'
+    template_name = 'extract.xml'
+
     def __init__(self, info):
         """
         Creates a new XML renderer instance for extract rendering.
@@ -24,9 +30,7 @@ class Renderer(Base):
         Args:
             info (pyramid.interfaces.IRendererInfo): Info object.
         """
-        a = AssetResolver('pyramid_oereb')
-        resolver = a.resolve('lib/renderer/extract/templates/xml')
-        self.template_dir = resolver.abspath()
+        self.template_dir = AssetResolver('pyramid_oereb').resolve(self.template_path).abspath()
         self._gml_id = 0
         super(Renderer, self).__init__(info)
 
@@ -40,7 +44,8 @@ class Renderer(Base):
             system (dict): The available system properties.
 
         Returns:
-            str: The XML encoded extract.
+            str or generator: The XML encoded extract. If `xml_streaming` is enabled in the extract
+            configuration, a generator of XML chunks is returned which is used as the response's app_iter.
         """
         self._request = self.get_request(system)
         response = self.get_response(system)
@@ -55,8 +60,13 @@ class Renderer(Base):
             ))
         if self._params_.language:
             self._language = str(self._params_.language).lower()
+        else:
+            self._language = str(Config.get('default_language')).lower()
 
         extract = value[0]
+        if (Config.get_extract_config() or {}).get('xml_streaming', False):
+            # the renderer is shared by all requests, the stream is consumed after returning
+            return copy(self)._stream(extract, self._params_)
         try:
             content = self._render(extract, self._params_)
             return content
@@ -68,13 +78,52 @@ class Renderer(Base):
             return exceptions.html_error_template().render()
 
     def _render(self, extract, params):
-        templates = TemplateLookup(
-            directories=[self.template_dir],
-            output_encoding='utf-8',
-            input_encoding='utf-8'
-        )
-        template = templates.get_template('extract.xml')
-        content = template.render(**{
+        template = self.get_template()
+        content = template.render(**self._get_template_values(extract, params))
+        return content
+
+    def _stream(self, extract, params):
+        """
+        Renders the extract part by part, using the same templates as the complete document. The public
+        law restrictions are rendered and returned one by one, so the complete document is never held in
+        memory. The response status is sent with the first part: if rendering fails later, the error is
+        logged and the response ends with an incomplete document and the status 200, instead of an
+        HTTPInternalServerError.
+
+        Args:
+            extract (pyramid_oereb.lib.records.extract.ExtractRecord): The extract to be rendered.
+            params (pyramid_oereb.views.webservice.Parameter): The parameters of the request.
+
+        Returns:
+            generator: The XML encoded parts of the extract.
+        """
+        values = self._get_template_values(extract, params)
+        real_estate = extract.real_estate
+        try:
+            yield self.get_template('extract_head.xml').render(**values)
+            yield self.get_template('real_estate_head.xml').render(real_estate=real_estate, **values)
+            template = self.get_template('public_law_restriction.xml')
+            for public_law_restriction in real_estate.public_law_restrictions:
+                if isinstance(public_law_restriction, PlrRecord):
+                    yield template.render(public_law_restriction=public_law_restriction, **values)
+            yield self.get_template('real_estate_tail.xml').render(real_estate=real_estate, **values)
+            yield self.get_template('extract_tail.xml').render(**values)
+        except Exception:
+            log.exception('The extract could not be rendered as stream.')
+            raise
+
+    def _get_template_values(self, extract, params):
+        """
+        Returns the values passed to the extract templates.
+
+        Args:
+            extract (pyramid_oereb.lib.records.extract.ExtractRecord): The extract to be rendered.
+            params (pyramid_oereb.views.webservice.Parameter): The parameters of the request.
+
+        Returns:
+            dict: The template values.
+        """
+        values = {
             'extract': extract,
             'params': params,
             'sort_by_localized_text': self.sort_by_localized_text,
@@ -84,8 +133,62 @@ class Renderer(Base):
             'get_symbol_ref': self.get_symbol_ref,
             'get_gml_id': self._get_gml_id,
             'date_format': '%Y-%m-%dT%H:%M:%S'
+        }
+        rendered_documents = dict()
+
+        def render_document(document):
+            # documents referenced by several restrictions or documents are rendered once per extract, the
+            # record is kept with the result, so its id can not be reused during the render
+            key = id(document)
+            if key not in rendered_documents:
+                rendered_documents[key] = (
+                    document,
+                    self.get_template('document.xml').render_unicode(document=document, **values)
+                )
+            return rendered_documents[key][1]
+
+        values.update({
+            'render_document': render_document,
+            'glossaries_xml': self.get_static_fragment(
+                'Glossary',
+                extract.glossaries,
+                lambda: self._render_fragment(
+                    'glossary.xml',
+                    'glossary',
+                    self.sort_by_localized_text(extract.glossaries or [], lambda element: element.title),
+                    values
+                )
+            ),
+            'exclusions_of_liability_xml': self.get_static_fragment(
+                'ExclusionOfLiability',
+                extract.exclusions_of_liability,
+                lambda: self._render_fragment(
+                    'exclusion_of_liability.xml',
+                    'exclusion_of_liability',
+                    extract.exclusions_of_liability or [],
+                    values
+                )
+            )
         })
-        return content
+        return values
+
+    def _render_fragment(self, template_name, arg_name, records, values):
+        """
+        Renders the template once for each record and returns the joined result.
+
+        Args:
+            template_name (str): The name of the template.
+            arg_name (str): The name of the template argument the record is passed as.
+            records (list): The records to be rendered.
+            values (dict): The other template values.
+
+        Returns:
+            str: The rendered records.
+        """
+        template = self.get_template(template_name)
+        return ''.join([
+            template.render_unicode(**dict(values, **{arg_name: record})) for record in records
+        ])
 
     def _get_gml_id(self):
         """
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import numpy
+
+from shapely.geometry import mapping
+
+from pyramid_oereb.lib.config import Config
+
+
+def get_coordinate_precision():
+    """
+    Returns the configured number of decimals used for rendered coordinates (`coordinate_precision`).
+
+    Returns:
+        int or None: The number of decimals or None to render coordinates with full precision.
+    """
+    return Config.get('coordinate_precision')
+
+
+def _to_array(coords, precision):
+    array = numpy.asarray(coords, dtype=float)
+    if precision is not None:
+        array = numpy.round(array, precision)
+    return array
+
+
+def get_coordinates(geom, precision=None):
+    """
+    Returns the coordinates of a geometry as nested lists, like `shapely.geometry.mapping` but read from
+    the coordinate sequences as a whole instead of coordinate by coordinate.
+
+    Args:
+        geom (shapely.geometry.base.BaseGeometry): The geometry.
+        precision (int or None): The number of decimals to round the coordinates to.
+
+    Returns:
+        list: The coordinates of the geometry.
+    """
+    if geom.is_empty:
+        return list(mapping(geom)['coordinates'])
+    geom_type = geom.geom_type
+    if geom_type == 'Point':
+        return _to_array(geom.coords, precision)[0].tolist()
+    if geom_type in ('LineString', 'LinearRing'):
+        return _to_array(geom.coords, precision).tolist()
+    if geom_type == 'Polygon':
+        return [_to_array(ring.coords, precision).tolist() for ring in [geom.exterior] + list(geom.interiors)]
+    if geom_type in ('MultiPoint', 'MultiLineString', 'MultiPolygon'):
+        return [get_coordinates(part, precision) for part in geom.geoms]
+    return mapping(geom)['coordinates']
+
+
+def get_pos_list(coords, precision=None):
+    """
+    Returns a coordinate sequence as GML posList (all coordinate values separated by space). If a precision
+    is set, the values are written with this fixed number of decimals.
+
+    Args:
+        coords (shapely.coords.CoordinateSequence): The coordinates.
+        precision (int or None): The number of decimals to round the coordinates to.
+
+    Returns:
+        str: The formatted coordinates.
+    """
+    values = numpy.asarray(coords, dtype=float).ravel().tolist()
+    if precision is None:
+        return ' '.join(map(str, values))
+    return ' '.join(['%.{0}f'.format(precision)] * len(values)) % tuple(values)
@@ -24,3 +24,17 @@ class MunicipalityBaseSource(Base):
             fosnr (int or None): The federal number of the municipality defined by the statistics office.
         """
         pass  # pragma: no cover
+
+    def read_fosnrs(self, params):
+        """
+        Returns the federal numbers of all available municipalities. This default implementation reads all
+        records. Sources can override it with a lighter access.
+
+        Args:
+            params (pyramid_oereb.views.webservice.Parameter): The parameters of the request.
+
+        Returns:
+            list of int: The federal numbers of all municipalities.
+        """
+        self.read(params)
+        return [record.fosnr for record in self.records]
@@ -31,3 +31,28 @@ class RealEstateBaseSource(Base):
                 estates. This may deliver several results.
         """
         pass  # pragma: no cover
+
+    def read_batch(self, params, geometries=None, idents=None):
+        """
+        Reads the real estates for several geometries or identifiers at once. This default implementation
+        calls :meth:`read` for each of them. Sources which can look up all of them with one query should
+        override it.
+
+        Args:
+            params (pyramid_oereb.views.webservice.Parameter): The parameters of the request.
+            geometries (list of str or None): Geometries as WKT strings which are used to obtain
+                intersected real estates.
+            idents (list of tuple or None): Pairs of identification number and real estate number.
+
+        Returns:
+            list of list of pyramid_oereb.lib.records.real_estate.RealEstateRecord: The found real estates
+            for each geometry or identifier, in the order of the input.
+        """
+        results = list()
+        for geometry in geometries or []:
+            self.read(params, geometry=geometry)
+            results.append(list(self.records))
+        for nb_ident, number in idents or []:
+            self.read(params, nb_ident=nb_ident, number=number)
+            results.append(list(self.records))
+        return results
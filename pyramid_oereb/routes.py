@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
-from pyramid_oereb import route_prefix
+from pyramid_oereb import Config, route_prefix
 from pyramid_oereb.views.webservice import PlrWebservice, Symbol, Logo, Municipality, Sld
 from pyramid_oereb.contrib.stats.decorators import log_response
+from pyramid_oereb.lib.compression import compressed_view
 
 
 def includeme(config):  # pragma: no cover
@@ -80,7 +81,7 @@ def includeme(config):  # pragma: no cover
         attr='get_capabilities',
         route_name='{0}/capabilities/'.format(route_prefix),
         request_method='GET',
-        decorator=log_response
+        decorator=(log_response, compressed_view)
     )
 
     # Get capabilities - Can be removed if backward compatibility no longer required.
@@ -90,7 +91,7 @@ def includeme(config):  # pragma: no cover
         attr='get_capabilities',
         route_name='{0}/capabilities.json'.format(route_prefix),
         request_method='GET',
-        decorator=log_response
+        decorator=(log_response, compressed_view)
     )
     config.add_route('{0}/capabilities'.format(route_prefix), '/capabilities')
     config.add_view(
@@ -98,7 +99,7 @@ def includeme(config):  # pragma: no cover
         attr='get_capabilities',
         route_name='{0}/capabilities'.format(route_prefix),
         request_method='GET',
-        decorator=log_response
+        decorator=(log_response, compressed_view)
     )
     config.add_route('{0}/capabilities_old'.format(route_prefix), '/capabilities/')
     config.add_view(
@@ -106,7 +107,18 @@ def includeme(config):  # pragma: no cover
         attr='get_capabilities',
         route_name='{0}/capabilities_old'.format(route_prefix),
         request_method='GET',
-        decorator=log_response
+        decorator=(log_response, compressed_view)
+    )
+
+    # Get egrid for several coordinates or identifiers
+    config.add_route('{0}/getegrid_batch/'.format(route_prefix),
+                     '/getegrid/{format}/batch')
+    config.add_view(
+        PlrWebservice,
+        attr='get_egrid_batch',
+        route_name='{0}/getegrid_batch/'.format(route_prefix),
+        request_method='POST',
+        decorator=(log_response, compressed_view)
     )
 
     # Get egrid
@@ -121,21 +133,21 @@ def includeme(config):  # pragma: no cover
         attr='get_egrid_coord',
         route_name='{0}/getegrid_coord/'.format(route_prefix),
         request_method='GET',
-        decorator=log_response
+        decorator=(log_response, compressed_view)
     )
     config.add_view(
         PlrWebservice,
         attr='get_egrid_ident',
         route_name='{0}/getegrid_ident/'.format(route_prefix),
         request_method='GET',
-        decorator=log_response
+        decorator=(log_response, compressed_view)
     )
     config.add_view(
         PlrWebservice,
         attr='get_egrid_address',
         route_name='{0}/getegrid_address/'.format(route_prefix),
         request_method='GET',
-        decorator=log_response
+        decorator=(log_response, compressed_view)
     )
 
     # Get egrid - Can be removed if backward compatibility no longer required.
@@ -150,21 +162,21 @@ def includeme(config):  # pragma: no cover
         attr='get_egrid_coord',
         route_name='{0}/getegrid_coord.json'.format(route_prefix),
         request_method='GET',
-        decorator=log_response
+        decorator=(log_response, compressed_view)
     )
     config.add_view(
         PlrWebservice,
         attr='get_egrid_ident',
         route_name='{0}/getegrid_ident.json'.format(route_prefix),
         request_method='GET',
-        decorator=log_response
+        decorator=(log_response, compressed_view)
     )
     config.add_view(
         PlrWebservice,
         attr='get_egrid_address',
         route_name='{0}/getegrid_address.json'.format(route_prefix),
         request_method='GET',
-        decorator=log_response
+        decorator=(log_response, compressed_view)
     )
     config.add_route('{0}/getegrid_coord'.format(route_prefix), '/getegrid')
     config.add_route('{0}/getegrid_ident'.format(route_prefix), '/getegrid/{identdn}/{number}')
@@ -178,14 +190,14 @@ def includeme(config):  # pragma: no cover
         attr='get_egrid_coord',
         route_name='{0}/getegrid_coord'.format(route_prefix),
         request_method='GET',
-        decorator=log_response
+        decorator=(log_response, compressed_view)
     )
     config.add_view(
         PlrWebservice,
         attr='get_egrid_ident',
         route_name='{0}/getegrid_ident'.format(route_prefix),
         request_method='GET',
-        decorator=log_response
+        decorator=(log_response, compressed_view)
     )
 
     config.add_route('{0}/getegrid_coord_old/'.format(route_prefix), '/getegrid/')
@@ -194,7 +206,7 @@ def includeme(config):  # pragma: no cover
         attr='get_egrid_coord',
         route_name='{0}/getegrid_coord_old/'.format(route_prefix),
         request_method='GET',
-        decorator=log_response
+        decorator=(log_response, compressed_view)
     )
 
     # Get extract by id
@@ -209,21 +221,21 @@ def includeme(config):  # pragma: no cover
         attr='get_extract_by_id',
         route_name='{0}/extract_1'.format(route_prefix),
         request_method='GET',
-        decorator=log_response
+        decorator=(log_response, compressed_view)
     )
     config.add_view(
         PlrWebservice,
         attr='get_extract_by_id',
         route_name='{0}/extract_2'.format(route_prefix),
         request_method='GET',
-        decorator=log_response
+        decorator=(log_response, compressed_view)
     )
     config.add_view(
         PlrWebservice,
         attr='get_extract_by_id',
         route_name='{0}/extract_3'.format(route_prefix),
         request_method='GET',
-        decorator=log_response
+        decorator=(log_response, compressed_view)
     )
     config.add_route('{0}/extract_1/'.format(route_prefix),
                      '/extract/{flavour}/{format}/{param1}/')
@@ -236,22 +248,42 @@ def includeme(config):  # pragma: no cover
         attr='get_extract_by_id',
         route_name='{0}/extract_1/'.format(route_prefix),
         request_method='GET',
-        decorator=log_response
+        decorator=(log_response, compressed_view)
     )
     config.add_view(
         PlrWebservice,
         attr='get_extract_by_id',
         route_name='{0}/extract_2/'.format(route_prefix),
         request_method='GET',
-        decorator=log_response
+        decorator=(log_response, compressed_view)
     )
     config.add_view(
         PlrWebservice,
         attr='get_extract_by_id',
         route_name='{0}/extract_3/'.format(route_prefix),
         request_method='GET',
-        decorator=log_response
+        decorator=(log_response, compressed_view)
     )
 
+    # Asynchronous print jobs
+    if (Config.get('print') or {}).get('jobs') is not None:
+        from pyramid_oereb.contrib.print_proxy.jobs import PrintJobWebservice
+        config.add_route('{0}/print/job'.format(route_prefix), '/print/jobs/{job_id}')
+        config.add_route('{0}/print/job/pdf'.format(route_prefix), '/print/jobs/{job_id}/pdf')
+        config.add_view(
+            PrintJobWebservice,
+            attr='get_status',
+            route_name='{0}/print/job'.format(route_prefix),
+            request_method='GET',
+            decorator=log_response
+        )
+        config.add_view(
+            PrintJobWebservice,
+            attr='get_pdf',
+            route_name='{0}/print/job/pdf'.format(route_prefix),
+            request_method='GET',
+            decorator=log_response
+        )
+
     # Commit config
     config.commit()
@@ -22,7 +22,7 @@ def convert_camel_case_to_text_form(name):
 
 
 def _create_standard_configuration_models_py_(code, geometry_type, absolute_path, schema=None,
-                                              primary_key_is_string=False):
+                                              primary_key_is_string=False, binary_images=False):
     """
     The simplest way to get a python file containing a database definition in sqlalchemy orm way. It will
      contain all necessary definitions to produce an extract as the specification defines for the new topic.
@@ -35,6 +35,9 @@ def _create_standard_configuration_models_py_(code, geometry_type, absolute_path
         schema (str): The schema name. If not specified, "name" will be used.
         primary_key_is_string (bool): The type of the primary key. You can use this to switch between STRING
             type or INTEGER type. Standard is to INTEGER => False
+        binary_images (bool): Switch to store legend entry symbols always as binary (bytea) instead of
+            BaseCode64 encoded strings. If not set, the column type follows the "binary_images" setting of the
+            configuration. Standard is False.
     """
     if primary_key_is_string:
         template = Template(
@@ -52,7 +55,8 @@ def _create_standard_configuration_models_py_(code, geometry_type, absolute_path
     content = template.render(**{
         'topic': convert_camel_case_to_text_form(code),
         'schema_name': schema or name,
-        'geometry_type': geometry_type
+        'geometry_type': geometry_type,
+        'binary_images': binary_images
     })
     models_path = '{path}/{name}.py'.format(
         path=absolute_path,
@@ -145,6 +149,67 @@ def create_tables_from_standard_configuration(
                 sql_file.write('{};\n'.format(create_table))
 
 
+def convert_image_columns_from_standard_configuration(configuration_yaml_path, section='pyramid_oereb',
+                                                      c2ctemplate_style=False, to_binary=True,
+                                                      sql_file=None):
+    """
+    Converts the image columns (the municipality logo and the legend entry symbols of all standard topics)
+    between BaseCode64 encoded text and binary (bytea) storage. After converting to binary, the configuration
+    parameter "binary_images" has to be set to true.
+
+    Args:
+        configuration_yaml_path (str): The absolute path to the yaml file which contains the plr
+            definitions.
+        section (str): The section in yaml file where the plrs are configured in. Default is 'pyramid_oereb'.
+        c2ctemplate_style (bool): True if the yaml use a c2c template style (vars.[section]).
+            Default is False.
+        to_binary (bool): True to convert the columns to binary, False to convert them back to BaseCode64
+            encoded text. Default is True.
+        sql_file (file): the file to generate. Default is None (in the database).
+    """
+    if Config.get_config() is None:
+        Config.init(configuration_yaml_path, section, c2ctemplate_style)
+
+    if to_binary:
+        sql = 'ALTER TABLE {schema}.{table} ALTER COLUMN {column} TYPE bytea ' \
+              "USING decode({column}, 'base64')"
+    else:
+        sql = 'ALTER TABLE {schema}.{table} ALTER COLUMN {column} TYPE character varying ' \
+              "USING replace(encode({column}, 'base64'), E'\\n', '')"
+
+    municipality_params = Config.get_municipality_config().get('source').get('params')
+    image_columns = [(
+        municipality_params.get('db_connection'),
+        DottedNameResolver().maybe_resolve(municipality_params.get('model')),
+        'logo'
+    )]
+    for schema in Config.get('plrs'):
+        if schema.get('standard'):
+            plr_params = schema.get('source').get('params')
+            image_columns.append((
+                plr_params.get('db_connection'),
+                DottedNameResolver().maybe_resolve('{package}.LegendEntry'.format(
+                    package=plr_params.get('models')
+                )),
+                'symbol'
+            ))
+
+    for db_connection, model, column in image_columns:
+        statement = sql.format(
+            schema=model.__table__.schema,
+            table=model.__table__.name,
+            column=column
+        )
+        if sql_file is None:
+            connection = create_engine(db_connection, echo=True).connect()
+            try:
+                connection.execute(statement)
+            finally:
+                connection.close()
+        else:
+            sql_file.write('{};\n'.format(statement))
+
+
 def drop_tables_from_standard_configuration(configuration_yaml_path, section='pyramid_oereb'):
     """
     Drops all schemas which are defined in the passed yaml file: <section>.<plrs>.[<plr>.<code>]. The code
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import optparse
+from pyramid_oereb.standard import convert_image_columns_from_standard_configuration
+
+
+def convert_image_columns():
+    parser = optparse.OptionParser(
+        usage='usage: %prog [options]',
+        description='Convert the image columns (municipality logos and legend entry symbols) of the standard '
+                    'database between BaseCode64 encoded text and binary (bytea) storage.'
+    )
+    parser.add_option(
+        '-c', '--configuration',
+        dest='configuration',
+        metavar='YAML',
+        type='string',
+        help='The absolute path to the configuration yaml file.'
+    )
+    parser.add_option(
+        '-s', '--section',
+        dest='section',
+        metavar='SECTION',
+        type='string',
+        default='pyramid_oereb',
+        help='The section which contains configuration (default is: pyramid_oereb).'
+    )
+    parser.add_option(
+        '--to-text',
+        dest='to_text',
+        action='store_true',
+        default=False,
+        help='Convert binary columns back to BaseCode64 encoded text (default is to convert to binary).'
+    )
+    parser.add_option(
+        '--sql-file',
+        type='string',
+        help='Generate an SQL file.'
+    )
+    parser.add_option(
+        '--c2ctemplate-style',
+        dest='c2ctemplate_style',
+        action='store_true',
+        default=False,
+        help='Is the yaml file using a c2ctemplate style (starting with vars)'
+    )
+    options, args = parser.parse_args()
+    if not options.configuration:
+        parser.error('No configuration file set.')
+
+    if options.sql_file is None:
+        convert_image_columns_from_standard_configuration(
+            configuration_yaml_path=options.configuration,
+            section=options.section,
+            c2ctemplate_style=options.c2ctemplate_style,
+            to_binary=not options.to_text
+        )
+    else:
+        with open(options.sql_file, 'w') as sql_file:
+            convert_image_columns_from_standard_configuration(
+                configuration_yaml_path=options.configuration,
+                section=options.section,
+                c2ctemplate_style=options.c2ctemplate_style,
+                to_binary=not options.to_text,
+                sql_file=sql_file
+            )
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import datetime
+import hashlib
 import logging
 
 from mako import exceptions
@@ -11,12 +12,22 @@ from sqlalchemy import cast, Text
 
 from pyramid_oereb import Config, database_adapter, route_prefix
 from pyramid_oereb.lib import b64
+from pyramid_oereb.lib.cache import Cache
+from pyramid_oereb.lib.readers.municipality import MunicipalityReader
 from pyramid_oereb.lib.records.image import ImageRecord
 from pyramid_oereb.lib.records.office import OfficeRecord
 
 
 log = logging.getLogger(__name__)
 
+# The SLD template is compiled once when the module is loaded, the rendered SLDs are cached per egrid.
+_sld_template = Template(
+    filename=AssetResolver('pyramid_oereb').resolve('standard/templates/sld.xml').abspath(),
+    input_encoding='utf-8',
+    output_encoding='utf-8'
+)
+_sld_cache = Cache(max_size=1000)
+
 
 def get_logo(request):
     """
@@ -36,13 +47,15 @@ def get_logo(request):
         response.status_int = 200
         response.body = logo.content
         response.content_type = logo.mimetype
+        response.etag = logo.etag
+        response.conditional_response = True
         return response
     raise HTTPNotFound('This logo does not exist.')
 
 
 def get_municipality(request):
     """
-    Returns the requested municipality logo from database.
+    Returns the requested municipality logo from the configured municipality source.
 
     Args:
         request (pyramid.request.Request): The request containing the fosnr as matchdict parameter.
@@ -50,23 +63,24 @@ def get_municipality(request):
     Returns:
         pyramid.response.Response: The generated response object.
     """
-    fosnr = request.matchdict.get('fosnr')
-    source_params = Config.get_municipality_config().get('source').get('params')
-    session = database_adapter.get_session(source_params.get('db_connection'))
     try:
-        model = DottedNameResolver().resolve(source_params.get('model'))
-        municipality = session.query(model).filter_by(fosnr=fosnr).first()
-        if municipality:
-            logo = getattr(municipality, 'logo', None)
-            if logo:
-                response = request.response
-                response.status_int = 200
-                response.body = b64.decode(logo)
-                response.content_type = ImageRecord.get_mimetype(bytearray(response.body))
-                return response
+        fosnr = int(request.matchdict.get('fosnr'))
+    except (TypeError, ValueError):
         raise HTTPNotFound()
-    finally:
-        session.close()
+    source = Config.get_municipality_config().get('source')
+    municipality_reader = MunicipalityReader(source.get('class'), **source.get('params'))
+    municipalities = municipality_reader.read(None, fosnr) if fosnr else []
+    if municipalities:
+        logo = getattr(municipalities[0], 'logo', None)
+        if logo:
+            response = request.response
+            response.status_int = 200
+            response.body = logo.content
+            response.content_type = logo.mimetype
+            response.etag = logo.etag
+            response.conditional_response = True
+            return response
+    raise HTTPNotFound()
 
 
 def get_symbol(request):
@@ -111,7 +125,7 @@ def get_symbol(request):
             if symbol:
                 response = request.response
                 response.status_int = 200
-                response.body = b64.decode(symbol)
+                response.body = b64.decode_binary(symbol)
                 response.content_type = ImageRecord.get_mimetype(bytearray(response.body))
                 return response
         raise HTTPNotFound()
@@ -142,6 +156,30 @@ def get_symbol_ref(request, record):
     )
 
 
+def get_symbol_ref_key(record):
+    """
+    Returns the values of a record which are used by :func:`get_symbol_ref`. Records with the same key get
+    the same link, so it is created only once per request.
+
+    Args:
+        record (pyramid_oereb.lib.records.plr.PlrRecord or
+            pyramid_oereb.lib.records.view_service.LegendEntryRecord): The record of the public law
+            restriction.
+
+    Returns:
+        tuple: The key of the record.
+    """
+    return (
+        record.theme.code,
+        record.view_service_id,
+        record.type_code,
+        getattr(record.symbol, 'extension', None)
+    )
+
+
+get_symbol_ref.symbol_ref_key = get_symbol_ref_key
+
+
 def get_surveying_data_provider(real_estate):
     """
 
@@ -181,6 +219,8 @@ def produce_sld_content(request):
     """
     This is the standard hook method to provide the sld content. Of course you can set it to another one. For
     instance to use another template. Or to use other parameters to provide the correctly constructed SLD.
+    The rendered SLD is cached per egrid and delivered with an ETag, so repeated requests (e.g. from the
+    highlight WMS of the print) only cost a lookup.
 
     .. note:: What to know about this Method: REQUEST-Method: GET, parameters only as url parameters
 
@@ -194,20 +234,22 @@ def produce_sld_content(request):
         pyramid.response.Response: The
     """
     response = request.response
-    template = Template(
-        filename=AssetResolver('pyramid_oereb').resolve('standard/templates/sld.xml').abspath(),
-        input_encoding='utf-8',
-        output_encoding='utf-8'
-    )
-    layer = Config.get_real_estate_config().get('visualisation').get('layer')
-    template_params = {}
-    template_params.update(Config.get_real_estate_config().get('visualisation').get('style'))
-    template_params.update({'layer_name': layer.get('name')})
-    template_params.update({'identifier': request.params.get('egrid')})
+    identifier = request.params.get('egrid')
     try:
+        body = _sld_cache.get(identifier)
+        if body is None:
+            layer = Config.get_real_estate_config().get('visualisation').get('layer')
+            template_params = {}
+            template_params.update(Config.get_real_estate_config().get('visualisation').get('style'))
+            template_params.update({'layer_name': layer.get('name')})
+            template_params.update({'identifier': identifier})
+            body = _sld_template.render(**template_params)
+            _sld_cache.set(identifier, body)
         if isinstance(response, Response) and response.content_type == response.default_content_type:
             response.content_type = 'application/xml'
-        response.body = template.render(**template_params)
+        response.body = body
+        response.etag = hashlib.md5(body).hexdigest()
+        response.conditional_response = True
         return response
     except Exception:
         response.content_type = 'text/html'
@@ -3,6 +3,10 @@
 This Package provides all models fitting to the standard database configuration. It is separated by the 17
 mandatory topics the federation asks for.
 """
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+from pyramid_oereb.lib import b64
 
 NAMING_CONVENTION = {
     "ix": 'ix_%(column_0_label)s',
@@ -11,3 +15,22 @@ NAMING_CONVENTION = {
     "fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s",
     "pk": "pk_%(table_name)s"
 }
+
+
+class BinaryImage(TypeDecorator):
+    """
+    Binary (bytea) column type for images like legend entry symbols or municipality logos. Images are
+    delivered as raw bytes. Base64 encoded strings are still accepted on write so the existing import tools
+    keep working with binary columns.
+    """
+    impl = LargeBinary
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, str):
+            return b64.decode(value)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return bytes(value)
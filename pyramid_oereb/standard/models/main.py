@@ -30,13 +30,14 @@ from geoalchemy2 import Geometry
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy_utils import JSONType
 
-from pyramid_oereb.standard.models import NAMING_CONVENTION
+from pyramid_oereb.standard.models import NAMING_CONVENTION, BinaryImage
 from pyramid_oereb.lib.config import Config
 
 metadata = sa.MetaData(naming_convention=NAMING_CONVENTION)
 Base = declarative_base()
 app_schema_name = Config.get('app_schema').get('name')
 srid = Config.get('srid')
+image_type = BinaryImage if Config.get('binary_images', False) else sa.String
 
 
 class Municipality(Base):
@@ -51,8 +52,9 @@ class Municipality(Base):
         name (str): The Name of the municipality.
         published (bool): Switch whether a municipality is published or not. This has direct
             influence on extract  generation.
-        logo (str): The emblem of the municipality as string but encoded by BaseCode64. Please refer
-            to the  specification for more details about format and dimensons.
+        logo (str or bytes): The emblem of the municipality as string but encoded by BaseCode64 or as
+            raw bytes if binary image columns are used. Please refer to the  specification for more
+            details about format and dimensons.
         geom (geoalchemy2.types.Geometry): The geometry of municipality borders. For type
             information see geoalchemy2_.  .. _geoalchemy2:
             https://geoalchemy-2.readthedocs.io/en/0.2.4/types.html  docs dependent on the
@@ -63,7 +65,7 @@ class Municipality(Base):
     fosnr = sa.Column(sa.Integer, primary_key=True, autoincrement=False)
     name = sa.Column(sa.String, nullable=False)
     published = sa.Column(sa.Boolean, nullable=False, default=False, server_default=sa.text('FALSE'))
-    logo = sa.Column(sa.String, nullable=False)
+    logo = sa.Column(image_type, nullable=False)
     geom = sa.Column(Geometry('MULTIPOLYGON', srid=srid), nullable=True)
 
 
@@ -86,6 +86,40 @@ pyramid_oereb:
     with_geometry: False
     # Set an archive path to keep a copy of each generated pdf.
     # pdf_archive_path: /tmp
+    # The pdfs are archived by a background thread. If more than max_queued pdfs are waiting to be written,
+    # further pdfs are not archived and logged as errors. With deduplicate, each content is kept only once
+    # in the sub directory .content of the archive and the archived files are hard links to it.
+    # pdf_archive:
+    #   max_queued: 100
+    #   deduplicate: False
+    # Enable asynchronous print jobs. A print request with the parameter ASYNC=true then returns the id of
+    # a job which is processed in the background. Its state can be requested at /print/jobs/<job_id> and
+    # the created pdf at /print/jobs/<job_id>/pdf. The results are kept in the specified directory for the
+    # time to live in seconds. If more than max_workers + max_queued jobs are pending, further print
+    # requests are rejected with the status 503.
+    # jobs:
+    #   path: /tmp/pyramid_oereb_jobs
+    #   max_workers: 2
+    #   max_queued: 10
+    #   ttl: 3600
+    #   retry_after: 10
+    # The documents appended to the full extract are downloaded in parallel by max_workers threads. If a
+    # path is set, the pdf documents are kept there and revalidated with their ETag/Last-Modified headers
+    # before they are used again. The least recently used documents are deleted if all documents exceed
+    # max_size (in bytes).
+    # document_cache:
+    #   path: /tmp/pyramid_oereb_documents
+    #   max_size: 536870912
+    #   max_workers: 4
+    #   timeout: 30
+    # Keep the documents appended to the full extract, merged into one pdf, in the specified directory and
+    # append them again to the following extracts, as long as none of the documents changed. The pages of
+    # the extract itself are always printed. A merged pdf is used for the time to live (in seconds). The
+    # least recently used files are deleted if all files exceed max_size (in bytes).
+    # pdf_cache:
+    #   path: /tmp/pyramid_oereb_pdf
+    #   max_size: 1073741824
+    #   ttl: 86400
     # The minimum buffer in pixel at 72 DPI between the real estate and the map's border. If your print
     # system draws a margin around the feature (the real estate), you have to set your buffer
     # here accordingly.
@@ -100,6 +134,20 @@ pyramid_oereb:
     pdf_map_size_millimeters: [174, 99]
     # Base URL with application of the print server
     base_url: http://{PRINT_SERVICE_HOST}:{PRINT_SERVICE_PORT}/print/oereb
+    # Distribute the print requests to several print servers (defaults to base_url) by selecting the
+    # least_busy one or the servers in turn (round_robin). Each server processes at most max_concurrent
+    # requests at the same time, further requests wait up to queue_timeout seconds. If more than
+    # max_queued requests are waiting, the print is rejected with the status 503. Servers which can not be
+    # reached are checked again after health_check_interval seconds.
+    # backends:
+    #   base_urls:
+    #     - http://{PRINT_SERVICE_HOST}:{PRINT_SERVICE_PORT}/print/oereb
+    #   strategy: least_busy
+    #   max_concurrent: 4
+    #   max_queued: 20
+    #   queue_timeout: 30
+    #   health_check_interval: 30
+    #   retry_after: 10
     # Name of the print tempate to use
     template_name: A4 portrait
     # The headers send to the print
@@ -152,6 +200,36 @@ pyramid_oereb:
   # your importing process!
   srid: 2056
 
+  # Number of decimals of the coordinates in the JSON and XML (GML) extract, e.g. 3 for millimeters in LV95.
+  # The coordinates are rendered with full precision if it is not set.
+  # coordinate_precision: 3
+
+  # Switch the storage of images (municipality logos and legend entry symbols) from BaseCode64 encoded text
+  # columns to binary (bytea) columns. This avoids the encoding overhead on every read. Existing tables can be
+  # converted with the command "convert_image_columns". Both representations can be read by the standard
+  # sources.
+  binary_images: false
+
+  # The XML templates are compiled once per process and kept in memory. Optionally the compiled templates
+  # can be stored in a module directory to reuse them after a restart. Disable the filesystem checks in
+  # production to skip the modification check of the template files on each request.
+  # templates:
+  #   module_directory: /tmp/pyramid_oereb/templates
+  #   filesystem_checks: false
+
+  # The maximum number of coordinates or identifiers which can be posted to the batch GetEGRID service
+  # (/getegrid/json/batch) in one request.
+  getegrid_batch_max_size: 1000
+
+  # Compress the responses of the extract, getegrid and capabilities services (JSON and XML) if the client
+  # accepts it (gzip, optionally brotli which needs the brotli package). Responses smaller than min_size
+  # bytes are sent uncompressed, streamed responses are always compressed. Leave this out if the compression
+  # is already done by the web server or a proxy.
+  # compression:
+  #   min_size: 1024
+  #   level: 6
+  #   brotli: false
+
   # definition of the available geometry types for different checks
   geometry_types:
     point:
@@ -340,6 +418,9 @@ pyramid_oereb:
         db_connection: *main_db_connection
         # The model which maps the municipality database table.
         model: pyramid_oereb.standard.models.main.Municipality
+        # The time in seconds the municipalities (including their decoded logos) are kept in memory. Remove
+        # it or set it to 0 to query the database on every request.
+        cache_ttl: 300
 
   # The processor of the oereb project needs access to glossary data. In the standard configuration this
   # is assumed to be read from a database. Hint: If you want to read the glossary out of an existing database
@@ -357,6 +438,10 @@ pyramid_oereb:
         db_connection: *main_db_connection
         # The model which maps the glossary database table.
         model: pyramid_oereb.standard.models.main.Glossary
+        # The time in seconds the glossary entries are kept in memory. Together with the cached formatted
+        # entries in the renderers, the database is not queried for each extract. Remove it or set it to 0
+        # to query the database on every request.
+        cache_ttl: 300
 
   # The processor of the oereb project needs access to exclusion of liability data. In the standard
   # configuration this is assumed to be read from a database. Hint: If you want to read the exclusion of
@@ -375,6 +460,10 @@ pyramid_oereb:
         db_connection: *main_db_connection
         # The model which maps the exclusion_of_liability database table.
         model: pyramid_oereb.standard.models.main.ExclusionOfLiability
+        # The time in seconds the exclusions of liability are kept in memory. Together with the cached
+        # formatted entries in the renderers, the database is not queried for each extract. Remove it or set
+        # it to 0 to query the database on every request.
+        cache_ttl: 300
 
   # The extract is the entry point which binds everything
   # related to data together.
@@ -409,6 +498,31 @@ pyramid_oereb:
     sort_within_themes_method: pyramid_oereb.standard.hook_methods.plr_sort_within_themes
     # Example of a specific sorting method:
     # sort_within_themes_method: pyramid_oereb.contrib.plr_sort_within_themes_by_type_code
+    # Send the XML extract as a stream. The restrictions are rendered and sent one by one instead of building
+    # the complete document in memory first. The response has no content length in this case. The status is
+    # sent with the first part, so an error while rendering ends the response early with the status 200
+    # (and is logged) instead of returning the status 500.
+    xml_streaming: false
+    # The same for the JSON extract: the restrictions are formatted and sent one by one.
+    json_streaming: false
+    # Function used to encode the JSON extract, given as dotted name. It has to return the JSON document as
+    # str or bytes for a passed object, e.g. orjson.dumps. The standard library is used if it is not set or
+    # not available.
+    # json_encoder: orjson.dumps
+    # Optional post processing of the map images which are embedded into the extract (flavour EMBEDDABLE or
+    # parameter images=true), configured per flavour. It needs the Pillow library. The images are downscaled
+    # to max_width/max_height (keeping the aspect ratio) and encoded in the given format: png, png8 (palette
+    # with the given number of colors), jpeg or webp (both with quality). Note that jpeg has no transparency
+    # and that the federal specification expects PNG images. Identical maps are embedded only once anyway.
+    # map_images:
+    #   embeddable:
+    #     format: png8
+    #     colors: 256
+    #     max_width: 1000
+    #     max_height: 1000
+    #   reduced:
+    #     format: webp
+    #     quality: 80
 
   # All PLRs which are provided by this application. This is related to all application behaviour, especially
   # the extract creation process which loops over this list.
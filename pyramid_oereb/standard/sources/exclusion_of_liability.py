@@ -1,28 +1,63 @@
 # -*- coding: utf-8 -*-
+from pyramid_oereb.lib.cache import Cache
 from pyramid_oereb.lib.sources import BaseDatabaseSource
 from pyramid_oereb.lib.sources.exclusion_of_liability import ExclusionOfLiabilityBaseSource
 
 
 class DatabaseSource(BaseDatabaseSource, ExclusionOfLiabilityBaseSource):
 
-    def read(self, params):
+    _cache_ = Cache()
+
+    def __init__(self, **kwargs):
         """
-        The read method to access the standard database structure. It uses SQL-Alchemy for querying. It does
-        not accept any parameters nor it applies any filter on the database query. It simply loads all
-        content from the configured model.
+        Keyword Args:
+            db_connection (str): A rfc1738 conform database connection string in the form of:
+                ``<driver_name>://<username>:<password>@<database_host>:<port>/<database_name>``
+            model (str): A valid dotted name string which leads to an importable representation of
+                sqlalchemy.ext.declarative.DeclarativeMeta or the real class itself.
+            cache_ttl (int): The time in seconds the exclusions of liability are kept in memory. The cache
+                is shared by all instances of this source in the process. While cached, the same list of
+                records is returned on each read. If not set or 0, the database is queried on every read.
+        """
+        super(DatabaseSource, self).__init__(**kwargs)
+        self._cache_ttl_ = kwargs.get('cache_ttl') or 0
 
-        Args:
-            params (pyramid_oereb.views.webservice.Parameter): The parameters of the extract request.
+    @classmethod
+    def clear_cache(cls):
         """
+        Drops the cached exclusions of liability.
+        """
+        cls._cache_.clear()
+
+    def _read_records_(self):
         session = self._adapter_.get_session(self._key_)
         try:
             results = session.query(self._model_).all()
 
-            self.records = list()
+            records = list()
             for result in results:
-                self.records.append(self._record_class_(
+                records.append(self._record_class_(
                     result.title,
                     result.content
                 ))
+            return records
         finally:
             session.close()
+
+    def read(self, params):
+        """
+        The read method to access the standard database structure. It uses SQL-Alchemy for querying. It does
+        not accept any parameters nor it applies any filter on the database query. It simply loads all
+        content from the configured model.
+
+        Args:
+            params (pyramid_oereb.views.webservice.Parameter): The parameters of the extract request.
+        """
+        if not self._cache_ttl_:
+            self.records = self._read_records_()
+        else:
+            self.records = list(DatabaseSource._cache_.get_or_create(
+                (self._key_, self._model_),
+                self._read_records_,
+                ttl=self._cache_ttl_
+            ))
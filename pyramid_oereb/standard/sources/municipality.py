@@ -3,6 +3,7 @@
 from geoalchemy2.elements import _SpatialElement
 
 from pyramid_oereb.lib import b64
+from pyramid_oereb.lib.cache import Cache
 from pyramid_oereb.lib.records.image import ImageRecord
 from pyramid_oereb.lib.sources import BaseDatabaseSource
 from geoalchemy2.shape import to_shape
@@ -12,24 +13,51 @@ from pyramid_oereb.lib.sources.municipality import MunicipalityBaseSource
 
 class DatabaseSource(BaseDatabaseSource, MunicipalityBaseSource):
 
-    def read(self, params, fosnr=None):
+    # The size is limited, as the logo route reads single municipalities by the requested number.
+    _cache_ = Cache(max_size=4096)
+
+    def __init__(self, **kwargs):
         """
-        Central method to read a municipality by it's id_bfs identifier.
+        Keyword Args:
+            db_connection (str): A rfc1738 conform database connection string in the form of:
+                ``<driver_name>://<username>:<password>@<database_host>:<port>/<database_name>``
+            model (str): A valid dotted name string which leads to an importable representation of
+                sqlalchemy.ext.declarative.DeclarativeMeta or the real class itself.
+            cache_ttl (int): The time in seconds the municipalities (including their decoded logos) are kept
+                in memory. The cache is shared by all instances of this source in the process. If not set or
+                0, the database is queried on every read.
+        """
+        super(DatabaseSource, self).__init__(**kwargs)
+        self._cache_ttl_ = kwargs.get('cache_ttl') or 0
 
-        Args:
-            params (pyramid_oereb.views.webservice.Parameter): The parameters of the extract request.
-            fosnr (int or None): The federal number of the municipality defined by the statistics office.
+    @classmethod
+    def clear_cache(cls):
+        """
+        Drops all cached municipalities. Call it after updating the municipality data to make the changes
+        visible before the configured time to live expires.
         """
+        cls._cache_.clear()
+
+    def _cached_(self, key, creator):
+        if not self._cache_ttl_:
+            return creator()
+        return DatabaseSource._cache_.get_or_create(
+            (self._key_, self._model_, key),
+            creator,
+            ttl=self._cache_ttl_
+        )
+
+    def _read_records_(self, fosnr):
         session = self._adapter_.get_session(self._key_)
         try:
-            self.records = list()
+            records = list()
             if fosnr:
                 results = session.query(self._model_).filter(self._model_.fosnr == fosnr).all()
             else:
                 results = session.query(self._model_).all()
             for result in results:
-                logo = ImageRecord(b64.decode(result.logo))
-                self.records.append(self._record_class_(
+                logo = ImageRecord(b64.decode_binary(result.logo))
+                records.append(self._record_class_(
                     result.fosnr,
                     result.name,
                     result.published,
@@ -37,5 +65,37 @@ class DatabaseSource(BaseDatabaseSource, MunicipalityBaseSource):
                     geom=to_shape(result.geom).wkt if isinstance(
                         result.geom, _SpatialElement) else None,
                 ))
+            return records
+        finally:
+            session.close()
+
+    def _read_fosnrs_(self):
+        session = self._adapter_.get_session(self._key_)
+        try:
+            return [result.fosnr for result in session.query(self._model_.fosnr).all()]
         finally:
             session.close()
+
+    def read(self, params, fosnr=None):
+        """
+        Central method to read a municipality by it's id_bfs identifier.
+
+        Args:
+            params (pyramid_oereb.views.webservice.Parameter): The parameters of the extract request.
+            fosnr (int or str or None): The federal number of the municipality defined by the statistics
+                office.
+        """
+        fosnr = int(fosnr) if fosnr else None
+        self.records = list(self._cached_(('records', fosnr), lambda: self._read_records_(fosnr)))
+
+    def read_fosnrs(self, params):
+        """
+        Reads only the federal numbers of all municipalities without their logos and geometries.
+
+        Args:
+            params (pyramid_oereb.views.webservice.Parameter): The parameters of the request.
+
+        Returns:
+            list of int: The federal numbers of all municipalities.
+        """
+        return list(self._cached_('fosnrs', self._read_fosnrs_))
@@ -66,6 +66,7 @@ class DatabaseSource(BaseDatabaseSource, PlrBaseSource):
 
         self.availabilities = []
         self.datasource = []
+        self._legend_entry_records = {}
 
         session = self._adapter_.get_session(self._key_)
 
@@ -93,18 +94,39 @@ class DatabaseSource(BaseDatabaseSource, PlrBaseSource):
         for legend_entry_from_db in legend_entries_from_db:
             # Filter legend by view service to deliver dedicated legend entries only
             if public_law_restriction_from_db.view_service_id == legend_entry_from_db.view_service_id:
-                legend_entry_records.append(self._legend_entry_record_class(
-                    ImageRecord(b64.decode(legend_entry_from_db.symbol)),
-                    legend_entry_from_db.legend_text,
-                    legend_entry_from_db.type_code,
-                    legend_entry_from_db.type_code_list,
-                    theme,
-                    view_service_id=legend_entry_from_db.view_service_id,
-                    sub_theme=legend_entry_from_db.sub_theme,
-                    other_theme=legend_entry_from_db.other_theme
-                ))
+                legend_entry_records.append(self.get_legend_entry_record(theme, legend_entry_from_db))
         return legend_entry_records
 
+    def get_legend_entry_record(self, theme, legend_entry_from_db):
+        """
+        Returns the record for the passed legend entry. The record (and the decoded symbol) is created only
+        once per legend entry and read call and then shared between all public law restrictions of the
+        topic.
+
+        Args:
+            theme (pyramid_oereb.lib.records.theme.ThemeRecord): The theme of the legend entry.
+            legend_entry_from_db (pyramid_oereb.standard.models.land_use_plans.LegendEntry): The legend
+                entry from database.
+
+        Returns:
+            pyramid_oereb.lib.records.view_service.LegendEntryRecord: The legend entry record.
+        """
+        key = (legend_entry_from_db.view_service_id, legend_entry_from_db.id)
+        legend_entry_record = self._legend_entry_records.get(key)
+        if legend_entry_record is None:
+            legend_entry_record = self._legend_entry_record_class(
+                ImageRecord(b64.decode_binary(legend_entry_from_db.symbol)),
+                legend_entry_from_db.legend_text,
+                legend_entry_from_db.type_code,
+                legend_entry_from_db.type_code_list,
+                theme,
+                view_service_id=legend_entry_from_db.view_service_id,
+                sub_theme=legend_entry_from_db.sub_theme,
+                other_theme=legend_entry_from_db.other_theme
+            )
+            self._legend_entry_records[key] = legend_entry_record
+        return legend_entry_record
+
     def from_db_to_view_service_record(self, view_service_from_db, legend_entry_records, theme):
         layer_index, layer_opacity = Config.get_layer_config(theme)
         view_service_record = self._view_service_record_class(
@@ -500,6 +522,7 @@ class DatabaseSource(BaseDatabaseSource, PlrBaseSource):
         """
         log.debug("read() start; position of theme in theme list: {}".format(position))
         self._theme_record.position = position
+        self._legend_entry_records = {}
 
         # Check if the plr is marked as available
         if self._is_available(real_estate):
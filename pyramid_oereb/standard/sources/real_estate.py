@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 from geoalchemy2.elements import _SpatialElement
+from sqlalchemy import Integer, Text, and_, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
 
 from pyramid_oereb.lib.sources import BaseDatabaseSource
 from geoalchemy2.shape import to_shape
@@ -9,6 +11,21 @@ from pyramid_oereb.lib.sources.real_estate import RealEstateBaseSource
 
 class DatabaseSource(BaseDatabaseSource, RealEstateBaseSource):
 
+    def _create_record_(self, result):
+        return self._record_class_(
+            result.type,
+            result.canton,
+            result.municipality,
+            result.fosnr,
+            result.land_registry_area,
+            to_shape(result.limit) if isinstance(result.limit, _SpatialElement) else None,
+            metadata_of_geographical_base_data=result.metadata_of_geographical_base_data,
+            number=result.number,
+            identdn=result.identdn,
+            egrid=result.egrid,
+            subunit_of_land_register=result.subunit_of_land_register,
+        )
+
     def read(self, params, nb_ident=None, number=None, egrid=None, geometry=None):
         """
         Central method to read all plrs (geometry input) or explicitly one plr (nb_ident+number/egrid input).
@@ -40,19 +57,68 @@ class DatabaseSource(BaseDatabaseSource, RealEstateBaseSource):
 
             self.records = list()
             for result in results:
-                self.records.append(self._record_class_(
-                    result.type,
-                    result.canton,
-                    result.municipality,
-                    result.fosnr,
-                    result.land_registry_area,
-                    to_shape(result.limit) if isinstance(result.limit, _SpatialElement) else None,
-                    metadata_of_geographical_base_data=result.metadata_of_geographical_base_data,
-                    number=result.number,
-                    identdn=result.identdn,
-                    egrid=result.egrid,
-                    subunit_of_land_register=result.subunit_of_land_register,
-                ))
+                self.records.append(self._create_record_(result))
+        finally:
+            session.close()
+
+    def read_batch(self, params, geometries=None, idents=None):
+        """
+        Reads the real estates for several geometries or identifiers with one query each. The geometries
+        or identifiers are passed as arrays, which are joined with the real estates, so the database
+        returns the index of the input for each found real estate.
+
+        Args:
+            params (pyramid_oereb.views.webservice.Parameter): The parameters of the request.
+            geometries (list of str or None): Geometries as WKT strings (optionally prefixed with
+                `SRID=<srid>;`) which are used to obtain intersected real estates.
+            idents (list of tuple or None): Pairs of identification number and real estate number.
 
+        Returns:
+            list of list of pyramid_oereb.lib.records.real_estate.RealEstateRecord: The found real estates
+            for each geometry or identifier, in the order of the input.
+        """
+        geometries = geometries or []
+        idents = idents or []
+        if len(geometries) + len(idents) == 0:
+            return list()
+        session = self._adapter_.get_session(self._key_)
+        try:
+            results = list()
+            if geometries:
+                inputs = self._inputs_(geometry=(geometries, Text))
+                results.extend(self._read_joined_(
+                    session,
+                    inputs,
+                    len(geometries),
+                    self._model_.limit.ST_Intersects(func.ST_GeomFromEWKT(inputs.c.geometry))
+                ))
+            if idents:
+                inputs = self._inputs_(
+                    identdn=([ident[0] for ident in idents], Text),
+                    number=([ident[1] for ident in idents], Text)
+                )
+                results.extend(self._read_joined_(
+                    session,
+                    inputs,
+                    len(idents),
+                    and_(self._model_.identdn == inputs.c.identdn, self._model_.number == inputs.c.number)
+                ))
+            return results
         finally:
             session.close()
+
+    @staticmethod
+    def _inputs_(**columns):
+        # The arrays are unnested side by side, together with the index of each input.
+        length = len(next(iter(columns.values()))[0])
+        selected = [func.unnest(bindparam('index', list(range(length)), type_=ARRAY(Integer))).label('index')]
+        for name, (values, value_type) in sorted(columns.items()):
+            selected.append(func.unnest(bindparam(name, list(values), type_=ARRAY(value_type))).label(name))
+        return select(selected).alias('inputs')
+
+    def _read_joined_(self, session, inputs, length, condition):
+        results = [list() for _ in range(length)]
+        query = session.query(inputs.c.index, self._model_).select_from(inputs).join(self._model_, condition)
+        for index, result in query.all():
+            results[index].append(self._create_record_(result))
+        return results
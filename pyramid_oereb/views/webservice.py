@@ -108,7 +108,7 @@ class PlrWebservice(object):
         capabilities = {
             u'GetCapabilitiesResponse': {
                 u'topic': themes,
-                u'municipality': [record.fosnr for record in processor.municipality_reader.read(params)],
+                u'municipality': processor.municipality_reader.read_fosnrs(params),
                 u'flavour': Config.get_flavour(),
                 u'language': supported_languages,
                 u'crs': [Config.get_crs()]
@@ -229,6 +229,70 @@ class PlrWebservice(object):
                                              'number': number})
         return response
 
+    def get_egrid_batch(self):
+        """
+        Returns the matched EGRIDs for several coordinates or identifiers, which are posted as JSON object
+        with one of the following keys:
+
+        - XY: list of coordinate pairs as in the XY parameter of the `getegrid` service ("x,y")
+        - GNSS: list of coordinate pairs as in the GNSS parameter of the `getegrid` service ("lat,lon")
+        - IDENT: list of objects with IDENTDN and NUMBER
+
+        The real estates are looked up with one query. The response contains a list of found real estates
+        for each coordinate pair or identifier, in the order of the input.
+
+        Returns:
+            pyramid.response.Response: The batch `getegrid` response.
+        """
+        params = Parameter('json')
+        items = list()
+        try:
+            self.__validate_format_param__(['json'])
+            try:
+                body = {k.upper(): v for k, v in self._request.json_body.items()}
+            except (AttributeError, ValueError):
+                raise HTTPBadRequest('The request body has to be a JSON object.')
+            max_size = Config.get('getegrid_batch_max_size', 1000)
+            geometries = None
+            idents = None
+            srid = Config.get('srid')
+            transformers = dict()
+            if body.get('XY') or body.get('GNSS'):
+                items = body.get('XY') or body.get('GNSS')
+                self.__validate_batch_size__(items, max_size)
+                try:
+                    if body.get('XY'):
+                        geoms = [self.__parse_xy__(xy, buffer_dist=1.0, transformers=transformers)
+                                 for xy in items]
+                    else:
+                        geoms = [self.__parse_gnss__(gnss, transformers=transformers) for gnss in items]
+                except (AttributeError, ValueError):
+                    raise HTTPBadRequest('The coordinates have to be comma-separated pairs of numbers.')
+                geometries = ['SRID={0};{1}'.format(srid, geom.wkt) for geom in geoms]
+            elif body.get('IDENT'):
+                items = body.get('IDENT')
+                self.__validate_batch_size__(items, max_size)
+                idents = list()
+                for ident in items:
+                    ident = {k.upper(): v for k, v in ident.items()} if isinstance(ident, dict) else {}
+                    if not (ident.get('IDENTDN') and ident.get('NUMBER')):
+                        raise HTTPBadRequest('IDENTDN and NUMBER must be defined for each IDENT.')
+                    # JSON numbers are compared with the text columns
+                    idents.append((str(ident.get('IDENTDN')), str(ident.get('NUMBER'))))
+            else:
+                raise HTTPBadRequest('XY, GNSS or IDENT must be defined.')
+            processor = create_processor()
+            results = processor.real_estate_reader.read_batch(params, geometries=geometries, idents=idents)
+            response = render_to_response('json', {
+                'GetEGRIDBatchResponse': [self.__get_real_estates__(records) for records in results]
+            }, request=self._request)
+            response.content_type = 'application/json; charset=UTF-8'
+        except HTTPBadRequest as err:
+            response = HTTPBadRequest('{}'.format(err))
+        response.extras = OerebStats(service='GetEgridBatch', output_format='json',
+                                     params={'count': len(items) if isinstance(items, list) else 0})
+        return response
+
     def get_extract_by_id(self):
         """
         Returns the extract in the specified format and flavour.
@@ -406,7 +470,7 @@ class PlrWebservice(object):
             raise HTTPBadRequest('Invalid format: {0}'.format(output_format))
         return output_format
 
-    def __coord_transform__(self, coord, source_crs):
+    def __coord_transform__(self, coord, source_crs, transformers=None):
         """
         Transforms the specified coordinates from the specified CRS to the configured target
         CRS and creates a point geometry.
@@ -414,6 +478,8 @@ class PlrWebservice(object):
         Args:
             coord (tuple): The coordinates to transform (x, y).
             source_crs (intorstr): The source CRS
+            transformers (dict or None): Transformation functions by source CRS, which are reused for
+                several coordinates. A missing function is created and added.
 
         Returns:
             shapely.geometry.Point or shapely.geometry.Polygon: The transformed coordinates as
@@ -425,8 +491,16 @@ class PlrWebservice(object):
         srid = Config.get('srid')
         log.debug('----- srid from config (to_srs): {0} -----'.format(srid))
         log.debug('----- srid from source (from_srs): {0} -----'.format(source_crs))
-        rp = Reprojector()
-        x, y = rp.transform(coord, from_srs=epsg.format(source_crs), to_srs=epsg.format(srid))
+        if transformers is None:
+            rp = Reprojector()
+            x, y = rp.transform(coord, from_srs=epsg.format(source_crs), to_srs=epsg.format(srid))
+        else:
+            if source_crs not in transformers:
+                transformers[source_crs] = Reprojector().get_transformation_function(
+                    from_srs=epsg.format(source_crs),
+                    to_srs=epsg.format(srid)
+                )
+            x, y = transformers[source_crs](coord[0], coord[1])
         log.debug('----- X/Y coordinates after transformation: ({0}, {1}) -----'.format(x, y))
         return Point(x, y)
 
@@ -445,14 +519,7 @@ class PlrWebservice(object):
         if len(records) == 0:
             return HTTPNoContent()
 
-        real_estates = list()
-        for r in records:
-            real_estates.append({
-                'egrid': getattr(r, 'egrid'),
-                'number': getattr(r, 'number'),
-                'identDN': getattr(r, 'identdn')
-            })
-        egrid = {'GetEGRIDResponse': real_estates}
+        egrid = {'GetEGRIDResponse': self.__get_real_estates__(records)}
 
         # Try - catch for backward compatibility with old specification.
         try:
@@ -470,7 +537,42 @@ class PlrWebservice(object):
         response.extras = OerebStats(service='GetEGRID', output_format=output_format)
         return response
 
-    def __parse_xy__(self, xy, buffer_dist=None):
+    @staticmethod
+    def __get_real_estates__(records):
+        """
+        Formats the real estate records for the GetEGRID response.
+
+        Args:
+            records (list of pyramid_oereb.lib.records.real_estate.RealEstateRecord): List of real
+                estate records.
+
+        Returns:
+            list of dict: The EGRID, number and identDN of the real estates.
+        """
+        real_estates = list()
+        for r in records:
+            real_estates.append({
+                'egrid': getattr(r, 'egrid'),
+                'number': getattr(r, 'number'),
+                'identDN': getattr(r, 'identdn')
+            })
+        return real_estates
+
+    @staticmethod
+    def __validate_batch_size__(items, max_size):
+        """
+        Validates the list of coordinates or identifiers of a batch request.
+
+        Args:
+            items (list): The posted coordinates or identifiers.
+            max_size (int): The maximum number of items.
+        """
+        if not isinstance(items, list):
+            raise HTTPBadRequest('The coordinates or identifiers have to be passed as list.')
+        if len(items) > max_size:
+            raise HTTPBadRequest('Too many coordinates or identifiers, the maximum is {0}.'.format(max_size))
+
+    def __parse_xy__(self, xy, buffer_dist=None, transformers=None):
         """
         Parses the coordinates from the XY parameter, transforms them to target CRS
         and creates a point geometry. If a buffer distance is defined, a buffer
@@ -480,6 +582,8 @@ class PlrWebservice(object):
             xy (str): XY parameter from the getegrid request.
             buffer_dist (float or None): Distance for the buffer applied to the transformed
                 point.If None, no buffer will be applied.
+            transformers (dict or None): Transformation functions by source CRS (see
+                :meth:`__coord_transform__`).
 
         Returns:
             shapely.geometry.Point or shapely.geometry.Polygon: The transformed coordinates as
@@ -496,19 +600,21 @@ class PlrWebservice(object):
         src_crs = 21781
         if x > 1000000 and y > 1000000:
             src_crs = 2056
-        p = self.__coord_transform__((x, y), src_crs)
+        p = self.__coord_transform__((x, y), src_crs, transformers=transformers)
         if buffer_dist:
             return p.buffer(buffer_dist)
         else:
             return p
 
-    def __parse_gnss__(self, gnss):
+    def __parse_gnss__(self, gnss, transformers=None):
         """
         Parses the coordinates from the GNSS parameter, transforms them to target CRS and
         creates a Point with a 1 meter buffer.
 
         Args:
             gnss (str): GNSS parameter from the getegrid request.
+            transformers (dict or None): Transformation functions by source CRS (see
+                :meth:`__coord_transform__`).
 
         Returns:
             shapely.geometry.Point or shapely.geometry.Polygon: The transformed coordinates as
@@ -523,7 +629,7 @@ class PlrWebservice(object):
         # Coordinates provided as "latitude,longitude"
         lon = float(coords[1])
         lat = float(coords[0])
-        return self.__coord_transform__((lon, lat), 4326).buffer(1.0)
+        return self.__coord_transform__((lon, lat), 4326, transformers=transformers).buffer(1.0)
 
 
 class Parameter(object):
@@ -53,6 +53,7 @@ setup(
             'create_theme_tables = pyramid_oereb.standard.create_tables:create_theme_tables',
             'create_standard_yaml = pyramid_oereb.standard.create_yaml:create_standard_yaml',
             'drop_standard_tables = pyramid_oereb.standard.drop_tables:drop_standard_tables',
+            'convert_image_columns = pyramid_oereb.standard.convert_image_columns:convert_image_columns',
             'create_legend_entries = pyramid_oereb.standard.load_legend_entries:run',
             'import_federal_topic = pyramid_oereb.standard.import_federal_topic:run',
             'create_stats_tables = pyramid_oereb.contrib.stats.scripts.create_stats_tables:create_stats_tables'  # noqa: E501
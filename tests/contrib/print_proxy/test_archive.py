@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+import os
+
+from pyramid_oereb.contrib.print_proxy import archive
+from pyramid_oereb.contrib.print_proxy.archive import CONTENT_DIRECTORY, PdfArchive
+
+
+def test_write(tmpdir):
+    pdf_archive = PdfArchive()
+    path = str(tmpdir.join('extract.pdf'))
+    pdf_archive.write(path, b'%PDF')
+    with open(path, 'rb') as f:
+        assert f.read() == b'%PDF'
+    assert os.listdir(str(tmpdir)) == ['extract.pdf']
+    assert pdf_archive.get_statistics()['archived'] == 1
+
+
+def test_deduplicate(tmpdir):
+    pdf_archive = PdfArchive(deduplicate=True)
+    first = str(tmpdir.join('first.pdf'))
+    second = str(tmpdir.join('second.pdf'))
+    pdf_archive.write(first, b'%PDF')
+    pdf_archive.write(second, b'%PDF')
+    with open(second, 'rb') as f:
+        assert f.read() == b'%PDF'
+    assert os.path.samefile(first, second)
+    assert len(os.listdir(str(tmpdir.join(CONTENT_DIRECTORY)))) == 1
+    statistics = pdf_archive.get_statistics()
+    assert statistics['archived'] == 2
+    assert statistics['deduplicated'] == 1
+
+
+def test_submit(tmpdir):
+    pdf_archive = PdfArchive()
+    paths = [str(tmpdir.join('{0}.pdf'.format(i))) for i in range(3)]
+    for path in paths:
+        assert pdf_archive.submit(path, b'%PDF')
+    pdf_archive.flush()
+    assert all(os.path.isfile(path) for path in paths)
+    assert pdf_archive.get_statistics() == {
+        'queued': 0, 'archived': 3, 'deduplicated': 0, 'failed': 0, 'dropped': 0
+    }
+
+
+def test_submit_failed(tmpdir, caplog):
+    pdf_archive = PdfArchive()
+    assert pdf_archive.submit(str(tmpdir.join('missing', 'extract.pdf')), b'%PDF')
+    pdf_archive.flush()
+    assert pdf_archive.get_statistics()['failed'] == 1
+    assert 'failed: 1' in caplog.text
+
+
+def test_submit_dropped(tmpdir, monkeypatch, caplog):
+    # Keep the writer busy, so the queue fills up.
+    monkeypatch.setattr(archive.threading.Thread, 'start', lambda thread: None)
+    pdf_archive = PdfArchive(max_queued=1)
+    assert pdf_archive.submit(str(tmpdir.join('1.pdf')), b'%PDF')
+    assert not pdf_archive.submit(str(tmpdir.join('2.pdf')), b'%PDF')
+    statistics = pdf_archive.get_statistics()
+    assert statistics['queued'] == 1
+    assert statistics['dropped'] == 1
+    assert 'dropped: 1' in caplog.text
+    assert 'queued: 1' in caplog.text
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pytest
+import requests
+
+from pyramid_oereb.contrib.print_proxy import document_cache
+from pyramid_oereb.contrib.print_proxy.document_cache import DocumentCache
+from pyramid_oereb.contrib.print_proxy.storage import read_file
+
+
+class MockResponse(object):
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+class MockServer(object):
+    def __init__(self):
+        self.documents = dict()
+        self.requests = list()
+        self.available = True
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append((url, headers or {}))
+        if not self.available:
+            raise requests.ConnectionError('unavailable')
+        content, content_type, etag = self.documents[url]
+        if etag is not None and (headers or {}).get('If-None-Match') == etag:
+            return MockResponse(304)
+        return MockResponse(200, content, {'content-type': content_type, 'etag': etag})
+
+
+@pytest.fixture
+def server(monkeypatch):
+    mock_server = MockServer()
+    monkeypatch.setattr(document_cache.requests, 'get', mock_server.get)
+    return mock_server
+
+
+def test_get_documents(tmpdir, server):
+    server.documents['http://example.com/a.pdf'] = (b'a', 'application/pdf', '"1"')
+    server.documents['http://example.com/b.html'] = (b'b', 'text/html', None)
+    cache = DocumentCache(str(tmpdir))
+    urls = ['http://example.com/a.pdf', 'http://example.com/b.html']
+    expected = [
+        ('http://example.com/a.pdf', 'application/pdf', b'a'),
+        ('http://example.com/b.html', 'text/html', b'b')
+    ]
+    assert cache.get_documents(urls) == expected
+    # Only the pdf document is cached
+    assert len(os.listdir(str(tmpdir))) == 2
+    assert cache.get_documents(urls) == expected
+    assert sorted(server.requests[2:]) == [
+        ('http://example.com/a.pdf', {'If-None-Match': '"1"'}),
+        ('http://example.com/b.html', {})
+    ]
+
+
+def test_get_document_changed(tmpdir, server):
+    server.documents['http://example.com/a.pdf'] = (b'a', 'application/pdf', '"1"')
+    cache = DocumentCache(str(tmpdir))
+    assert cache.get_document('http://example.com/a.pdf') == ('application/pdf', b'a')
+    server.documents['http://example.com/a.pdf'] = (b'b', 'application/pdf', '"2"')
+    assert cache.get_document('http://example.com/a.pdf') == ('application/pdf', b'b')
+    assert cache.get_document('http://example.com/a.pdf') == ('application/pdf', b'b')
+    assert server.requests[-1] == ('http://example.com/a.pdf', {'If-None-Match': '"2"'})
+
+
+def test_get_document_unavailable(tmpdir, server):
+    server.documents['http://example.com/a.pdf'] = (b'a', 'application/pdf', '"1"')
+    cache = DocumentCache(str(tmpdir))
+    cache.get_document('http://example.com/a.pdf')
+    server.available = False
+    assert cache.get_document('http://example.com/a.pdf') == ('application/pdf', b'a')
+    with pytest.raises(requests.ConnectionError):
+        cache.get_document('http://example.com/b.pdf')
+
+
+def test_get_document_without_path(server):
+    server.documents['http://example.com/a.pdf'] = (b'a', 'application/pdf', '"1"')
+    cache = DocumentCache()
+    assert cache.get_document('http://example.com/a.pdf') == ('application/pdf', b'a')
+    assert cache.get_document('http://example.com/a.pdf') == ('application/pdf', b'a')
+    assert server.requests[-1] == ('http://example.com/a.pdf', {})
+
+
+def test_max_size(tmpdir, server):
+    for name in ['a', 'b', 'c']:
+        server.documents['http://example.com/{0}.pdf'.format(name)] = (b'1234', 'application/pdf', name)
+    server.documents['http://example.com/d.pdf'] = (b'123456789', 'application/pdf', 'd')
+    cache = DocumentCache(str(tmpdir), max_size=8)
+    cache.get_document('http://example.com/a.pdf')
+    os.utime(cache._get_file_path('http://example.com/a.pdf', 'pdf'), (1, 1))
+    cache.get_document('http://example.com/b.pdf')
+    cache.get_document('http://example.com/c.pdf')
+    assert cache._read_metadata('http://example.com/a.pdf') is None
+    assert read_file(cache._get_file_path('http://example.com/b.pdf', 'pdf')) == b'1234'
+    assert read_file(cache._get_file_path('http://example.com/c.pdf', 'pdf')) == b'1234'
+    # Documents larger than the cache are not stored
+    cache.get_document('http://example.com/d.pdf')
+    assert cache._read_metadata('http://example.com/d.pdf') is None
+
+
+def test_get_versioned_documents(tmpdir, server):
+    server.documents['http://example.com/a.pdf'] = (b'a', 'application/pdf', '"1"')
+    server.documents['http://example.com/b.pdf'] = (b'b', 'application/pdf', None)
+    cache = DocumentCache(str(tmpdir))
+    urls = ['http://example.com/a.pdf', 'http://example.com/b.pdf']
+    documents = cache.get_versioned_documents(urls)
+    assert [document[:3] for document in documents] == [
+        ('http://example.com/a.pdf', 'application/pdf', b'a'),
+        ('http://example.com/b.pdf', 'application/pdf', b'b')
+    ]
+    versions = [document[3] for document in documents]
+    assert versions[0] != versions[1]
+    # The unchanged document is not read again
+    assert cache.get_versioned_documents(urls) == [
+        ('http://example.com/a.pdf', 'application/pdf', None, versions[0]),
+        ('http://example.com/b.pdf', 'application/pdf', b'b', versions[1])
+    ]
+    server.documents['http://example.com/a.pdf'] = (b'c', 'application/pdf', '"2"')
+    assert cache.get_versioned_documents(urls)[0][2:] != (None, versions[0])
+    assert cache.get_document('http://example.com/a.pdf') == ('application/pdf', b'c')
+
+
+def test_get_versioned_documents_without_path(server):
+    server.documents['http://example.com/a.pdf'] = (b'a', 'application/pdf', '"1"')
+    cache = DocumentCache()
+    url, content_type, content, version = cache.get_versioned_documents(['http://example.com/a.pdf'])[0]
+    assert content == b'a'
+    assert len(server.requests) == 1
+
+
+def test_read_cached(tmpdir, server):
+    server.documents['http://example.com/a.pdf'] = (b'a', 'application/pdf', '"1"')
+    cache = DocumentCache(str(tmpdir))
+    version = cache.get_versioned_documents(['http://example.com/a.pdf'])[0][3]
+    requests_count = len(server.requests)
+    assert cache.read_cached('http://example.com/a.pdf', version) == b'a'
+    assert len(server.requests) == requests_count
+    assert cache.read_cached('http://example.com/a.pdf', 'other') is None
+    assert cache.read_cached('http://example.com/b.pdf', version) is None
+    assert DocumentCache().read_cached('http://example.com/a.pdf', version) is None
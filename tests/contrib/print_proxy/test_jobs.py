@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import threading
+import time
+
+import pytest
+from pyramid.httpexceptions import HTTPNotFound, HTTPServiceUnavailable
+from pyramid.testing import DummyRequest
+
+from pyramid_oereb.contrib.print_proxy.jobs import PrintJobs, PrintJobWebservice, get_job_status_dict
+
+
+def _route_url(name, **kwargs):
+    return 'http://example.com/{0}/{1}'.format(name.split('/', 1)[1], kwargs['job_id'])
+
+
+def _get_request(job_id):
+    request = DummyRequest(matchdict={'job_id': job_id})
+    request.route_url = _route_url
+    return request
+
+
+def _wait(jobs, job_id, status):
+    for _ in range(100):
+        if jobs.get_status(job_id)['status'] == status:
+            return
+        time.sleep(0.05)
+    raise AssertionError('Job did not reach the status {0}'.format(status))
+
+
+def test_job_done(tmpdir):
+    jobs = PrintJobs(str(tmpdir))
+    job_id = jobs.submit(lambda content: (200, {}, content), b'%PDF-1.4')
+    _wait(jobs, job_id, 'done')
+    with open(jobs.get_pdf_path(job_id), 'rb') as f:
+        assert f.read() == b'%PDF-1.4'
+    assert get_job_status_dict(_get_request(job_id), job_id, jobs) == {
+        'job_id': job_id,
+        'status': 'done',
+        'status_url': 'http://example.com/print/job/{0}'.format(job_id),
+        'pdf_url': 'http://example.com/print/job/pdf/{0}'.format(job_id)
+    }
+
+
+@pytest.mark.parametrize('function', [
+    lambda: (500, {}, b'error'),
+    lambda: 1 / 0
+])
+def test_job_failed(tmpdir, function):
+    jobs = PrintJobs(str(tmpdir))
+    job_id = jobs.submit(function)
+    _wait(jobs, job_id, 'failed')
+    job_status = get_job_status_dict(_get_request(job_id), job_id, jobs)
+    assert 'pdf_url' not in job_status
+    assert job_status['error']
+    assert not os.path.exists(jobs.get_pdf_path(job_id))
+
+
+def test_job_rejected(tmpdir):
+    event = threading.Event()
+    jobs = PrintJobs(str(tmpdir), max_workers=1, max_queued=1, retry_after=5)
+
+    def function():
+        event.wait(5)
+        return 200, {}, b''
+
+    job_ids = [jobs.submit(function), jobs.submit(function)]
+    with pytest.raises(HTTPServiceUnavailable) as e:
+        jobs.submit(function)
+    assert e.value.headers['Retry-After'] == '5'
+    event.set()
+    for job_id in job_ids:
+        _wait(jobs, job_id, 'done')
+    for _ in range(100):
+        if jobs._active == 0:
+            break
+        time.sleep(0.05)
+    _wait(jobs, jobs.submit(function), 'done')
+
+
+def test_job_expired(tmpdir):
+    jobs = PrintJobs(str(tmpdir), ttl=60)
+    job_id = jobs.submit(lambda: (200, {}, b''))
+    _wait(jobs, job_id, 'done')
+    expired = time.time() - 120
+    for extension in ['json', 'pdf']:
+        os.utime(os.path.join(str(tmpdir), '{0}.{1}'.format(job_id, extension)), (expired, expired))
+    assert jobs.get_status(job_id) is None
+    jobs.cleanup()
+    assert os.listdir(str(tmpdir)) == []
+
+
+@pytest.mark.parametrize('job_id', ['unknown', '../../etc/passwd', '0' * 32])
+def test_unknown_job(tmpdir, monkeypatch, job_id):
+    jobs = PrintJobs(str(tmpdir))
+    monkeypatch.setattr(PrintJobs, '_instance', jobs)
+    assert jobs.get_status(job_id) is None
+    service = PrintJobWebservice(_get_request(job_id))
+    with pytest.raises(HTTPNotFound):
+        service.get_status()
+    with pytest.raises(HTTPNotFound):
+        service.get_pdf()
+
+
+def test_webservice(tmpdir, monkeypatch):
+    event = threading.Event()
+    jobs = PrintJobs(str(tmpdir))
+    monkeypatch.setattr(PrintJobs, '_instance', jobs)
+
+    def function():
+        event.wait(5)
+        return 200, {}, b'%PDF-1.4'
+
+    job_id = jobs.submit(function)
+    service = PrintJobWebservice(_get_request(job_id))
+    response = service.get_pdf()
+    assert response.status_int == 202
+    assert json.loads(response.text)['status'] in ['pending', 'running']
+    event.set()
+    _wait(jobs, job_id, 'done')
+    assert json.loads(service.get_status().text)['status'] == 'done'
+    response = service.get_pdf()
+    assert response.status_int == 200
+    assert response.content_type == 'application/pdf'
+    assert b''.join(response.app_iter) == b'%PDF-1.4'
@@ -2,10 +2,20 @@
 import os
 import json
 import codecs
+import copy
+import datetime
+import timeit
+import pytest
+from pyramid_oereb.contrib.print_proxy.archive import PdfArchive
+from pyramid_oereb.contrib.print_proxy import mapfish_print
 from pyramid_oereb.contrib.print_proxy.mapfish_print import Renderer
+from pyramid_oereb.lib.records.documents import DocumentRecord
+from pyramid_oereb.lib.records.law_status import LawStatusRecord
+from pyramid_oereb.lib.records.office import OfficeRecord
+from pyramid_oereb.views.webservice import Parameter
 from tests.renderer import DummyRenderInfo
 from pyramid_oereb.contrib.print_proxy.sub_themes.sorting import AlphabeticSort, ListSort
-from pyramid_oereb.contrib.print_proxy.toc_pages import TocPages
+from pyramid_oereb.contrib.print_proxy.toc_pages import TocPages, get_number_of_lines, get_text_width
 
 
 def coordinates():
@@ -49,6 +59,48 @@ def test_toc_pages():
     assert TocPages(extract()).getNbPages() == 1
 
 
+def test_toc_pages_long_texts():
+    long_extract = extract()
+    long_extract['ExclusionOfLiability'] = [{
+        'Title': [{'Language': 'de', 'Text': u'Haftungsausschluss'}],
+        'Content': [{'Language': 'de', 'Text': u'Lorem ipsum dolor sit amet. ' * 200}]
+    }]
+    assert TocPages(long_extract).getNbPages() == 2
+
+
+def test_get_text_width():
+    assert get_text_width(u'Hello World', 10) == pytest.approx(51.67)
+    assert get_text_width(u'\u00e4', 10) == get_text_width(u'a', 10)
+    assert get_text_width(u'iiii', 10) < get_text_width(u'MMMM', 10)
+
+
+@pytest.mark.parametrize('text,lines', [
+    (u'', 1),
+    (u'Kurzer Text', 1),
+    (u'a ' * 200, 5),
+    (u'x' * 500, 7),
+    (u'Erste Zeile\nZweite Zeile', 2),
+    (u'i' * 150 + u' ' + u'M' * 40, 2)
+])
+def test_get_number_of_lines(text, lines):
+    assert get_number_of_lines(text, 233, 6) == lines
+
+
+def test_compute_wrapped_text():
+    text = u'Lorem ipsum dolor sit amet ' * 10
+    assert TocPages.compute_length_of_wrapped_text(text, 78, 10) == 40
+    assert TocPages.compute_height_of_wrapped_text(text, 233, 6, 10) == get_number_of_lines(text, 233, 6) * 10
+
+
+def test_count_toc_print():
+    statistics = Renderer.get_toc_statistics()
+    Renderer.count_toc_print(False)
+    assert Renderer.count_toc_print(True) == {
+        'prints': statistics['prints'] + 2,
+        'reprints': statistics['reprints'] + 1
+    }
+
+
 def geometry():
     return {
         'type': 'MultiPolygon',
@@ -120,6 +172,64 @@ def deepCompare(value, valueToCompare, verbose=True):
     return match
 
 
+def large_extract(copies):
+    large = extract()
+    restrictions = large['RealEstate']['RestrictionOnLandownership']
+    large_restrictions = []
+    for i in range(copies):
+        for restriction in copy.deepcopy(restrictions):
+            restriction['TypeCode'] = '{0}_{1}'.format(restriction['TypeCode'], i)
+            restriction['SymbolRef'] = '{0}&copy={1}'.format(restriction['SymbolRef'], i)
+            restriction['ResponsibleOffice']['Name'] = [{'Language': 'de', 'Text': 'Office {0}'.format(i)}]
+            restriction['Map']['OtherLegend'] = restriction['Map'].get('OtherLegend', []) + [{
+                'LegendText': [{'Language': 'de', 'Text': 'Legend {0}'.format(j)}],
+                'TypeCode': str(j),
+                'TypeCodelist': '',
+                'SymbolRef': '{0}&copy={1}'.format(restriction['SymbolRef'].split('&copy=')[0], j)
+            } for j in range(copies)]
+            for legal_provision in restriction.get('LegalProvisions', []):
+                legal_provision['TextAtWeb'] = [
+                    {'Language': 'de', 'Text': 'http://example.com/{0}'.format(i)}
+                ]
+            large_restrictions.append(restriction)
+    large['RealEstate']['RestrictionOnLandownership'] = large_restrictions
+    return large
+
+
+def test_large_extract():
+    renderer = Renderer(DummyRenderInfo())
+    renderer._language = 'de'
+    copies = 5
+    printable_extract = renderer.convert_to_printable_extract(large_extract(copies), geometry(), set())
+    expected = renderer.convert_to_printable_extract(extract(), geometry(), set())
+    restrictions = printable_extract['RealEstate_RestrictionOnLandownership']
+    assert [r['Theme_Code'] for r in restrictions] == \
+        [r['Theme_Code'] for r in expected['RealEstate_RestrictionOnLandownership']]
+    for restriction in restrictions:
+        # The legend symbols of the following copies are removed from the other legend
+        symbol_refs = set(
+            legend['SymbolRef'] for legend in restriction['Legend']
+            if not legend['SymbolRef'].endswith('&copy=0')
+        )
+        assert not any(legend['SymbolRef'] in symbol_refs for legend in restriction['OtherLegend'])
+        assert len(restriction['ResponsibleOffice']) == copies
+
+
+@pytest.mark.skipif(not os.environ.get('BENCHMARK'), reason='set BENCHMARK=1 to run the benchmarks')
+def test_benchmark_large_extract(record_property):
+    renderer = Renderer(DummyRenderInfo())
+    renderer._language = 'de'
+    large = large_extract(40)
+    extracts = [copy.deepcopy(large) for _ in range(3)]
+    pdf_to_join = set()
+    record_property('restrictions', len(large['RealEstate']['RestrictionOnLandownership']))
+    record_property('convert_to_printable_extract', min(timeit.repeat(
+        lambda: renderer.convert_to_printable_extract(extracts.pop(), geometry(), pdf_to_join),
+        number=1,
+        repeat=3
+    )))
+
+
 def test_legend():
     renderer = Renderer(DummyRenderInfo())
     pdf_to_join = set()
@@ -692,4 +802,40 @@ def test_archive_pdf():
     renderer = Renderer(DummyRenderInfo())
     extract = {'RealEstate_EGRID': 'CH113928077734'}
     path_and_filename = renderer.archive_pdf_file('/tmp', bytes(), extract)
+    PdfArchive.get_instance().flush()
     assert os.path.isfile(path_and_filename)
+
+
+def test_format_document_copied():
+    renderer = Renderer(DummyRenderInfo())
+    renderer._language = 'de'
+    renderer._params = Parameter('json', flavour='reduced')
+    document = DocumentRecord('Law', LawStatusRecord(u'inForce', {'de': u'In Kraft'}), datetime.date.today(),
+                              {'de': u'Test Dokument'}, OfficeRecord({'de': u'AGI'}))
+    first = renderer.format_document(document)
+    second = renderer.format_document(document)
+    assert first == second
+    assert first is not second
+
+
+def test_format_document_copied_once(monkeypatch):
+    renderer = Renderer(DummyRenderInfo())
+    renderer._language = 'de'
+    renderer._params = Parameter('json', flavour='reduced')
+    office = OfficeRecord({'de': u'AGI'})
+    law_status = LawStatusRecord(u'inForce', {'de': u'In Kraft'})
+    reference = DocumentRecord('Law', law_status, datetime.date.today(), {'de': u'Referenz'}, office)
+    document = DocumentRecord('Law', law_status, datetime.date.today(), {'de': u'Test Dokument'}, office,
+                              references=[reference])
+    copies = list()
+
+    def deepcopy(value):
+        copies.append(value)
+        return copy.deepcopy(value)
+
+    monkeypatch.setattr(mapfish_print, 'deepcopy', deepcopy)
+    formatted = renderer.format_document(document)
+    assert len(copies) == 1
+    assert formatted['Reference'][0]['Title'] == [{'Language': 'de', 'Text': u'Referenz'}]
+    # The referenced document is part of the copy
+    assert formatted['Reference'][0] is not renderer.format_document(reference)
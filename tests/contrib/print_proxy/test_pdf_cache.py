@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+import os
+
+import pytest
+from PyPDF2 import PdfFileReader, PdfFileWriter
+
+from pyramid_oereb.contrib.print_proxy import document_cache, mapfish_print, print_backends
+from pyramid_oereb.contrib.print_proxy.document_cache import DocumentCache
+from pyramid_oereb.contrib.print_proxy.mapfish_print import Renderer
+from pyramid_oereb.contrib.print_proxy.pdf_cache import PdfCache
+from pyramid_oereb.contrib.print_proxy.pdf_merge import merge_documents
+from tests.renderer import DummyRenderInfo
+
+
+def _spec(identifier='1', egrid='CH1234'):
+    return {
+        'layout': 'A4 portrait',
+        'outputFormat': 'pdf',
+        'lang': 'de',
+        'attributes': {
+            'CreationDate': '01.01.2020',
+            'ExtractIdentifier': identifier,
+            'Footer': '01.01.2020   {0}'.format(identifier),
+            'RealEstate_EGRID': egrid,
+            'isReduced': False,
+            'nbTocPages': 1
+        }
+    }
+
+
+def _pdf(*widths):
+    writer = PdfFileWriter()
+    for width in widths:
+        writer.addBlankPage(width, 842)
+    with io.BytesIO() as output:
+        writer.write(output)
+        return output.getvalue()
+
+
+def _widths(content):
+    reader = PdfFileReader(io.BytesIO(content))
+    return [int(reader.getPage(i).mediaBox.getWidth()) for i in range(reader.getNumPages())]
+
+
+def test_get_key():
+    key = PdfCache.get_key([('http://a', '1'), ('http://b', '2')])
+    assert key == PdfCache.get_key([('http://a', '1'), ('http://b', '2')])
+    assert key != PdfCache.get_key([('http://a', '1'), ('http://b', '3')])
+    assert key != PdfCache.get_key([('http://b', '2'), ('http://a', '1')])
+    assert key != PdfCache.get_key([('http://a', '1')])
+
+
+def test_get_set(tmpdir):
+    cache = PdfCache(str(tmpdir))
+    assert cache.get('key') is None
+    cache.set('key', b'%PDF')
+    assert cache.get('key') == b'%PDF'
+
+
+def test_ttl(tmpdir):
+    cache = PdfCache(str(tmpdir), ttl=0)
+    cache.set('key', b'%PDF')
+    assert cache.get('key') is None
+
+
+def test_max_size(tmpdir):
+    cache = PdfCache(str(tmpdir), max_size=8)
+    cache.set('a', b'1234')
+    os.utime(cache._get_file_path('a', 'pdf'), (1, 1))
+    cache.set('b', b'1234')
+    cache.set('c', b'1234')
+    assert cache.get('a') is None
+    assert cache.get('b') == b'1234'
+    assert cache.get('c') == b'1234'
+    cache.set('d', b'123456789')
+    assert cache.get('d') is None
+
+
+@pytest.fixture
+def print_service(monkeypatch):
+    """
+    Prints a page with the extract identifier as width, so the printed extract can be recognized.
+    """
+    class MockResponse(object):
+        status_code = 200
+
+        def __init__(self, content):
+            self.headers = {'Content-Type': 'application/pdf'}
+            self.content = content
+
+    calls = list()
+
+    def post(url, headers=None, data=None):
+        calls.append(data)
+        identifier = json.loads(data)['attributes']['ExtractIdentifier']
+        return MockResponse(_pdf(int(identifier)))
+
+    monkeypatch.setattr(print_backends.requests, 'post', post)
+    return calls
+
+
+@pytest.fixture
+def documents(monkeypatch):
+    """
+    Serves two laws with one page each, of the width 300 and 400.
+    """
+    class MockResponse(object):
+
+        def __init__(self, status_code, content=b''):
+            self.status_code = status_code
+            self.headers = {'content-type': 'application/pdf', 'etag': '"1"'}
+            self.content = content
+
+    contents = {'http://example.com/a.pdf': _pdf(300), 'http://example.com/b.pdf': _pdf(400)}
+    calls = list()
+
+    def get(url, headers=None, timeout=None):
+        calls.append(url)
+        if (headers or {}).get('If-None-Match') == '"1"':
+            return MockResponse(304)
+        return MockResponse(200, contents[url])
+
+    monkeypatch.setattr(document_cache.requests, 'get', get)
+    monkeypatch.setattr(DocumentCache, '_instance', DocumentCache())
+    return calls
+
+
+def test_create_pdf_cached(tmpdir, monkeypatch, print_service, documents):
+    monkeypatch.setattr(PdfCache, '_instance', PdfCache(str(tmpdir)))
+    merged = list()
+
+    def merge(docs):
+        merged.append(docs)
+        return merge_documents(docs)
+
+    monkeypatch.setattr(mapfish_print, 'merge_documents', merge)
+    renderer = Renderer(DummyRenderInfo())
+    pdf_to_join = {'http://example.com/b.pdf', 'http://example.com/a.pdf'}
+    for identifier in ['101', '102']:
+        spec = _spec(identifier=identifier)
+        status_code, headers, content = renderer.create_pdf(spec, spec['attributes'], pdf_to_join)
+        assert status_code == 200
+        # The extract is always printed for the current extract identifier
+        assert _widths(content) == [int(identifier), 300, 400]
+    assert len(print_service) == 2
+    assert len(merged) == 1
+    # Each document is downloaded once per extract
+    assert len(documents) == 4
+
+
+def test_create_pdf_cached_documents(tmpdir, monkeypatch, print_service, documents):
+    monkeypatch.setattr(DocumentCache, '_instance', DocumentCache(str(tmpdir.mkdir('documents'))))
+    renderer = Renderer(DummyRenderInfo())
+    pdf_to_join = {'http://example.com/a.pdf', 'http://example.com/b.pdf'}
+    for identifier in ['101', '102']:
+        # The merged documents are not cached yet, the unchanged documents are read from the disk.
+        monkeypatch.setattr(PdfCache, '_instance', PdfCache(str(tmpdir.mkdir(identifier))))
+        spec = _spec(identifier=identifier)
+        status_code, headers, content = renderer.create_pdf(spec, spec['attributes'], pdf_to_join)
+        assert _widths(content) == [int(identifier), 300, 400]
+    # One download and one revalidation per document
+    assert len(documents) == 4
+
+
+def test_create_pdf_not_configured(monkeypatch, print_service, documents):
+    monkeypatch.setattr(PdfCache, '_instance', None)
+    renderer = Renderer(DummyRenderInfo())
+    spec = _spec(identifier='101')
+    pdf_to_join = {'http://example.com/a.pdf'}
+    status_code, headers, content = renderer.create_pdf(spec, spec['attributes'], pdf_to_join)
+    assert _widths(content) == [101, 300]
+    assert len(print_service) == 1
+    assert len(documents) == 1
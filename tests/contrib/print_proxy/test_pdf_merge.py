@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+import io
+import shutil
+import subprocess
+import tempfile
+import timeit
+
+import pytest
+from PyPDF2 import PdfFileReader, PdfFileWriter
+from PyPDF2.utils import PdfReadError
+
+from pyramid_oereb.contrib.print_proxy import pdf_merge
+from pyramid_oereb.contrib.print_proxy.pdf_merge import get_pages, merge_pdf
+
+
+def _create_pdf(*sizes):
+    writer = PdfFileWriter()
+    for width, height in sizes:
+        writer.addBlankPage(width, height)
+    with io.BytesIO() as output:
+        writer.write(output)
+        return output.getvalue()
+
+
+def _get_sizes(content):
+    reader = PdfFileReader(io.BytesIO(content))
+    return [
+        (int(reader.getPage(i).mediaBox.getWidth()), int(reader.getPage(i).mediaBox.getHeight()))
+        for i in range(reader.getNumPages())
+    ]
+
+
+def _create_pdf_with_broken_reference():
+    # The resources of the page refer to an object which does not exist.
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources 9 0 R >>'
+    ]
+    content = b'%PDF-1.4\n'
+    offsets = list()
+    for i, obj in enumerate(objects, 1):
+        offsets.append(len(content))
+        content += b'%d 0 obj\n' % i + obj + b'\nendobj\n'
+    xref = len(content)
+    content += b'xref\n0 4\n0000000000 65535 f \n'
+    content += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    content += b'trailer\n<< /Size 4 /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % xref
+    return content
+
+
+def _merge_pdftk(main, documents):
+    files = list()
+    for content in [main] + [document for url, document in documents]:
+        tmp_file = tempfile.NamedTemporaryFile(suffix='.pdf')
+        tmp_file.write(content)
+        tmp_file.flush()
+        files.append(tmp_file)
+    out = tempfile.NamedTemporaryFile(suffix='.pdf')
+    subprocess.check_call(['pdftk'] + [f.name for f in files] + ['cat', 'output', out.name])
+    return out.file.read()
+
+
+def test_merge_pdf():
+    main = _create_pdf((595, 842), (595, 842))
+    documents = [
+        ('http://example.com/a.pdf', _create_pdf((100, 200))),
+        ('http://example.com/b.pdf', _create_pdf((300, 400), (500, 600)))
+    ]
+    assert _get_sizes(merge_pdf(main, documents)) == [
+        (595, 842), (595, 842), (100, 200), (300, 400), (500, 600)
+    ]
+
+
+def test_merge_pdf_invalid_document():
+    main = _create_pdf((595, 842))
+    documents = [
+        ('http://example.com/a.pdf', b'no pdf'),
+        ('http://example.com/b.pdf', _create_pdf((100, 200)))
+    ]
+    assert _get_sizes(merge_pdf(main, documents)) == [(595, 842), (100, 200)]
+
+
+def test_merge_pdf_broken_reference():
+    main = _create_pdf((595, 842))
+    documents = [
+        ('http://example.com/a.pdf', _create_pdf_with_broken_reference()),
+        ('http://example.com/b.pdf', _create_pdf((100, 200)))
+    ]
+    assert _get_sizes(merge_pdf(main, documents)) == [(595, 842), (100, 200)]
+
+
+def test_merge_pdf_invalid_main():
+    with pytest.raises(PdfReadError):
+        merge_pdf(b'no pdf', [])
+
+
+def test_get_pages_invalid_cached(monkeypatch):
+    content = b'invalid pdf document'
+    with pytest.raises(PdfReadError):
+        get_pages(content)
+
+    def read(*args, **kwargs):
+        raise AssertionError('The document must not be read again')
+
+    monkeypatch.setattr(pdf_merge, 'PdfFileReader', read)
+    with pytest.raises(PdfReadError):
+        get_pages(content)
+
+
+@pytest.mark.skipif(shutil.which('pdftk') is None, reason='pdftk is not installed')
+def test_benchmark_merge_pdf():
+    main = _create_pdf(*[(595, 842)] * 20)
+    documents = [
+        ('http://example.com/{0}.pdf'.format(i), _create_pdf(*[(595, 842)] * 50)) for i in range(5)
+    ]
+    assert _get_sizes(merge_pdf(main, documents)) == _get_sizes(_merge_pdftk(main, documents))
+    number = 5
+    merge_time = timeit.timeit(lambda: merge_pdf(main, documents), number=number)
+    pdftk_time = timeit.timeit(lambda: _merge_pdftk(main, documents), number=number)
+    print('{0} pages, {1} runs: merge_pdf {2:.4f}s, pdftk {3:.4f}s'.format(
+        270, number, merge_time, pdftk_time
+    ))
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+import requests
+from pyramid.httpexceptions import HTTPServiceUnavailable
+
+from pyramid_oereb.contrib.print_proxy.print_backends import PrintBackendPool
+
+
+class PrintHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        self.send_response(200 if self.path.endswith('/capabilities.json') else 404)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/pdf')
+        self.end_headers()
+        self.wfile.write(b'%PDF')
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def print_server():
+    server = HTTPServer(('127.0.0.1', 0), PrintHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield 'http://127.0.0.1:{0}/print/oereb'.format(server.server_port)
+    server.shutdown()
+    server.server_close()
+
+
+def _unused_url():
+    server = HTTPServer(('127.0.0.1', 0), PrintHandler)
+    server.server_close()
+    return 'http://127.0.0.1:{0}/print/oereb'.format(server.server_port)
+
+
+def test_least_busy():
+    pool = PrintBackendPool(['http://a', 'http://b', 'http://c'])
+    with pool.acquire() as first:
+        with pool.acquire() as second:
+            with pool.acquire() as third:
+                selected = [first.base_url, second.base_url, third.base_url]
+                assert selected == ['http://a', 'http://b', 'http://c']
+                with pool.acquire() as fourth:
+                    assert fourth.active == 2
+            with pool.acquire() as fifth:
+                assert fifth is third
+
+
+def test_round_robin():
+    pool = PrintBackendPool(['http://a', 'http://b'], strategy='round_robin')
+    selected = list()
+    for _ in range(4):
+        with pool.acquire() as backend:
+            selected.append(backend.base_url)
+    assert selected == ['http://a', 'http://b', 'http://a', 'http://b']
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError):
+        PrintBackendPool(['http://a'], strategy='random')
+
+
+def test_queue():
+    pool = PrintBackendPool(['http://a'], max_concurrent=1, max_queued=1, queue_timeout=5, retry_after=3)
+    acquired = threading.Event()
+
+    def wait():
+        with pool.acquire():
+            acquired.set()
+
+    with pool.acquire():
+        waiting = threading.Thread(target=wait)
+        waiting.start()
+        for _ in range(100):
+            if pool._waiting == 1:
+                break
+            time.sleep(0.01)
+        # The queue is full
+        with pytest.raises(HTTPServiceUnavailable) as e:
+            with pool.acquire():
+                pass
+        assert e.value.headers['Retry-After'] == '3'
+    waiting.join(5)
+    assert acquired.is_set()
+
+
+def test_queue_timeout():
+    pool = PrintBackendPool(['http://a'], max_concurrent=1, queue_timeout=0.1)
+    with pool.acquire():
+        with pytest.raises(HTTPServiceUnavailable):
+            with pool.acquire():
+                pass
+
+
+def test_post(print_server):
+    pool = PrintBackendPool([_unused_url(), print_server])
+    for _ in range(2):
+        assert pool.post('buildreport.pdf', data='{}').content == b'%PDF'
+    assert [backend.healthy for backend in pool.backends] == [False, True]
+
+
+def test_post_unavailable():
+    pool = PrintBackendPool([_unused_url()])
+    with pytest.raises(requests.ConnectionError):
+        pool.post('buildreport.pdf', data='{}')
+    with pytest.raises(HTTPServiceUnavailable):
+        pool.post('buildreport.pdf', data='{}')
+
+
+def test_health_check(print_server):
+    pool = PrintBackendPool([print_server, _unused_url()], health_check_interval=0)
+    for backend in pool.backends:
+        pool.set_healthy(backend, False)
+    pool.check_health()
+    assert [backend.healthy for backend in pool.backends] == [True, False]
@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
+import os
+import timeit
 
 import pytest
+from unittest.mock import patch
 
 from pyramid_oereb.lib import b64
 from pyramid_oereb.lib.adapter import FileAdapter
@@ -45,3 +48,50 @@ def test_validate_filetype_invalid():
     with pytest.raises(TypeError) as e:
         ImageRecord._validate_filetype('tests/resources/invalid.jpg')
     assert '{0}'.format(e.value).startswith('Invalid file type')
+
+
+def test_encode_memoized():
+    image_record = ImageRecord('1'.encode('utf-8'))
+    assert image_record.encode() is image_record.encode()
+    image_record.content = '2'.encode('utf-8')
+    assert image_record.encode() == b64.encode('2'.encode('utf-8'))
+
+
+def test_filetype_memoized():
+    content = FileAdapter().read('tests/resources/logo_canton.png')
+    image_record = ImageRecord(content)
+    with patch.object(ImageRecord, '_validate_filetype', wraps=ImageRecord._validate_filetype) as validate:
+        assert image_record.mimetype == 'image/png'
+        assert image_record.extension == 'png'
+        assert image_record.mimetype == 'image/png'
+        assert validate.call_count == 1
+        image_record.content = FileAdapter().read('tests/resources/python.svg')
+        assert image_record.extension == 'svg'
+        assert validate.call_count == 2
+
+
+def _large_svg_content():
+    path = '<path d="M 0 0 L 10 10 L 20 0 Z" style="fill:#ff0000;stroke:#000000"/>\n'
+    return '<svg xmlns="http://www.w3.org/2000/svg">\n{0}</svg>'.format(path * 50000).encode('utf-8')
+
+
+def test_validate_filetype_large_svg_content():
+    content = _large_svg_content()
+    assert ImageRecord._validate_filetype(content) == ('svg', 'image/svg+xml')
+    assert ImageRecord._validate_filetype(bytearray(content)) == ('svg', 'image/svg+xml')
+    with pytest.raises(TypeError):
+        ImageRecord._validate_filetype(content[:-len(b'</svg>')])
+
+
+@pytest.mark.skipif(not os.environ.get('BENCHMARK'), reason='set BENCHMARK=1 to run the benchmarks')
+def test_benchmark_validate_filetype_large_svg_content(record_property):
+    content = _large_svg_content()
+    record_property('bytes', len(content))
+    record_property('validate_filetype', timeit.timeit(
+        lambda: ImageRecord._validate_filetype(content), number=10
+    ))
+
+
+def test_validate_filetype_unclosed_svg_content():
+    with pytest.raises(TypeError):
+        ImageRecord._validate_filetype('<svg xmlns="http://www.w3.org/2000/svg"><path/>'.encode('utf-8'))
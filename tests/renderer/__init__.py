@@ -7,13 +7,16 @@ from pyramid_oereb.lib.adapter import FileAdapter
 from pyramid_oereb.lib.records.embeddable import EmbeddableRecord, DatasourceRecord
 from pyramid_oereb.lib.records.exclusion_of_liability import ExclusionOfLiabilityRecord
 from pyramid_oereb.lib.records.extract import ExtractRecord
+from pyramid_oereb.lib.records.geometry import GeometryRecord
 from pyramid_oereb.lib.records.glossary import GlossaryRecord
 from pyramid_oereb.lib.records.image import ImageRecord
+from pyramid_oereb.lib.records.law_status import LawStatusRecord
 from pyramid_oereb.lib.records.office import OfficeRecord
+from pyramid_oereb.lib.records.plr import PlrRecord
 from pyramid_oereb.lib.records.real_estate import RealEstateRecord
 from pyramid_oereb.lib.records.theme import ThemeRecord
 from pyramid_oereb.lib.records.view_service import ViewServiceRecord
-from shapely.geometry import MultiPolygon, Polygon
+from shapely.geometry import MultiPolygon, Point, Polygon
 from tests import pyramid_oereb_test_config
 
 
@@ -34,6 +37,30 @@ def get_none_glossary_extract():
     return _get_test_extract(None)
 
 
+def get_extract_with_plrs():
+    extract = get_default_extract()
+    file_adapter = FileAdapter()
+    office = OfficeRecord({'de': u'AGI'})
+    law_status = LawStatusRecord(u'inForce', {'de': u'In Kraft'})
+    for code in [u'LandUsePlans', u'MotorwaysBuildingLines']:
+        extract.real_estate.public_law_restrictions.append(PlrRecord(
+            theme=ThemeRecord(code, {'de': u'Theme'}),
+            information={'de': u'information'},
+            law_status=law_status,
+            published_from=datetime.datetime.now(),
+            responsible_office=office,
+            symbol=ImageRecord(file_adapter.read('tests/resources/logo_canton.png')),
+            view_service=ViewServiceRecord(
+                reference_wms=u'http://example.com/wms',
+                layer_index=0,
+                layer_opacity=1.0),
+            geometries=[GeometryRecord(
+                law_status, datetime.datetime.now(), Point(1, 1), office=office
+            )]
+        ))
+    return extract
+
+
 def _get_test_extract(glossary):
     date = datetime.datetime.now()
     file_adapter = FileAdapter()
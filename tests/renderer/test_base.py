@@ -2,6 +2,7 @@
 
 import pytest
 import datetime
+from unittest.mock import Mock, patch
 
 from pyramid.httpexceptions import HTTPServerError
 from pyramid.response import Response
@@ -12,8 +13,10 @@ from pyramid_oereb.lib.config import Config
 from pyramid_oereb.lib.records.image import ImageRecord
 from pyramid_oereb.lib.records.theme import ThemeRecord
 from pyramid_oereb.lib.records.view_service import LegendEntryRecord
-from pyramid_oereb.lib.renderer import Base
+from pyramid_oereb.lib.renderer import Base, get_collation_key, get_template_lookup
 from pyramid_oereb.lib.renderer.extract.json_ import Renderer
+from pyramid_oereb.lib.renderer.extract.xml_ import Renderer as XmlRenderer
+from pyramid_oereb.standard.hook_methods import get_symbol_ref
 from tests import pyramid_oereb_test_config
 from tests.mockrequest import MockRequest
 from tests.renderer import DummyRenderInfo
@@ -40,6 +43,25 @@ def test_get_request():
     assert isinstance(request, DummyRequest)
 
 
+def test_get_template_lookup_shared():
+    lookup = get_template_lookup('lib/renderer/extract/templates/xml')
+    assert get_template_lookup('lib/renderer/extract/templates/xml') is lookup
+    assert XmlRenderer.get_template() is lookup.get_template('extract.xml')
+    assert XmlRenderer.get_template('theme.xml') is XmlRenderer.get_template('theme.xml')
+
+
+def test_init_templates():
+    XmlRenderer.init_templates()
+    lookup = get_template_lookup(XmlRenderer.template_path)
+    assert lookup.has_template('extract.xml')
+    assert lookup.has_template('geometry/point.xml')
+
+
+def test_init_templates_without_templates():
+    Renderer.init_templates()
+    assert Renderer.template_path is None
+
+
 def test_get_missing_request():
     request = Base.get_request({})
     assert request is None
@@ -156,6 +178,21 @@ def test_sort_by_localized_text():
     assert sorted_multilingual_elements[2]['content']['fr'] == u'Content-Ofo'
 
 
+def test_get_collation_key():
+    get_collation_key.cache_clear()
+    assert get_collation_key(u'\xd6REB') == u'o\u0308reb'
+    assert get_collation_key(None) == ''
+    assert get_collation_key(u'\xd6REB') == u'o\u0308reb'
+    assert get_collation_key.cache_info().hits == 1
+    assert Base.unaccent_lower(u'\xd6REB') == u'o\u0308reb'
+
+
+def test_sort_by_localized_text_not_sortable():
+    renderer = Base(DummyRenderInfo())
+    elements = [{'title': {'de': {'unsortable': 1}}}, {'title': {'de': {'unsortable': 2}}}]
+    assert renderer.sort_by_localized_text(elements, lambda element: element['title']) is elements
+
+
 @pytest.mark.parametrize('theme_code', [
     u'ContaminatedSites',
     u'NotExistingTheme',
@@ -181,3 +218,77 @@ def test_get_symbol_ref(theme_code):
                 record.view_service_id,
                 record.type_code
             )
+
+
+def test_get_symbol_ref_hooks():
+    hooks = Base.get_symbol_ref_hooks()
+    assert Base.get_symbol_ref_hooks() is hooks
+    assert hooks['landuseplans'] is get_symbol_ref
+    assert 'notexistingtheme' not in hooks
+
+
+def _legend_entries(type_codes):
+    return [
+        LegendEntryRecord(
+            ImageRecord(FileAdapter().read('tests/resources/python.svg')),
+            {'de': 'Test'},
+            type_code,
+            u'test',
+            ThemeRecord(u'LandUsePlans', {'de': 'Test'}),
+            view_service_id=1
+        ) for type_code in type_codes
+    ]
+
+
+def test_get_symbol_ref_memoized():
+    request = MockRequest()
+    records = _legend_entries([u'a', u'b', u'a'])
+    calls = list()
+
+    def hook(req, record):
+        calls.append(record)
+        return record.type_code
+
+    hook.symbol_ref_key = lambda record: record.type_code
+    hooks = dict(Base.get_symbol_ref_hooks())
+    hooks['landuseplans'] = hook
+    with patch.object(Base, 'get_symbol_ref_hooks', return_value=hooks):
+        refs = [Base.get_symbol_ref(request, record) for record in records]
+        assert Base.get_symbol_ref(MockRequest(), records[0]) == u'a'
+    assert refs == [u'a', u'b', u'a']
+    assert len(calls) == 3
+
+
+def test_get_symbol_ref_custom_hook():
+    request = MockRequest()
+    records = _legend_entries([u'a', u'a'])
+    records[1].sub_theme = {'de': 'Other'}
+
+    def hook(req, record):
+        return u'{0}-{1}'.format(record.type_code, record.sub_theme)
+
+    hooks = dict(Base.get_symbol_ref_hooks())
+    hooks['landuseplans'] = hook
+    with patch.object(Base, 'get_symbol_ref_hooks', return_value=hooks):
+        refs = [Base.get_symbol_ref(request, record) for record in records]
+    # Hooks without a key are called for each record
+    assert refs == [u'a-None', u"a-{'de': 'Other'}"]
+
+
+def test_get_static_fragment():
+    renderer = Base(DummyRenderInfo())
+    records = [object()]
+    creator = Mock(side_effect=lambda: [renderer._language])
+    assert renderer.get_static_fragment('test', records, creator) == ['de']
+    assert renderer.get_static_fragment('test', records, creator) == ['de']
+    assert creator.call_count == 1
+    # The cached sources return a new list with the same records for each request
+    assert renderer.get_static_fragment('test', list(records), creator) == ['de']
+    assert creator.call_count == 1
+    renderer._language = 'fr'
+    assert renderer.get_static_fragment('test', records, creator) == ['fr']
+    assert creator.call_count == 2
+    assert renderer.get_static_fragment('test', [object()], creator) == ['fr']
+    assert creator.call_count == 3
+    assert renderer.get_static_fragment('test', [], creator) == ['fr']
+    assert creator.call_count == 4
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+import math
+import os
+import timeit
+from unittest.mock import patch
+
+import pytest
+from shapely.geometry import LineString, MultiPolygon, Point, Polygon, mapping
+
+from pyramid_oereb.lib.config import Config
+from pyramid_oereb.lib.renderer.geometry import get_coordinate_precision, get_coordinates, get_pos_list
+
+
+def _large_polygon(vertices=5000):
+    return Polygon([
+        (2600000.123456 + 1000 * math.cos(2 * math.pi * i / vertices),
+         1200000.654321 + 1000 * math.sin(2 * math.pi * i / vertices))
+        for i in range(vertices)
+    ])
+
+
+def _as_lists(coordinates):
+    if isinstance(coordinates, (list, tuple)):
+        return [_as_lists(c) for c in coordinates]
+    return coordinates
+
+
+@pytest.mark.parametrize('geom', [
+    Point(1, 2),
+    LineString([(0, 0), (1.5, 1)]),
+    Polygon([(0, 0), (0, 1), (1, 1), (1, 0)], [[(0.25, 0.25), (0.25, 0.75), (0.75, 0.75)]]),
+    MultiPolygon([Polygon([(0, 0), (1, 1), (1, 0)]), Polygon([(2, 2), (3, 3), (3, 2)])]),
+    Polygon()
+])
+def test_get_coordinates(geom):
+    assert get_coordinates(geom) == _as_lists(mapping(geom)['coordinates'])
+
+
+def test_get_coordinates_precision():
+    assert get_coordinates(Point(2600000.123456, 1200000.654321), 3) == [2600000.123, 1200000.654]
+    assert get_coordinates(LineString([(0.0004, 0.0006), (1, 1)]), 3) == [[0.0, 0.001], [1.0, 1.0]]
+
+
+def test_get_pos_list():
+    line = LineString([(0, 0), (1.5, 1), (2600000.123456, 1200000.654321)])
+    assert get_pos_list(line.coords) == '0.0 0.0 1.5 1.0 2600000.123456 1200000.654321'
+    assert get_pos_list(line.coords, 3) == '0.000 0.000 1.500 1.000 2600000.123 1200000.654'
+
+
+def test_get_coordinate_precision():
+    assert get_coordinate_precision() is None
+    with patch.object(Config, 'get', return_value=3):
+        assert get_coordinate_precision() == 3
+
+
+def test_get_coordinates_large_polygon():
+    polygon = _large_polygon()
+    assert get_coordinates(polygon) == _as_lists(mapping(polygon)['coordinates'])
+    assert get_coordinates(polygon, 3)[0][0] == [2601000.123, 1200000.654]
+
+
+@pytest.mark.skipif(not os.environ.get('BENCHMARK'), reason='set BENCHMARK=1 to run the benchmarks')
+def test_benchmark_large_polygon(record_property):
+    polygon = _large_polygon()
+    number = 20
+    record_property('vertices', len(polygon.exterior.coords))
+    record_property('mapping', timeit.timeit(lambda: mapping(polygon)['coordinates'], number=number))
+    record_property('get_coordinates', timeit.timeit(lambda: get_coordinates(polygon, 3), number=number))
+    record_property('get_pos_list', timeit.timeit(
+        lambda: get_pos_list(polygon.exterior.coords, 3), number=number
+    ))
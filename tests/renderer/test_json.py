@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 
 import datetime
+import json
+from types import GeneratorType
+from unittest.mock import patch
 
 import pytest
 from shapely.geometry import MultiPolygon, Polygon, Point, LineString
@@ -26,7 +29,7 @@ from pyramid_oereb.lib.renderer import Base
 from pyramid_oereb.lib.renderer.extract.json_ import Renderer
 from tests import pyramid_oereb_test_config
 from tests.mockrequest import MockRequest
-from tests.renderer import DummyRenderInfo
+from tests.renderer import DummyRenderInfo, get_default_extract, get_extract_with_plrs
 from pyramid_oereb.views.webservice import Parameter
 
 
@@ -416,7 +419,7 @@ def test_format_document(params, document, result_dict):
         'MetadataOfGeographicalBaseData': 'http://www.geocat.ch',
         'Point': {
             'crs': 'EPSG:2056',
-            'coordinates': (0, 0)
+            'coordinates': [0, 0]
         }
     }),
     (GeometryRecord(law_status(), datetime.date.today(), LineString([(0, 0), (1, 1)]),
@@ -430,7 +433,7 @@ def test_format_document(params, document, result_dict):
         },
         'Line': {
             'crs': 'EPSG:2056',
-            'coordinates': ((0, 0), (1, 1))
+            'coordinates': [[0, 0], [1, 1]]
         }
     }),
     (GeometryRecord(
@@ -448,7 +451,7 @@ def test_format_document(params, document, result_dict):
         },
         'Surface': {
             'crs': 'EPSG:2056',
-            'coordinates': (((0, 0), (1, 1), (1, 0), (0, 0)), )
+            'coordinates': [[[0, 0], [1, 1], [1, 0], [0, 0]]]
         }
     })
 ])
@@ -616,3 +619,99 @@ def test_embeddable(params):
         'dataOwnerNameCadastralSurveying': u'This is only a dummy',
         'transferFromSourceCadastralSurveying': av_update_date.strftime('%d-%m-%YT%H:%M:%S')
     }
+
+
+def test_get_encoder():
+    assert Renderer.get_encoder() is json.dumps
+    orjson = pytest.importorskip('orjson')
+    extract_config = dict(Config.get_extract_config(), json_encoder='orjson.dumps')
+    with patch.object(Config, 'get_extract_config', return_value=extract_config):
+        assert Renderer.get_encoder() is orjson.dumps
+
+
+def test_get_encoder_not_available():
+    extract_config = dict(Config.get_extract_config(), json_encoder='not_existing_module.dumps')
+    with patch.object(Config, 'get_extract_config', return_value=extract_config):
+        assert Renderer.get_encoder() is json.dumps
+
+
+@pytest.mark.parametrize('flavour,extract', [
+    ('reduced', get_extract_with_plrs()),
+    ('embeddable', get_default_extract()),
+    ('reduced', get_default_extract())
+])
+def test_stream(flavour, extract):
+    parameter = Parameter('json', flavour, True, False, 'BL0200002829', '1000', 'CH775979211712', 'de')
+    request = MockRequest()
+    renderer = Renderer(DummyRenderInfo())
+    with pyramid_oereb_test_config():
+        rendered = renderer((extract, parameter), {'request': request})
+        chunks = list(renderer._stream(extract, parameter))
+    plrs = extract.real_estate.public_law_restrictions
+    assert len(chunks) == (len(plrs) + 2 if plrs else 1)
+    assert json.loads(b''.join(chunks).decode('utf-8')) == json.loads(rendered)
+
+
+def test_stream_configured():
+    parameter = default_param()
+    request = MockRequest()
+    extract_config = dict(Config.get_extract_config(), json_streaming=True)
+    with patch.object(Config, 'get_extract_config', return_value=extract_config):
+        result = Renderer(DummyRenderInfo())((get_extract_with_plrs(), parameter), {'request': request})
+    assert isinstance(result, GeneratorType)
+    with pyramid_oereb_test_config():
+        content = b''.join(result)
+    restrictions = json.loads(content.decode('utf-8'))['GetExtractByIdResponse']['extract'][
+        'RealEstate']['RestrictionOnLandownership']
+    assert [restriction['Theme']['Code'] for restriction in restrictions] == \
+        ['LandUsePlans', 'MotorwaysBuildingLines']
+
+
+def test_render_static_fragments():
+    parameter = Parameter('json', flavour='reduced', egrid='CH775979211712', language='de')
+    extract = get_default_extract()
+    renderer = Renderer(DummyRenderInfo())
+    renderer._request = MockRequest()
+    with pyramid_oereb_test_config():
+        result = renderer._render(extract, parameter)
+        assert result['Glossary'] == [{
+            'Title': [{'Language': 'de', 'Text': 'Glossar'}],
+            'Content': [{'Language': 'de', 'Text': 'Test'}]
+        }]
+        result['Glossary'][0]['Title'] = 'Glossar'
+        with patch.object(Renderer, 'format_glossaries') as format_glossaries, \
+                patch.object(Renderer, 'format_exclusions_of_liability') as format_exclusions_of_liability:
+            cached = renderer._render(extract, parameter)
+            assert format_glossaries.call_count == 0
+            assert format_exclusions_of_liability.call_count == 0
+    assert cached['Glossary'][0]['Title'] == [{'Language': 'de', 'Text': 'Glossar'}]
+    assert cached['ExclusionOfLiability'] == result['ExclusionOfLiability']
+
+
+def test_format_document_shared():
+    parameter = Parameter('json', flavour='reduced', egrid='CH775979211712', language='de')
+    extract = get_extract_with_plrs()
+    document = LegalProvisionRecord(
+        law_status(),
+        datetime.date.today(),
+        {'de': 'Test Rechtsvorschrift'},
+        OfficeRecord({'de': 'AGI'}),
+        {'de': 'http://meine.rechtsvorschrift.ch'},
+        references=[
+            DocumentRecord('Law', law_status(), datetime.date.today(), {'de': 'Test Dokument'},
+                           OfficeRecord({'de': 'BUD'}), {'de': 'http://mein.dokument.ch'})
+        ]
+    )
+    for plr in extract.real_estate.public_law_restrictions:
+        plr.documents = [document]
+    renderer = Renderer(DummyRenderInfo())
+    renderer._request = MockRequest()
+    with pyramid_oereb_test_config(), \
+            patch.object(Renderer, '_format_document', autospec=True,
+                         side_effect=Renderer._format_document) as format_document:
+        result = renderer._render(extract, parameter)
+    assert format_document.call_count == 2
+    first, second = result['RealEstate']['RestrictionOnLandownership']
+    assert first['LegalProvisions'][0] is second['LegalProvisions'][0]
+    reference = first['LegalProvisions'][0]['Reference'][0]
+    assert reference['Title'] == [{'Language': 'de', 'Text': 'Test Dokument'}]
@@ -1,15 +1,24 @@
 # -*- coding: utf-8 -*-
 
+import datetime
 from io import BytesIO
+from types import GeneratorType
+from unittest.mock import patch
 
 from lxml import etree
+
+from pyramid_oereb.lib.config import Config
+from pyramid_oereb.lib.records.documents import LegalProvisionRecord
+from pyramid_oereb.lib.records.law_status import LawStatusRecord
+from pyramid_oereb.lib.records.office import OfficeRecord
+from pyramid_oereb.lib.renderer import get_template_lookup
 from pyramid_oereb.lib.renderer.extract.xml_ import Renderer
 from pyramid_oereb.lib.renderer.versions.xml_ import Renderer as VersionsRenderer
 from pyramid_oereb.views.webservice import Parameter
 from tests import schema_xml_versions, schema_xml_extract
 from tests.mockrequest import MockRequest
 from tests.renderer import DummyRenderInfo, get_default_extract,\
-    get_empty_glossary_extract, get_none_glossary_extract
+    get_empty_glossary_extract, get_none_glossary_extract, get_extract_with_plrs
 import pytest
 
 
@@ -68,3 +77,76 @@ def test_extract_against_schema(parameter, test_extract):
     buffer = BytesIO(rendered)
     doc = etree.parse(buffer)
     xmlschema.assertValid(doc)
+
+
+@pytest.mark.parametrize('with_geometry', [False, True])
+def test_extract_stream(with_geometry):
+    parameter = Parameter('xml', flavour='reduced', with_geometry=with_geometry, egrid='CH775979211712',
+                          language='de')
+    extract = get_extract_with_plrs()
+    renderer = Renderer(DummyRenderInfo())
+    renderer._language = u'de'
+    renderer._request = MockRequest()
+    renderer._request.route_url = lambda url, **kwargs: "http://example.com/current/view"
+    rendered = renderer._render(extract, parameter)
+    renderer._gml_id = 0
+    chunks = list(renderer._stream(extract, parameter))
+
+    # extract and real estate head, one chunk per restriction, real estate and extract tail
+    assert len(chunks) == 6
+    assert chunks[0].startswith(b'<?xml')
+    streamed = b''.join(chunks)
+    assert streamed.split() == rendered.split()
+    etree.parse(BytesIO(streamed))
+
+
+def test_extract_stream_configured():
+    parameter = Parameter('xml', flavour='reduced', egrid='CH775979211712', language='de')
+    request = MockRequest()
+    request.route_url = lambda url, **kwargs: "http://example.com/current/view"
+    renderer = Renderer(DummyRenderInfo())
+    extract_config = dict(Config.get_extract_config(), xml_streaming=True)
+    with patch.object(Config, 'get_extract_config', return_value=extract_config):
+        result = renderer((get_extract_with_plrs(), parameter), {'request': request})
+    assert isinstance(result, GeneratorType)
+    assert request.response.content_type == 'application/xml'
+    etree.parse(BytesIO(b''.join(result)))
+
+
+def test_extract_static_fragments():
+    parameter = Parameter('xml', flavour='reduced', egrid='CH775979211712', language='de')
+    extract = get_default_extract()
+    renderer = Renderer(DummyRenderInfo())
+    renderer._language = u'de'
+    renderer._request = MockRequest()
+    renderer._request.route_url = lambda url, **kwargs: "http://example.com/current/view"
+    rendered = renderer._render(extract, parameter)
+    doc = etree.parse(BytesIO(rendered))
+    namespaces = {'data': 'http://schemas.geo.admin.ch/V_D/OeREB/1.0/ExtractData'}
+    assert len(doc.findall('.//data:Glossary', namespaces)) == 1
+    assert len(doc.findall('.//data:ExclusionOfLiability', namespaces)) == 1
+    renderer._gml_id = 0
+    with patch.object(Renderer, '_render_fragment') as render_fragment:
+        assert renderer._render(extract, parameter) == rendered
+        assert render_fragment.call_count == 0
+
+
+def test_extract_documents_rendered_once():
+    parameter = Parameter('xml', flavour='reduced', egrid='CH775979211712', language='de')
+    extract = get_extract_with_plrs()
+    law_status = LawStatusRecord(u'inForce', {'de': u'In Kraft'})
+    document = LegalProvisionRecord(law_status, datetime.date.today(), {'de': u'Test Rechtsvorschrift'},
+                                    OfficeRecord({'de': u'AGI'}), {'de': u'http://meine.rechtsvorschrift.ch'})
+    for plr in extract.real_estate.public_law_restrictions:
+        plr.documents = [document]
+    renderer = Renderer(DummyRenderInfo())
+    renderer._language = u'de'
+    renderer._request = MockRequest()
+    renderer._request.route_url = lambda url, **kwargs: "http://example.com/current/view"
+    lookup = get_template_lookup(Renderer.template_path)
+    with patch.object(lookup, 'get_template', wraps=lookup.get_template) as get_template:
+        rendered = renderer._render(extract, parameter)
+    assert [call[0][0] for call in get_template.call_args_list].count('document.xml') == 1
+    doc = etree.parse(BytesIO(rendered))
+    namespaces = {'data': 'http://schemas.geo.admin.ch/V_D/OeREB/1.0/ExtractData'}
+    assert len(doc.findall('.//data:LegalProvisions', namespaces)) == 2
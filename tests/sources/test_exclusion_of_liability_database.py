@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import pytest
+from unittest.mock import patch
 
 from pyramid_oereb.lib.config import Config
 from pyramid_oereb.lib.adapter import DatabaseAdapter
@@ -25,3 +26,18 @@ def test_read():
     )
     source.read(MockParameter())
     assert len(source.records) == 1
+
+
+def test_read_cached():
+    params = dict(Config.get_exclusion_of_liability_config().get('source').get('params'), cache_ttl=60)
+    DatabaseSource.clear_cache()
+    source = DatabaseSource(**params)
+    source.read(MockParameter())
+    records = list(source.records)
+    # Changing the records of a request must not change the cached ones
+    source.records.clear()
+    with patch.object(source, '_read_records_') as read_records:
+        source.read(MockParameter())
+        assert read_records.call_count == 0
+    assert source.records == records
+    DatabaseSource.clear_cache()
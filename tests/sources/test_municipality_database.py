@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import pytest
+from unittest.mock import patch
 
 from pyramid_oereb.lib.config import Config
 from pyramid_oereb.lib.adapter import DatabaseAdapter
@@ -20,3 +21,29 @@ def test_read():
     source = DatabaseSource(**Config.get_municipality_config().get('source').get('params'))
     source.read(MockParameter())
     assert isinstance(source.records, list)
+
+
+def test_read_cached():
+    params = dict(Config.get_municipality_config().get('source').get('params'), cache_ttl=60)
+    DatabaseSource.clear_cache()
+    source = DatabaseSource(**params)
+    source.read(MockParameter(), 1234)
+    assert len(source.records) == 1
+    first = source.records[0]
+    with patch.object(source, '_read_records_') as read_records:
+        source.read(MockParameter(), 1234)
+        assert read_records.call_count == 0
+    assert source.records[0] is first
+    # The number requested for a logo is a string and shares the cache entry
+    with patch.object(source, '_read_records_') as read_records:
+        source.read(MockParameter(), '1234')
+        assert read_records.call_count == 0
+    assert source.records[0] is first
+    DatabaseSource.clear_cache()
+
+
+def test_read_fosnrs():
+    source = DatabaseSource(**Config.get_municipality_config().get('source').get('params'))
+    fosnrs = source.read_fosnrs(MockParameter())
+    source.read(MockParameter())
+    assert sorted(fosnrs) == sorted([record.fosnr for record in source.records])
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+import os
+import timeit
+
+import pytest
+
+from pyramid_oereb.lib import b64
+from pyramid_oereb.lib.adapter import FileAdapter
+from pyramid_oereb.lib.config import Config
+from pyramid_oereb.standard.models.land_use_plans import LegendEntry, PublicLawRestriction
+from pyramid_oereb.standard.sources.plr import DatabaseSource
+
+
+@pytest.fixture
+def source():
+    plr_config = [plr for plr in Config.get('plrs') if plr.get('code') == 'LandUsePlans'][0]
+    return DatabaseSource(**plr_config)
+
+
+def _legend_entries():
+    symbol = b64.encode(FileAdapter().read('tests/resources/symbol.png'))
+    return [
+        LegendEntry(
+            id=str(i),
+            symbol=symbol,
+            legend_text={'de': 'Test {0}'.format(i)},
+            type_code='CodeA{0}'.format(i),
+            type_code_list='',
+            topic='LandUsePlans',
+            view_service_id='1'
+        ) for i in range(3)
+    ]
+
+
+@pytest.mark.run(order=2)
+def test_legend_entry_records_are_shared(source):
+    legend_entries = _legend_entries()
+    first = source.from_db_to_legend_entry_record(
+        source._theme_record,
+        legend_entries,
+        PublicLawRestriction(view_service_id='1')
+    )
+    second = source.from_db_to_legend_entry_record(
+        source._theme_record,
+        legend_entries,
+        PublicLawRestriction(view_service_id='1')
+    )
+    assert len(first) == 3
+    assert first is not second
+    for record_1, record_2 in zip(first, second):
+        assert record_1 is record_2
+        assert record_1.symbol.content == FileAdapter().read('tests/resources/symbol.png')
+
+
+@pytest.mark.run(order=2)
+def test_legend_entry_records_filtered_by_view_service(source):
+    legend_entries = _legend_entries()
+    records = source.from_db_to_legend_entry_record(
+        source._theme_record,
+        legend_entries,
+        PublicLawRestriction(view_service_id='2')
+    )
+    assert records == []
+
+
+@pytest.mark.run(order=2)
+@pytest.mark.skipif(not os.environ.get('BENCHMARK'), reason='set BENCHMARK=1 to run the benchmarks')
+def test_benchmark_legend_entry_records(source, record_property):
+    legend_entries = _legend_entries()
+    restrictions = [PublicLawRestriction(view_service_id='1') for _ in range(100)]
+
+    def read(shared):
+        source._legend_entry_records = {}
+        for restriction in restrictions:
+            if not shared:
+                source._legend_entry_records = {}
+            source.from_db_to_legend_entry_record(source._theme_record, legend_entries, restriction)
+
+    record_property('restrictions', len(restrictions))
+    record_property('legend_entries', len(legend_entries))
+    record_property('shared', min(timeit.repeat(lambda: read(True), number=5, repeat=3)))
+    record_property('per_restriction', min(timeit.repeat(lambda: read(False), number=5, repeat=3)))
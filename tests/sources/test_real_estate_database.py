@@ -36,3 +36,19 @@ def test_missing_parameter():
     source = DatabaseSource(**Config.get_real_estate_config().get('source').get('params'))
     with pytest.raises(AttributeError):
         source.read(MockParameter())
+
+
+@pytest.mark.run(order=2)
+def test_read_batch():
+    source = DatabaseSource(**Config.get_real_estate_config().get('source').get('params'))
+    results = source.read_batch(MockParameter(), geometries=[
+        'SRID=2056;POINT(1 1)',
+        'SRID=2056;POINT(-1000 -1000)',
+        'SRID=2056;POINT(1 1)'
+    ])
+    assert [len(records) for records in results] == [1, 0, 1]
+    assert results[0][0].egrid == 'TEST'
+    results = source.read_batch(MockParameter(), idents=[('BLTEST', '9999'), ('BLTEST', '1000')])
+    assert [len(records) for records in results] == [0, 1]
+    assert results[1][0].egrid == 'TEST'
+    assert source.read_batch(MockParameter()) == []
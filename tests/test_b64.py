@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+
+from pyramid_oereb.lib import b64
+from pyramid_oereb.standard.models import BinaryImage
+
+
+def test_encode_decode():
+    assert b64.decode(b64.encode('abc')) == b'abc'
+
+
+def test_decode_binary_text():
+    assert b64.decode_binary(b64.encode(b'\x89PNG')) == b'\x89PNG'
+
+
+def test_decode_binary_bytes():
+    assert b64.decode_binary(b'\x89PNG') == b'\x89PNG'
+    assert b64.decode_binary(bytearray(b'\x89PNG')) == b'\x89PNG'
+    assert b64.decode_binary(memoryview(b'\x89PNG')) == b'\x89PNG'
+
+
+def test_binary_image_bind_param():
+    image_type = BinaryImage()
+    assert image_type.process_bind_param(b64.encode(b'\x89PNG'), None) == b'\x89PNG'
+    assert image_type.process_bind_param(b'\x89PNG', None) == b'\x89PNG'
+
+
+def test_binary_image_result_value():
+    image_type = BinaryImage()
+    assert image_type.process_result_value(memoryview(b'\x89PNG'), None) == b'\x89PNG'
+    assert image_type.process_result_value(None, None) is None
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import time
+
+from pyramid_oereb.lib.cache import Cache
+
+
+def test_get_set():
+    cache = Cache()
+    assert cache.get('a') is None
+    assert cache.get('a', 1) == 1
+    cache.set('a', 2)
+    assert cache.get('a') == 2
+    assert len(cache) == 1
+
+
+def test_ttl():
+    cache = Cache(ttl=0.01)
+    cache.set('a', 1)
+    cache.set('b', 2, ttl=60)
+    time.sleep(0.02)
+    assert cache.get('a') is None
+    assert cache.get('b') == 2
+
+
+def test_max_size():
+    cache = Cache(max_size=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+
+
+def test_get_or_create():
+    calls = []
+
+    def creator():
+        calls.append(1)
+        return None
+
+    cache = Cache()
+    assert cache.get_or_create('a', creator) is None
+    assert cache.get_or_create('a', creator) is None
+    assert len(calls) == 1
+
+
+def test_delete_clear():
+    cache = Cache()
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.delete('a')
+    cache.delete('x')
+    assert cache.get('a') is None
+    cache.clear()
+    assert len(cache) == 0
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import gzip
+from unittest.mock import patch
+
+import pytest
+from pyramid.response import Response
+from pyramid.testing import DummyRequest
+
+from pyramid_oereb.lib import compression
+from pyramid_oereb.lib.compression import compress_response, compressed_view, get_compression_config, \
+    get_encoding
+from pyramid_oereb.lib.config import Config
+
+BODY = b'<?xml version="1.0" encoding="UTF-8"?><data>' + b'<a>test</a>' * 200 + b'</data>'
+
+
+def _request(accept_encoding=None):
+    request = DummyRequest()
+    if accept_encoding is not None:
+        request.headers['Accept-Encoding'] = accept_encoding
+    return request
+
+
+def _response(body=BODY, content_type='application/xml'):
+    return Response(body=body, content_type=content_type)
+
+
+@pytest.fixture
+def compression_config():
+    with patch.object(Config, 'get', return_value={'min_size': 100}):
+        yield
+
+
+def test_get_compression_config():
+    assert get_compression_config() is None
+    with patch.object(Config, 'get', return_value={'brotli': True}):
+        assert get_compression_config() == {'min_size': 1024, 'level': 6, 'brotli': True}
+
+
+@pytest.mark.parametrize('accept_encoding,expected', [
+    (None, None),
+    ('identity', None),
+    ('gzip', 'gzip'),
+    ('deflate, gzip;q=0.5', 'gzip'),
+    ('br', None)
+])
+def test_get_encoding(accept_encoding, expected):
+    assert get_encoding(_request(accept_encoding), {'brotli': False}) == expected
+
+
+def test_get_encoding_brotli():
+    with patch.object(compression, 'brotli', None):
+        assert get_encoding(_request('br, gzip'), {'brotli': True}) == 'gzip'
+    with patch.object(compression, 'brotli', object()):
+        assert get_encoding(_request('br, gzip'), {'brotli': True}) == 'br'
+
+
+def test_compress_response_disabled():
+    response = compress_response(_request('gzip'), _response())
+    assert response.content_encoding is None
+    assert response.body == BODY
+
+
+def test_compress_response(compression_config):
+    response = compress_response(_request('gzip'), _response())
+    assert response.content_encoding == 'gzip'
+    assert 'Accept-Encoding' in response.vary
+    assert response.content_length == len(response.body)
+    assert gzip.decompress(response.body) == BODY
+
+
+@pytest.mark.parametrize('request_,response', [
+    (_request(), _response()),
+    (_request('gzip'), _response(body=b'{}', content_type='application/json')),
+    (_request('gzip'), _response(content_type='image/png')),
+    (_request('gzip'), Response(status=204))
+])
+def test_compress_response_skipped(compression_config, request_, response):
+    body = response.body
+    response = compress_response(request_, response)
+    assert response.content_encoding is None
+    assert response.body == body
+
+
+def test_compress_response_stream(compression_config):
+    response = Response(app_iter=iter([BODY[:100], BODY[100:]]), content_type='application/xml')
+    response = compress_response(_request('gzip'), response)
+    assert response.content_encoding == 'gzip'
+    assert gzip.decompress(b''.join(response.app_iter)) == BODY
+
+
+def test_compressed_view(compression_config):
+    view = compressed_view(lambda context, request: _response())
+    response = view(None, _request('gzip'))
+    assert gzip.decompress(response.body) == BODY
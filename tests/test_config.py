@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import datetime
+import hashlib
 import pytest
 from pyramid.config import ConfigurationError
 
@@ -92,6 +93,19 @@ def test_get_logo_multilingual(language):
         assert logo_oereb.content == FileAdapter().read(Config.get('logo').get('oereb').get(language))
 
 
+@pytest.mark.run(order=-1)
+def test_get_logo_config_preloaded():
+    Config._config = None
+    Config.init('./tests/resources/test_config.yml', 'pyramid_oereb')
+    Config.init_logos()
+    logos = Config.get_logo_config(language='fr')
+    logos.pop('oereb')
+    logos_again = Config.get_logo_config(language='fr')
+    assert logos_again.get('oereb') is not None
+    assert logos_again.get('canton') is logos.get('canton')
+    assert logos_again.get('canton').etag == hashlib.md5(logos_again.get('canton').content).hexdigest()
+
+
 @pytest.mark.run(order=-1)
 def test_get_all_federal():
     Config._config = None
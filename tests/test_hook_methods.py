@@ -9,7 +9,8 @@ from pyramid_oereb.lib.adapter import FileAdapter
 from pyramid_oereb.lib.records.image import ImageRecord
 from pyramid_oereb.lib.records.theme import ThemeRecord
 from pyramid_oereb.lib.records.view_service import LegendEntryRecord
-from pyramid_oereb.standard.hook_methods import get_symbol, get_symbol_ref
+from pyramid_oereb.standard.hook_methods import get_municipality, get_symbol, get_symbol_ref, \
+    produce_sld_content
 from tests import pyramid_oereb_test_config
 
 try:
@@ -51,6 +52,14 @@ def test_get_symbol():
     assert response.body == FileAdapter().read('tests/resources/symbol.png')
 
 
+@pytest.mark.parametrize('fosnr', ['abc', '12a', ''])
+def test_get_municipality_invalid_fosnr(fosnr):
+    request = DummyRequest()
+    request.matchdict.update({'fosnr': fosnr, 'extension': 'png'})
+    with pytest.raises(HTTPNotFound):
+        get_municipality(request)
+
+
 def test_get_symbol_ref():
     record = LegendEntryRecord(
         ImageRecord(FileAdapter().read('tests/resources/logo_canton.png')),
@@ -64,3 +73,20 @@ def test_get_symbol_ref():
         request = DummyRequest()
         url = urlparse(get_symbol_ref(request, record))
         assert url.path == '/image/symbol/ContaminatedSites/1/CodeA.png'
+
+
+def test_produce_sld_content():
+    request = DummyRequest()
+    request.params.update({'egrid': 'CH113928077734'})
+    response = produce_sld_content(request)
+    assert response.content_type == 'application/xml'
+    assert b'<ogc:Literal>CH113928077734</ogc:Literal>' in response.body
+    assert response.etag is not None
+    request_2 = DummyRequest()
+    request_2.params.update({'egrid': 'CH113928077734'})
+    assert produce_sld_content(request_2).body == response.body
+    request_3 = DummyRequest()
+    request_3.params.update({'egrid': 'CH000000000000'})
+    response_3 = produce_sld_content(request_3)
+    assert b'<ogc:Literal>CH000000000000</ogc:Literal>' in response_3.body
+    assert response_3.etag != response.etag
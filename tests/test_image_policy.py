@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+from io import BytesIO
+
+import pytest
+from pyramid.config import ConfigurationError
+
+from pyramid_oereb.lib.adapter import FileAdapter
+from pyramid_oereb.lib.config import Config
+from pyramid_oereb.lib.image_policy import apply_image_policy, get_image_policy
+from pyramid_oereb.lib.records.image import ImageRecord
+
+Image = pytest.importorskip('PIL.Image')
+
+
+@pytest.fixture
+def map_image():
+    return ImageRecord(FileAdapter().read('tests/resources/logo_canton.png'))
+
+
+def test_get_image_policy():
+    extract_config = Config.get_extract_config()
+    extract_config['map_images'] = {
+        'embeddable': {'format': 'JPEG', 'quality': 50},
+        'reduced': {'format': 'gif'}
+    }
+    try:
+        assert get_image_policy('EMBEDDABLE') == {'format': 'JPEG', 'quality': 50}
+        assert get_image_policy('full') is None
+        with pytest.raises(ConfigurationError):
+            get_image_policy('reduced')
+    finally:
+        extract_config.pop('map_images')
+
+
+def test_apply_image_policy_none(map_image):
+    assert apply_image_policy(map_image, None) is map_image
+
+
+@pytest.mark.parametrize('image_format,expected', [
+    ('png', 'PNG'),
+    ('png8', 'PNG'),
+    ('jpeg', 'JPEG'),
+    ('webp', 'WEBP')
+])
+def test_apply_image_policy_format(map_image, image_format, expected):
+    result = apply_image_policy(map_image, {'format': image_format})
+    assert Image.open(BytesIO(result.content)).format == expected
+
+
+def test_apply_image_policy_downscale(map_image):
+    original = Image.open(BytesIO(map_image.content))
+    result = apply_image_policy(map_image, {'max_width': original.width // 2})
+    downscaled = Image.open(BytesIO(result.content))
+    assert downscaled.width == original.width // 2
+    assert downscaled.height < original.height
+
+
+@pytest.mark.parametrize('content', [
+    b'<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10"/>',
+    FileAdapter().read('tests/resources/logo_canton.png')[:200]
+])
+def test_apply_image_policy_unreadable(content):
+    image = ImageRecord(content)
+    assert apply_image_policy(image, {'format': 'jpeg', 'max_width': 10}) is image
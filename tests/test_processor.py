@@ -2,7 +2,9 @@
 import datetime
 import pytest
 from shapely.geometry import Point
+from unittest.mock import patch
 
+from pyramid_oereb.lib.adapter import FileAdapter
 from pyramid_oereb.lib.processor import Processor, create_processor
 from pyramid_oereb.lib.records.extract import ExtractRecord
 from pyramid_oereb.lib.records.geometry import GeometryRecord
@@ -97,6 +99,32 @@ def test_processor_with_images():
         assert plr.view_service.image is not None
 
 
+def test_processor_with_images_identical_maps_downloaded_once():
+    request = MockRequest()
+    request.matchdict.update(request_matchdict)
+    request.params.update({
+        'WITHIMAGES': '',
+        'LANG': 'de'
+    })
+    processor = create_processor()
+    webservice = PlrWebservice(request)
+    params = webservice.__validate_extract_params__()
+    real_estate = processor.real_estate_reader.read(params, egrid=u'TEST')
+    downloaded = []
+
+    def download(view_service):
+        downloaded.append(view_service.reference_wms)
+        view_service.image = ImageRecord(FileAdapter().read('tests/resources/logo_canton.png'))
+
+    with patch.object(ViewServiceRecord, 'download_wms_content', autospec=True, side_effect=download):
+        extract = processor.process(real_estate[0], params, 'http://test.ch')
+    assert len(downloaded) == len(set(downloaded))
+    images = {}
+    for plr in extract.real_estate.public_law_restrictions:
+        images.setdefault(plr.view_service.reference_wms, plr.view_service.image)
+        assert plr.view_service.image is images[plr.view_service.reference_wms]
+
+
 def test_processor_without_images():
     request = MockRequest()
     request.matchdict.update(request_matchdict)
@@ -242,3 +242,64 @@ def test_parse_invalid_coordinates():
         PlrWebservice(MockRequest()).__parse_gnss__('7.72866')
     with pytest.raises(HTTPBadRequest):
         PlrWebservice(MockRequest()).__parse_xy__('2621857.856;1259856.578')
+
+
+def _batch_request(body, output_format=u'json'):
+    url = 'http://example.com/oereb/getegrid/{0}/batch'.format(output_format)
+    request = MockRequest(current_route_url=url)
+    request.method = 'POST'
+    request.json_body = body
+    # Add params to matchdict as the view will do it for /getegrid/{format}/batch
+    request.matchdict.update({
+        'format': output_format
+    })
+    return request
+
+
+def test_getegrid_batch_ident():
+    with pyramid_oereb_test_config():
+        request = _batch_request({'IDENT': [
+            {'IDENTDN': u'BLTEST', 'NUMBER': u'1000'},
+            {'IDENTDN': u'BLTEST', 'NUMBER': u'9999'},
+            {'identdn': u'BLTEST', 'number': u'1000'},
+            {'IDENTDN': u'BLTEST', 'NUMBER': 1000}
+        ]})
+        response = PlrWebservice(request).get_egrid_batch().json
+        results = response.get('GetEGRIDBatchResponse')
+        assert len(results) == 4
+        assert results[0] == [{'egrid': u'TEST', 'number': u'1000', 'identDN': u'BLTEST'}]
+        assert results[1] == []
+        assert results[2] == results[0]
+        assert results[3] == results[0]
+
+
+def test_getegrid_batch_xy():
+    with pyramid_oereb_test_config():
+        request = _batch_request({'XY': [
+            '-1999999.032739449,-999998.940457533',
+            '2600000,1200000'
+        ]})
+        response = PlrWebservice(request).get_egrid_batch().json
+        results = response.get('GetEGRIDBatchResponse')
+        assert len(results) == 2
+        single = MockRequest(current_route_url='http://example.com/oereb/getegrid/json/')
+        single.matchdict.update({'format': u'json'})
+        single.params.update({'XY': '-1999999.032739449,-999998.940457533'})
+        assert results[0] == PlrWebservice(single).get_egrid_coord().json.get('GetEGRIDResponse')
+
+
+@pytest.mark.parametrize('body,output_format', [
+    ({'XY': ['1,2']}, u'xml'),
+    ({}, u'json'),
+    ({'XY': '1,2'}, u'json'),
+    ({'XY': 5}, u'json'),
+    ({'IDENT': 5}, u'json'),
+    ({'XY': ['1,2,3']}, u'json'),
+    ({'XY': ['a,b']}, u'json'),
+    ({'IDENT': [{'IDENTDN': u'BLTEST'}]}, u'json'),
+    ({'IDENT': [{'IDENTDN': u'BLTEST', 'NUMBER': str(i)} for i in range(1001)]}, u'json')
+])
+def test_getegrid_batch_invalid(body, output_format):
+    with pyramid_oereb_test_config():
+        response = PlrWebservice(_batch_request(body, output_format)).get_egrid_batch()
+        assert isinstance(response, HTTPBadRequest)
@@ -17,6 +17,8 @@ def test_get_image():
     result = webservice.get_image()
     assert isinstance(result, Response)
     assert result.body == Config.get_logo_config().get('oereb').content
+    assert result.etag == Config.get_logo_config().get('oereb').etag
+    assert result.conditional_response
 
 
 def test_get_image_invalid():